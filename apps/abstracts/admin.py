@@ -3,8 +3,16 @@ from typing import (
     Optional,
     Any,
 )
+import json
 
 # Django
+from django.conf import settings
+from django.contrib.admin import action
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.http.request import HttpRequest
+from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
 
 # Project
@@ -20,6 +28,30 @@ class AbstractAdminIsDeleted:
         "datetime_deleted",
     )
     list_filter: tuple[Any] = (DeletedStateFilter,)
+    actions: tuple[str] = (
+        "soft_delete_selected",
+        "recover_selected",
+    )
+
+    @action(description="Пометить выбранные объекты как удалённые")
+    def soft_delete_selected(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet
+    ) -> None:
+        """Soft delete selected objects in bulk."""
+        deleted: int = queryset.soft_delete()
+        self.message_user(request, f"Удалено объектов: {deleted}")
+
+    @action(description="Восстановить выбранные объекты")
+    def recover_selected(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet
+    ) -> None:
+        """Recover selected objects in bulk."""
+        recovered: int = queryset.recover()
+        self.message_user(request, f"Восстановлено объектов: {recovered}")
 
     def get_is_deleted_obj(
         self,
@@ -37,3 +69,97 @@ class AbstractAdminIsDeleted:
                 {obj_name} не удалён</p>'
         )
     get_is_deleted_obj.short_description = "Состояние объекта"
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator which estimates counts of big tables on PostgreSQL.
+
+    Unfiltered tables are counted by reltuples of the table and its
+    partitions, filtered ones by the planner's estimate. Counts
+    estimated below EXACT_COUNT_LIMIT are made exact.
+    """
+
+    def get_estimated_count(self, queryset: QuerySet) -> int:
+        if queryset.query.where:
+            plan: list[dict[str, Any]] = json.loads(
+                queryset.order_by().explain(format="json")
+            )
+            return int(plan[0]["Plan"]["Plan Rows"])
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT COALESCE(SUM(GREATEST(reltuples, 0)), 0) "
+                "FROM pg_class WHERE oid = %s::regclass OR oid IN ("
+                "SELECT inhrelid FROM pg_inherits "
+                "WHERE inhparent = %s::regclass)",
+                (queryset.model._meta.db_table,) * 2
+            )
+            return int(cursor.fetchone()[0])
+
+    @cached_property
+    def count(self) -> int:
+        queryset: Any = self.object_list
+        if not isinstance(queryset, QuerySet) or \
+                connections[queryset.db].vendor != "postgresql":
+            return super().count
+        estimated: int = self.get_estimated_count(queryset=queryset)
+        if estimated < settings.ADMIN_PERFORMANCE_CONF["EXACT_COUNT_LIMIT"]:
+            return super().count
+        return estimated
+
+
+class AbstractAdminPerformance:
+    """Changelist of the big table which renders in bounded time.
+
+    Numeric search terms also match the primary key exactly. With
+    ADMIN_PERFORMANCE_CONF enabled the counts are estimated and rows
+    are ordered by the primary key index.
+    """
+
+    @property
+    def is_performance_mode(self) -> bool:
+        return settings.ADMIN_PERFORMANCE_CONF["ENABLED"]
+
+    @property
+    def show_full_result_count(self) -> bool:
+        return not self.is_performance_mode
+
+    def get_paginator(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        per_page: int,
+        orphans: int = 0,
+        allow_empty_first_page: bool = True
+    ) -> Paginator:
+        paginator_class: type[Paginator] = EstimatedCountPaginator \
+            if self.is_performance_mode else self.paginator
+        return paginator_class(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page
+        )
+
+    def get_ordering(self, request: HttpRequest) -> tuple[str]:
+        if self.is_performance_mode:
+            return ("-pk",)
+        return super().get_ordering(request)
+
+    def get_search_results(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        search_term: str
+    ) -> tuple[QuerySet, bool]:
+        """Add exact primary key match instead of the "id" text search."""
+        searched: QuerySet
+        may_have_duplicates: bool
+        searched, may_have_duplicates = super().get_search_results(
+            request,
+            queryset,
+            search_term
+        )
+        term: str = search_term.strip()
+        if term.isdigit() and len(term) < 19:
+            searched = searched | queryset.filter(pk=int(term))
+        return searched, may_have_duplicates
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class AbstractsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'abstracts'
+
+    def ready(self) -> None:
+        from abstracts.metrics import install_query_recorder
+
+        connection_created.connect(
+            install_query_recorder,
+            dispatch_uid="abstracts_install_query_recorder"
+        )
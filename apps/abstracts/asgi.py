@@ -0,0 +1,44 @@
+# Python
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Sequence,
+)
+
+
+class LifespanApplication:
+    """ASGI application wrapper which handles lifespan protocol.
+
+    Django's ASGI handler rejects lifespan scopes, so process-wide
+    resources are released here on server shutdown.
+    """
+
+    def __init__(
+        self,
+        application: Callable,
+        on_shutdown: Sequence[Callable[[], Awaitable[Any]]] = ()
+    ) -> None:
+        self.application: Callable = application
+        self.on_shutdown: Sequence[Callable[[], Awaitable[Any]]] = \
+            on_shutdown
+
+    async def __call__(
+        self,
+        scope: dict[str, Any],
+        receive: Callable,
+        send: Callable
+    ) -> None:
+        if scope["type"] != "lifespan":
+            return await self.application(scope, receive, send)
+
+        while True:
+            message: dict[str, Any] = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                hook: Callable[[], Awaitable[Any]]
+                for hook in self.on_shutdown:
+                    await hook()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
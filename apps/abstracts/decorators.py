@@ -0,0 +1,110 @@
+# Python
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Sequence,
+)
+from functools import wraps
+
+# Django
+from django.contrib.auth.models import AnonymousUser
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+)
+
+# Rest Framework
+from rest_framework.exceptions import (
+    APIException,
+    MethodNotAllowed,
+    NotAuthenticated,
+    PermissionDenied,
+)
+from rest_framework.permissions import (
+    AllowAny,
+    BasePermission,
+)
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+
+
+def get_json_response(data: Any, status: int = 200) -> HttpResponse:
+    """Render data with the default API renderer outside of DRF views."""
+    renderer: BaseRenderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(
+        content=renderer.render(data),
+        status=status,
+        content_type=renderer.media_type
+    )
+
+
+async def aauthenticate_request(request: HttpRequest) -> Optional[str]:
+    """Set request.user with async capable authentication classes.
+
+    Returns WWW-Authenticate header of the first authenticator.
+    """
+    request.user = AnonymousUser()
+    authenticate_header: Optional[str] = None
+    authentication_class: type
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        authenticator: Any = authentication_class()
+        if not hasattr(authenticator, "aauthenticate"):
+            continue
+        authenticate_header = authenticate_header or \
+            authenticator.authenticate_header(request)
+        user_auth: Optional[tuple] = await authenticator.aauthenticate(
+            request
+        )
+        if user_auth is not None:
+            request.user = user_auth[0]
+            break
+    return authenticate_header
+
+
+def async_api_view(
+    methods: Sequence[str],
+    permission_classes: Sequence[type[BasePermission]] = (AllowAny,)
+) -> Callable:
+    """Make async django view behave like DRF API view.
+
+    DRF views are synchronous, so authentication, permissions
+    and error responses are reproduced here.
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        async def wrapper(
+            request: HttpRequest,
+            *args: tuple[Any],
+            **kwargs: dict[str, Any]
+        ) -> HttpResponse:
+            authenticate_header: Optional[str] = None
+            try:
+                if request.method not in methods:
+                    raise MethodNotAllowed(method=request.method)
+                authenticate_header = await aauthenticate_request(
+                    request=request
+                )
+                permission_class: type[BasePermission]
+                for permission_class in permission_classes:
+                    permission: BasePermission = permission_class()
+                    if permission.has_permission(request, None):
+                        continue
+                    if not request.user.is_authenticated:
+                        raise NotAuthenticated()
+                    raise PermissionDenied(
+                        detail=getattr(permission, "message", None)
+                    )
+                return await view(request, *args, **kwargs)
+            except APIException as exc:
+                response: HttpResponse = get_json_response(
+                    data={"detail": exc.detail},
+                    status=exc.status_code
+                )
+                if exc.status_code == 401 and authenticate_header:
+                    response["WWW-Authenticate"] = authenticate_header
+                return response
+
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
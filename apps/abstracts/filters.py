@@ -4,12 +4,14 @@ from typing import (
     Tuple,
     Optional,
 )
+from datetime import timedelta
 
 # Django
 from django.contrib.admin import SimpleListFilter
 from django.db.models import QuerySet
 from django.core.handlers.wsgi import WSGIRequest
 from django.contrib.admin import ModelAdmin
+from django.utils import timezone
 
 
 class DeletedStateFilter(SimpleListFilter):
@@ -39,3 +41,37 @@ class DeletedStateFilter(SimpleListFilter):
             return queryset.filter(datetime_deleted__isnull=False)
         if self.value() == "not_deleted":
             return queryset.filter(datetime_deleted__isnull=True)
+
+
+class CreatedPeriodFilter(SimpleListFilter):
+    """Filter by datetime_created which prunes partitions of the table."""
+
+    title: str = "Время создания"
+    parameter_name: str = "created"
+    PERIODS: dict[str, tuple[str, timedelta]] = {
+        "day": ("За сутки", timedelta(days=1)),
+        "week": ("За неделю", timedelta(days=7)),
+        "month": ("За 30 дней", timedelta(days=30)),
+        "year": ("За год", timedelta(days=365)),
+    }
+
+    def lookups(
+        self,
+        request: WSGIRequest,
+        model_admin: ModelAdmin
+    ) -> List[Tuple[str, str]]:
+        """Return tuple of value and verbose value."""
+        return [
+            (value, title) for value, (title, _) in self.PERIODS.items()
+        ]
+
+    def queryset(
+        self,
+        request: WSGIRequest,
+        queryset: QuerySet
+    ) -> Optional[QuerySet]:
+        """Return objects created during the chosen period."""
+        if self.value() in self.PERIODS:
+            return queryset.get_created_in_range(
+                start=timezone.now() - self.PERIODS[self.value()][1]
+            )
@@ -2,8 +2,17 @@ from typing import (
     Optional,
     Any,
 )
+from hashlib import md5
 
-from django.db.models import QuerySet
+from django.db.models import (
+    QuerySet,
+    Model,
+)
+from django.utils.cache import patch_vary_headers
+from django.utils.http import (
+    parse_etags,
+    quote_etag,
+)
 
 from rest_framework.request import Request as DRF_Request
 from rest_framework.response import Response as DRF_Response
@@ -11,10 +20,71 @@ from rest_framework.serializers import Serializer
 from rest_framework.pagination import BasePagination
 from rest_framework import status
 
+from abstracts.serializers import AbstractDateTimeSerializer
+from abstracts.metrics import measure_serialization
+
 
 class DRFResponseHandler:
     """Handler for DRF response."""
 
+    ETAG_FIELDS: tuple[str] = ("id", "datetime_updated")
+
+    def get_etag_state(self, row: Any) -> str:
+        """Get version of model instance or values() row."""
+        if isinstance(row, dict):
+            return f"{row['id']}:{row['datetime_updated']}"
+        return f"{row.pk}:{row.datetime_updated}"
+
+    def get_etag(
+        self,
+        request: DRF_Request,
+        data: Any,
+        serializer_class: Serializer,
+        paginator: Optional[BasePagination] = None
+    ) -> str:
+        """Get validator of the returned rows without serializing them.
+
+        Pages are described by versions of their rows and the next
+        link, so only rows which are returned anyway are read.
+        """
+        state: str
+        if isinstance(data, Model):
+            state = self.get_etag_state(row=data)
+        else:
+            state = ",".join(self.get_etag_state(row=row) for row in data)
+        if paginator and hasattr(paginator, "get_next_link"):
+            state += f"|{paginator.get_next_link()}"
+        return quote_etag(
+            md5(
+                f"{request.user.pk}|{request.get_full_path()}|"
+                f"{serializer_class.__name__}|{state}".encode(),
+                usedforsecurity=False
+            ).hexdigest()
+        )
+
+    def is_not_modified(self, request: DRF_Request, etag: str) -> bool:
+        """Check If-None-Match header with weak comparison."""
+        if_none_match: Optional[str] = request.META.get("HTTP_IF_NONE_MATCH")
+        if not if_none_match:
+            return False
+        etags: list[str] = parse_etags(if_none_match)
+        return "*" in etags or etag in (
+            value.removeprefix("W/") for value in etags
+        )
+
+    def get_not_modified_response(
+        self,
+        request: DRF_Request,
+        etag: Optional[str]
+    ) -> Optional[DRF_Response]:
+        """Get 304 response if the client has the current version."""
+        if etag and self.is_not_modified(request=request, etag=etag):
+            return self.set_etag(
+                response=DRF_Response(status=status.HTTP_304_NOT_MODIFIED),
+                etag=etag
+            )
+        return None
+
     def get_drf_response(
         self,
         request: DRF_Request,
@@ -22,8 +92,25 @@ class DRFResponseHandler:
         serializer_class: Serializer,
         many: bool = False,
         paginator: Optional[BasePagination] = None,
-        serializer_context: Optional[dict[str, Any]] = None
+        serializer_context: Optional[dict[str, Any]] = None,
+        use_etag: bool = False
     ) -> DRF_Response:
+        use_etag = use_etag and request.method in ("GET", "HEAD")
+        etag: Optional[str] = None
+        not_modified: Optional[DRF_Response]
+
+        if many and isinstance(data, QuerySet) and issubclass(
+            serializer_class,
+            AbstractDateTimeSerializer
+        ) and serializer_class.get_fast_fields():
+            return self.get_fast_drf_response(
+                request=request,
+                data=data,
+                serializer_class=serializer_class,
+                paginator=paginator,
+                use_etag=use_etag
+            )
+
         if not serializer_context:
             serializer_context = {"request": request}
         if paginator and many:
@@ -31,26 +118,120 @@ class DRFResponseHandler:
                 queryset=data,
                 request=request
             )
+            if use_etag:
+                etag = self.get_etag(
+                    request=request,
+                    data=objects,
+                    serializer_class=serializer_class,
+                    paginator=paginator
+                )
+                not_modified = self.get_not_modified_response(
+                    request=request,
+                    etag=etag
+                )
+                if not_modified:
+                    return not_modified
             serializer: Serializer = serializer_class(
                 objects,
                 many=many,
                 context=serializer_context
             )
+            with measure_serialization():
+                serialized_data: Any = serializer.data
             response: DRF_Response = \
                 paginator.get_paginated_response(
-                    serializer.data
+                    serialized_data
                 )
-            return response
+            return self.set_etag(response=response, etag=etag)
 
+        if use_etag and (isinstance(data, Model) or many):
+            if many:
+                data = list(data)
+            etag = self.get_etag(
+                request=request,
+                data=data,
+                serializer_class=serializer_class
+            )
+            not_modified = self.get_not_modified_response(
+                request=request,
+                etag=etag
+            )
+            if not_modified:
+                return not_modified
         serializer: Serializer = serializer_class(
             data,
             many=many,
             context=serializer_context
         )
+        with measure_serialization():
+            serialized_data: Any = serializer.data
         response: DRF_Response = DRF_Response(
             {
-                'data': serializer.data
+                'data': serialized_data
             },
             status=status.HTTP_200_OK
         )
+        return self.set_etag(response=response, etag=etag)
+
+    def get_fast_drf_response(
+        self,
+        request: DRF_Request,
+        data: QuerySet,
+        serializer_class: AbstractDateTimeSerializer,
+        paginator: Optional[BasePagination] = None,
+        use_etag: bool = False
+    ) -> DRF_Response:
+        """Serialize queryset from values() rows without model instances."""
+        rows: Any = data.values(
+            *dict.fromkeys(
+                (
+                    *serializer_class.get_fast_value_fields(),
+                    *getattr(paginator, "position_fields", ()),
+                    *(self.ETAG_FIELDS if use_etag else ()),
+                )
+            )
+        )
+        if paginator:
+            rows = paginator.paginate_queryset(
+                queryset=rows,
+                request=request
+            )
+        etag: Optional[str] = None
+        if use_etag:
+            rows = list(rows)
+            etag = self.get_etag(
+                request=request,
+                data=rows,
+                serializer_class=serializer_class,
+                paginator=paginator
+            )
+            not_modified: Optional[DRF_Response] = \
+                self.get_not_modified_response(request=request, etag=etag)
+            if not_modified:
+                return not_modified
+        with measure_serialization():
+            serialized_data: list[dict[str, Any]] = \
+                serializer_class.get_fast_representation(rows=rows)
+        if paginator:
+            response: DRF_Response = paginator.get_paginated_response(
+                serialized_data
+            )
+        else:
+            response = DRF_Response(
+                {
+                    'data': serialized_data
+                },
+                status=status.HTTP_200_OK
+            )
+        return self.set_etag(response=response, etag=etag)
+
+    def set_etag(
+        self,
+        response: DRF_Response,
+        etag: Optional[str]
+    ) -> DRF_Response:
+        """Set ETag of the response if it was computed."""
+        if etag:
+            response["ETag"] = etag
+            patch_vary_headers(response, ("Authorization",))
         return response
@@ -0,0 +1,231 @@
+# Python
+from typing import Any
+from datetime import timedelta
+from time import (
+    perf_counter,
+    sleep,
+)
+import os
+
+# Django
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import (
+    OperationalError,
+    connection,
+)
+from django.db.models import (
+    Model,
+    ForeignKey,
+    QuerySet,
+)
+from django.db.transaction import atomic
+from django.utils import timezone
+
+# Project
+from abstracts.signals import post_purge
+from abstracts.utils import iter_ndjson
+
+
+class Command(BaseCommand):
+    """Remove soft deleted rows after their retention period."""
+
+    help: str = "Hard delete or archive expired soft deleted rows " \
+        "in bounded batches."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        conf: dict[str, Any] = settings.SOFT_DELETE_RETENTION_CONF
+        parser.add_argument(
+            "--models",
+            nargs="+",
+            default=list(conf["MODELS"]),
+            help="Labels of models from SOFT_DELETE_RETENTION_CONF."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=conf["BATCH_SIZE"]
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=conf["SLEEP_SECONDS"],
+            help="Pause between batches to throttle I/O."
+        )
+        parser.add_argument(
+            "--max-seconds",
+            type=float,
+            default=0,
+            help="Stop after this time, the next run continues."
+        )
+        parser.add_argument(
+            "--archive-dir",
+            default="",
+            help="Append deleted rows to NDJSON files of this directory."
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count expired rows."
+        )
+
+    def get_expired(self, model: type[Model]) -> QuerySet:
+        """Get rows soft deleted before the retention period."""
+        days: int = self.retention[model._meta.label]
+        return model._base_manager.filter(
+            datetime_deleted__lt=timezone.now() - timedelta(days=days)
+        )
+
+    def get_children(self, model: type[Model]) -> list[ForeignKey]:
+        """Get foreign keys of purged models which reference model."""
+        return [
+            relation.field for relation in model._meta.related_objects
+            if relation.one_to_many and
+            relation.related_model._meta.label in self.retention
+        ]
+
+    def is_out_of_time(self) -> bool:
+        return bool(self.max_seconds) and \
+            perf_counter() - self.started > self.max_seconds
+
+    def is_lock_error(self, exc: OperationalError) -> bool:
+        return getattr(exc.__cause__, "pgcode", None) == "55P03" or \
+            "locked" in str(exc)
+
+    def archive(self, model: type[Model], pks: list[Any]) -> None:
+        path: str = os.path.join(
+            self.archive_dir,
+            f"{model._meta.db_table}.ndjson"
+        )
+        with open(path, "a", encoding="utf-8") as archive:
+            chunk: str
+            for chunk in iter_ndjson(
+                rows=model._base_manager.filter(pk__in=pks).values()
+            ):
+                archive.write(chunk)
+
+    def delete_batch(self, model: type[Model], pks: list[Any]) -> int:
+        """Delete rows in a short transaction, retry on lock timeouts.
+
+        Rows are archived before the first delete attempt only, so
+        retries don't write them to the archive again.
+        """
+        conf: dict[str, Any] = settings.SOFT_DELETE_RETENTION_CONF
+        archived: bool = False
+        attempt: int
+        for attempt in range(1, conf["MAX_RETRIES"] + 1):
+            try:
+                with atomic():
+                    if connection.vendor == "postgresql":
+                        with connection.cursor() as cursor:
+                            cursor.execute(
+                                "SET LOCAL lock_timeout = %s",
+                                (conf["LOCK_TIMEOUT_MS"],)
+                            )
+                    if self.archive_dir and not archived:
+                        self.archive(model=model, pks=pks)
+                        archived = True
+                    deleted: dict[str, int]
+                    _, deleted = model._base_manager.filter(
+                        pk__in=pks
+                    ).delete()
+                return deleted.get(model._meta.label, 0)
+            except OperationalError as exc:
+                if not self.is_lock_error(exc=exc) or \
+                        attempt == conf["MAX_RETRIES"]:
+                    raise
+                self.stderr.write(
+                    f"{model._meta.label}: блокировка, "
+                    f"попытка {attempt} из {conf['MAX_RETRIES']}"
+                )
+                sleep(self.sleep * 2 ** attempt)
+        return 0
+
+    def purge(self, model: type[Model], queryset: QuerySet) -> bool:
+        """Delete rows of queryset by batches of primary keys.
+
+        Rows of purged models which reference the batch are deleted
+        first, so cascades don't load them. Returns False when the run
+        is out of time.
+        """
+        children: list[ForeignKey] = self.get_children(model=model)
+        last_pk: Any = None
+        while not self.is_out_of_time():
+            batch: QuerySet = queryset.order_by("pk")
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            pks: list[Any] = list(
+                batch.values_list("pk", flat=True)[:self.batch_size]
+            )
+            if not pks:
+                return True
+            field: ForeignKey
+            for field in children:
+                if not self.purge(
+                    model=field.model,
+                    queryset=field.model._base_manager.filter(
+                        **{f"{field.name}__in": pks}
+                    )
+                ):
+                    return False
+            self.deleted[model._meta.label] = \
+                self.deleted.get(model._meta.label, 0) + \
+                self.delete_batch(model=model, pks=pks)
+            post_purge.send(sender=model, pks=pks)
+            last_pk = pks[-1]
+            if self.sleep:
+                sleep(self.sleep)
+        return False
+
+    def handle(self, *args: tuple[Any], **options: dict[str, Any]) -> None:
+        self.retention: dict[str, int] = {}
+        label: str
+        for label in options["models"]:
+            if label not in settings.SOFT_DELETE_RETENTION_CONF["MODELS"]:
+                raise CommandError(
+                    f"Для модели {label} не задан срок хранения"
+                )
+            self.retention[label] = \
+                settings.SOFT_DELETE_RETENTION_CONF["MODELS"][label]
+        self.batch_size: int = options["batch_size"]
+        self.sleep: float = options["sleep"]
+        self.max_seconds: float = options["max_seconds"]
+        self.archive_dir: str = options["archive_dir"]
+        if self.archive_dir:
+            os.makedirs(self.archive_dir, exist_ok=True)
+
+        if options["dry_run"]:
+            for label in self.retention:
+                self.stdout.write(
+                    f"{label}: "
+                    f"{self.get_expired(apps.get_model(label)).count()} "
+                    "строк к удалению"
+                )
+            return
+
+        self.deleted: dict[str, int] = {}
+        self.started: float = perf_counter()
+        finished: bool = True
+        for label in self.retention:
+            model: type[Model] = apps.get_model(label)
+            finished = self.purge(
+                model=model,
+                queryset=self.get_expired(model=model)
+            )
+            if not finished:
+                break
+        elapsed: float = perf_counter() - self.started
+        for label, count in self.deleted.items():
+            self.stdout.write(
+                f"{label}: удалено {count} строк, "
+                f"{count / elapsed:.1f} строк/сек"
+            )
+        if not finished:
+            self.stdout.write(
+                "Время вышло, следующий запуск продолжит удаление"
+            )
@@ -0,0 +1,191 @@
+# Python
+from typing import (
+    Any,
+    Callable,
+    Optional,
+)
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+
+
+LATENCY_BUCKETS: tuple[float] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUERIES_BUCKETS: tuple[float] = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    """Histogram with fixed upper bounds of buckets."""
+
+    def __init__(self, buckets: tuple[float]) -> None:
+        self.buckets: tuple[float] = buckets
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.sum: float = 0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def get_cumulative_counts(self) -> list[tuple[str, int]]:
+        """Get Prometheus 'le' buckets with cumulative counts."""
+        result: list[tuple[str, int]] = []
+        total: int = 0
+        bound: float
+        count: int
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            result.append((str(bound), total))
+        return result
+
+
+class MetricsRegistry:
+    """In-process histograms of the requests per view and action.
+
+    Every worker process keeps its own registry, so metrics have
+    to be summed by the scraper.
+    """
+
+    METRICS: dict[str, tuple[str, tuple[float]]] = {
+        "http_request_duration_seconds": (
+            "Request latency",
+            LATENCY_BUCKETS,
+        ),
+        "http_request_db_queries": (
+            "Number of database queries per request",
+            QUERIES_BUCKETS,
+        ),
+        "http_request_db_duration_seconds": (
+            "Time spent in database queries per request",
+            LATENCY_BUCKETS,
+        ),
+        "http_request_serialization_seconds": (
+            "Time spent in serialization per request",
+            LATENCY_BUCKETS,
+        ),
+    }
+
+    def __init__(self) -> None:
+        self.histograms: dict[tuple[str, tuple], Histogram] = {}
+        self.lock: Lock = Lock()
+
+    def observe(self, name: str, labels: tuple, value: float) -> None:
+        with self.lock:
+            histogram: Optional[Histogram] = self.histograms.get(
+                (name, labels)
+            )
+            if not histogram:
+                histogram = Histogram(buckets=self.METRICS[name][1])
+                self.histograms[(name, labels)] = histogram
+            histogram.observe(value)
+
+    def observe_request(
+        self,
+        labels: tuple[tuple[str, str]],
+        stats: 'RequestStats',
+        duration: float
+    ) -> None:
+        """Record all histograms of the finished request."""
+        self.observe("http_request_duration_seconds", labels, duration)
+        self.observe("http_request_db_queries", labels, stats.queries)
+        self.observe("http_request_db_duration_seconds", labels, stats.db_time)
+        self.observe(
+            "http_request_serialization_seconds",
+            labels,
+            stats.serialization_time
+        )
+
+    def clear(self) -> None:
+        with self.lock:
+            self.histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Render histograms in Prometheus text exposition format."""
+        with self.lock:
+            histograms: list[tuple[tuple[str, tuple], tuple]] = sorted(
+                (key, (value.get_cumulative_counts(), value.sum, value.count))
+                for key, value in self.histograms.items()
+            )
+        lines: list[str] = []
+        name: str
+        for name, (help_text, _) in self.METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (metric_name, labels), (buckets, total, count) in histograms:
+                if metric_name != name:
+                    continue
+                rendered_labels: str = ",".join(
+                    f'{key}="{value}"' for key, value in labels
+                )
+                for bound, bucket_count in buckets:
+                    lines.append(
+                        f'{name}_bucket{{{rendered_labels},le="{bound}"}} '
+                        f"{bucket_count}"
+                    )
+                lines.append(f"{name}_sum{{{rendered_labels}}} {total}")
+                lines.append(f"{name}_count{{{rendered_labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    """Database and serialization time of the current request."""
+
+    __slots__ = ("queries", "db_time", "serialization_time")
+
+    def __init__(self) -> None:
+        self.queries: int = 0
+        self.db_time: float = 0
+        self.serialization_time: float = 0
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats",
+    default=None
+)
+metrics_registry: MetricsRegistry = MetricsRegistry()
+
+
+def record_query(
+    execute: Callable,
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any]
+) -> Any:
+    """Database execute wrapper counting queries of the current request."""
+    stats: Optional[RequestStats] = request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start: float = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_time += perf_counter() - start
+        stats.queries += 1
+
+
+def install_query_recorder(connection: Any, **kwargs: dict[str, Any]) -> None:
+    """Add query recorder to the new database connection."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def measure_serialization():
+    """Add time of the block to serialization time of the request.
+
+    Lazy querysets evaluated inside the block are counted here too.
+    """
+    stats: Optional[RequestStats] = request_stats.get()
+    if stats is None:
+        yield
+        return
+    start: float = perf_counter()
+    try:
+        yield
+    finally:
+        stats.serialization_time += perf_counter() - start
@@ -0,0 +1,277 @@
+# Python
+from typing import (
+    Any,
+    Callable,
+    Optional,
+)
+from time import perf_counter
+
+# Third party
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Django
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+)
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+# Project
+from abstracts.metrics import (
+    RequestStats,
+    metrics_registry,
+    request_stats,
+)
+
+
+class MetricsMiddleware:
+    """Record latency, queries and serialization time per view action.
+
+    Must be the first middleware to measure the whole request.
+    """
+
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response: Callable = get_response
+        self.is_async: bool = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.is_async:
+            return self.__acall__(request)
+        stats: RequestStats = RequestStats()
+        token: Any = request_stats.set(stats)
+        start: float = perf_counter()
+        try:
+            response: HttpResponse = self.get_response(request)
+        finally:
+            request_stats.reset(token)
+        self.record(
+            request=request,
+            response=response,
+            stats=stats,
+            duration=perf_counter() - start
+        )
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        stats: RequestStats = RequestStats()
+        token: Any = request_stats.set(stats)
+        start: float = perf_counter()
+        try:
+            response: HttpResponse = await self.get_response(request)
+        finally:
+            request_stats.reset(token)
+        self.record(
+            request=request,
+            response=response,
+            stats=stats,
+            duration=perf_counter() - start
+        )
+        return response
+
+    def process_view(
+        self,
+        request: HttpRequest,
+        view_func: Callable,
+        view_args: tuple[Any],
+        view_kwargs: dict[str, Any]
+    ) -> None:
+        """Remember view and action names of the request."""
+        view_class: Optional[type] = getattr(view_func, "cls", None)
+        if view_class:
+            actions: dict[str, str] = getattr(view_func, "actions", None) or {}
+            request.metrics_view = (
+                view_class.__name__,
+                actions.get(request.method.lower(), request.method.lower())
+            )
+        else:
+            request.metrics_view = (
+                getattr(view_func, "__module__", ""),
+                getattr(view_func, "__name__", "")
+            )
+        return None
+
+    def record(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        stats: RequestStats,
+        duration: float
+    ) -> None:
+        view: str
+        action: str
+        view, action = getattr(
+            request,
+            "metrics_view",
+            ("unresolved", "unresolved")
+        )
+        metrics_registry.observe_request(
+            labels=(
+                ("view", view),
+                ("action", action),
+                ("method", request.method),
+                ("status", f"{response.status_code // 100}xx"),
+            ),
+            stats=stats,
+            duration=duration
+        )
+
+
+class AdminOnlyMiddlewareMixin:
+    """Run hooks of the middleware only for the admin site requests.
+
+    API clients authenticate with JWT, so sessions, CSRF and messages
+    are needed only by the admin site.
+    """
+
+    def is_admin_request(self, request: HttpRequest) -> bool:
+        return request.path_info.startswith(f"/{settings.ADMIN_SITE_URL}")
+
+    def process_request(self, request: HttpRequest) -> Optional[HttpResponse]:
+        process_request: Optional[Callable] = getattr(
+            super(),
+            "process_request",
+            None
+        )
+        if process_request and self.is_admin_request(request=request):
+            return process_request(request)
+        return None
+
+    def process_view(
+        self,
+        request: HttpRequest,
+        view_func: Callable,
+        view_args: tuple[Any],
+        view_kwargs: dict[str, Any]
+    ) -> Optional[HttpResponse]:
+        process_view: Optional[Callable] = getattr(
+            super(),
+            "process_view",
+            None
+        )
+        if process_view and self.is_admin_request(request=request):
+            return process_view(request, view_func, view_args, view_kwargs)
+        return None
+
+    def process_response(
+        self,
+        request: HttpRequest,
+        response: HttpResponse
+    ) -> HttpResponse:
+        process_response: Optional[Callable] = getattr(
+            super(),
+            "process_response",
+            None
+        )
+        if process_response and self.is_admin_request(request=request):
+            return process_response(request, response)
+        return response
+
+
+class AdminSessionMiddleware(AdminOnlyMiddlewareMixin, SessionMiddleware):
+    """SessionMiddleware of the admin site."""
+
+
+class AdminCsrfViewMiddleware(AdminOnlyMiddlewareMixin, CsrfViewMiddleware):
+    """CsrfViewMiddleware of the admin site."""
+
+
+class AdminAuthenticationMiddleware(
+    AdminOnlyMiddlewareMixin,
+    AuthenticationMiddleware
+):
+    """AuthenticationMiddleware of the admin site."""
+
+
+class AdminMessageMiddleware(AdminOnlyMiddlewareMixin, MessageMiddleware):
+    """MessageMiddleware of the admin site."""
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Compress responses of at least MIN_SIZE bytes with brotli or gzip.
+
+    Brotli is used when the client prefers it and the brotli package
+    is installed, streaming responses are always gzipped. Small
+    responses like tokens of login_user are left as is, so secrets
+    aren't compressed together with the request's input (BREACH).
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        if not settings.RESPONSE_COMPRESSION_CONF["ENABLED"]:
+            raise MiddlewareNotUsed()
+        super().__init__(get_response)
+
+    def get_accepted_encodings(self, request: HttpRequest) -> dict[str, float]:
+        """Parse Accept-Encoding header into encodings and their q."""
+        encodings: dict[str, float] = {}
+        value: str
+        for value in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+            encoding, _, params = value.strip().partition(";")
+            quality: float = 1.0
+            param: str
+            for param in params.split(";"):
+                name, _, number = param.strip().partition("=")
+                if name == "q":
+                    try:
+                        quality = float(number)
+                    except ValueError:
+                        quality = 0.0
+            encodings[encoding.strip().lower()] = quality
+        return encodings
+
+    def process_response(
+        self,
+        request: HttpRequest,
+        response: HttpResponse
+    ) -> HttpResponse:
+        conf: dict[str, Any] = settings.RESPONSE_COMPRESSION_CONF
+        if not response.streaming and len(response.content) < conf["MIN_SIZE"]:
+            return response
+        encodings: dict[str, float] = self.get_accepted_encodings(
+            request=request
+        )
+        if response.streaming or brotli is None or \
+                encodings.get("br", 0) <= 0 or \
+                encodings["br"] < encodings.get("gzip", 0):
+            if encodings.get("gzip", 1) <= 0:
+                patch_vary_headers(response, ("Accept-Encoding",))
+                return response
+            return super().process_response(request, response)
+        if response.has_header("Content-Encoding"):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressed: bytes = brotli.compress(
+            response.content,
+            quality=conf["BROTLI_QUALITY"]
+        )
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        etag: Optional[str] = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
@@ -1,5 +1,8 @@
 # Python
-from typing import Any
+from typing import (
+    Any,
+    Optional,
+)
 from datetime import datetime
 
 # Django
@@ -9,11 +12,21 @@ from django.db.models import (
     QuerySet,
 )
 from django.db.utils import NotSupportedError
+from django.dispatch import Signal
+from django.utils import timezone
+
+# Project
+from abstracts.signals import (
+    post_soft_delete,
+    post_recover,
+)
 
 
 class AbstractDateTimeQuerySet(QuerySet):
     """AbstractDateTimeQuerySet."""
 
+    CHUNK_SIZE = 1000
+
     def _raise_not_supported_error(self, message: str) -> None:
         """Raise error if there is a problem that doesn't let make a query."""
         raise NotSupportedError(message)
@@ -30,6 +43,95 @@ class AbstractDateTimeQuerySet(QuerySet):
             datetime_deleted__isnull=True
         )
 
+    def get_created_in_range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> QuerySet:
+        """Get objects created in [start, end).
+
+        Bounds on datetime_created let PostgreSQL skip partitions
+        of the partitioned tables.
+        """
+        queryset: QuerySet = self
+        if start:
+            queryset = queryset.filter(datetime_created__gte=start)
+        if end:
+            queryset = queryset.filter(datetime_created__lt=end)
+        return queryset
+
+    def _update_in_chunks(
+        self,
+        signal: Signal,
+        chunk_size: Optional[int] = None,
+        **values: dict[str, Any]
+    ) -> int:
+        """Update rows with one UPDATE per chunk of primary keys.
+
+        Chunks are read by primary key order, so every chunk is a
+        short transaction. The signal is sent once with keys of rows
+        which got the values from this call.
+        """
+        if self.query.is_sliced:
+            self._raise_not_supported_error(
+                "Cannot update a query once a slice has been taken."
+            )
+        chunk_size = chunk_size or self.CHUNK_SIZE
+        updated_pks: list[Any] = []
+        updated: int = 0
+        last_pk: Any = None
+        while True:
+            queryset: QuerySet = self.order_by("pk")
+            if last_pk is not None:
+                queryset = queryset.filter(pk__gt=last_pk)
+            pks: list[Any] = list(
+                queryset.values_list("pk", flat=True)[:chunk_size]
+            )
+            if not pks:
+                break
+            last_pk = pks[-1]
+            # Filters of the queryset are applied again to skip rows
+            # changed concurrently after the chunk was read, and rows
+            # with the values of this call are read back to signal
+            # only them.
+            if self.filter(pk__in=pks).update(**values):
+                chunk_pks: list[Any] = list(
+                    self.model._base_manager.using(self.db).filter(
+                        pk__in=pks,
+                        **values
+                    ).order_by("pk").values_list("pk", flat=True)
+                )
+                updated += len(chunk_pks)
+                updated_pks.extend(chunk_pks)
+            if len(pks) < chunk_size:
+                break
+        if updated_pks:
+            signal.send(
+                sender=self.model,
+                pks=updated_pks,
+                using=self.db
+            )
+        return updated
+
+    def soft_delete(self, chunk_size: Optional[int] = None) -> int:
+        """Mark not deleted objects as deleted, get their number."""
+        datetime_now: datetime = timezone.now()
+        return self.get_not_deleted()._update_in_chunks(
+            signal=post_soft_delete,
+            chunk_size=chunk_size,
+            datetime_deleted=datetime_now,
+            datetime_updated=datetime_now
+        )
+
+    def recover(self, chunk_size: Optional[int] = None) -> int:
+        """Recover deleted objects, get their number."""
+        return self.get_deleted()._update_in_chunks(
+            signal=post_recover,
+            chunk_size=chunk_size,
+            datetime_deleted=None,
+            datetime_updated=timezone.now()
+        )
+
 
 class AbstractDateTime(Model):
     """AbstractDateTime model class."""
@@ -60,8 +162,8 @@ class AbstractDateTime(Model):
 
     def delete(self, *args: tuple[Any], **kwargs: dict[str, Any]) -> None:
         """Override default delete moethod."""
-        datetime_now: datetime = datetime.now()
+        datetime_now: datetime = timezone.now()
         self.datetime_deleted = datetime_now
         self.save(
-            update_fields=['datetime_deleted']
+            update_fields=['datetime_deleted', 'datetime_updated']
         )
@@ -0,0 +1,261 @@
+# Python
+from typing import (
+    Any,
+    Optional,
+    Sequence,
+)
+from base64 import (
+    urlsafe_b64encode,
+    urlsafe_b64decode,
+)
+from datetime import (
+    datetime,
+    timedelta,
+)
+import binascii
+import json
+
+# Django
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.db.models import (
+    Q,
+    QuerySet,
+)
+
+# Rest Framework
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request as DRF_Request
+from rest_framework.response import Response as DRF_Response
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+# Project
+from abstracts.utils import cast_to_int
+
+
+class KeysetCursorPagination(BasePagination):
+    """Keyset (cursor) pagination over the unique ordering.
+
+    The cursor keeps values of the ordering fields of the last row,
+    so the page is found with an index range instead of OFFSET.
+    """
+
+    ordering: Sequence[str] = ("-datetime_updated", "-id")
+    page_size: int = 50
+    max_page_size: int = 1000
+    cursor_query_param: str = "cursor"
+    page_size_query_param: str = "page_size"
+    invalid_cursor_message: str = "Недопустимый курсор"
+
+    def __init__(self) -> None:
+        self.request: Optional[DRF_Request] = None
+        self.next_position: Optional[list[Any]] = None
+
+    @property
+    def position_fields(self) -> tuple[str]:
+        """Get names of the fields which are kept in the cursor."""
+        return tuple(field.lstrip("-") for field in self.ordering)
+
+    def get_page_size(self, request: DRF_Request) -> int:
+        """Get page size from query params."""
+        page_size: Optional[int] = cast_to_int(
+            value=request.query_params.get(
+                self.page_size_query_param,
+                self.page_size
+            )
+        )
+        if not page_size or page_size < 1:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, position: list[Any]) -> str:
+        """Encode ordering values to the url-safe string."""
+        values: list[Any] = [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in position
+        ]
+        return urlsafe_b64encode(
+            json.dumps(values).encode()
+        ).decode()
+
+    def decode_cursor(self, request: DRF_Request) -> Optional[list[Any]]:
+        """Decode ordering values from the request's cursor."""
+        encoded: Optional[str] = request.query_params.get(
+            self.cursor_query_param
+        )
+        if not encoded:
+            return None
+        try:
+            position: Any = json.loads(urlsafe_b64decode(encoded.encode()))
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(detail=self.invalid_cursor_message)
+        if not isinstance(position, list) or \
+                len(position) != len(self.ordering):
+            raise NotFound(detail=self.invalid_cursor_message)
+        return position
+
+    def get_position(self, row: Any) -> list[Any]:
+        """Get ordering values of model instance or values() row."""
+        if isinstance(row, dict):
+            return [row[field] for field in self.position_fields]
+        return [getattr(row, field) for field in self.position_fields]
+
+    def get_position_filter(self, position: list[Any]) -> Q:
+        """Get filter of rows which go after the position."""
+        position_filter: Optional[Q] = None
+        field: str
+        value: Any
+        for field, value in reversed(list(zip(self.ordering, position))):
+            name: str = field.lstrip("-")
+            lookup: str = "lt" if field.startswith("-") else "gt"
+            after: Q = Q(**{f"{name}__{lookup}": value})
+            if position_filter is not None:
+                after |= Q(**{name: value}) & position_filter
+            position_filter = after
+
+        # Redundant bound on the leading field lets the database
+        # turn the filter into an index range scan.
+        name = self.ordering[0].lstrip("-")
+        lookup = "lte" if self.ordering[0].startswith("-") else "gte"
+        return Q(**{f"{name}__{lookup}": position[0]}) & position_filter
+
+    def get_page_queryset(
+        self,
+        queryset: QuerySet,
+        request: DRF_Request
+    ) -> QuerySet:
+        """Get queryset of the requested page and one row more."""
+        self.request = request
+        page_size: int = self.get_page_size(request=request)
+        position: Optional[list[Any]] = self.decode_cursor(request=request)
+
+        queryset = queryset.order_by(*self.ordering)
+        if position:
+            try:
+                queryset = queryset.filter(
+                    self.get_position_filter(position=position)
+                )
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(detail=self.invalid_cursor_message)
+        return queryset[:page_size + 1]
+
+    def get_page_rows(self, rows: list[Any]) -> list[Any]:
+        """Cut the extra row and remember the next position."""
+        page_size: int = self.get_page_size(request=self.request)
+        self.next_position = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            self.next_position = self.get_position(row=rows[-1])
+        return rows
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: DRF_Request,
+        view: Any = None
+    ) -> list[Any]:
+        return self.get_page_rows(
+            rows=list(
+                self.get_page_queryset(queryset=queryset, request=request)
+            )
+        )
+
+    async def apaginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: DRF_Request
+    ) -> list[Any]:
+        """Paginate queryset with async ORM iteration."""
+        page_queryset: QuerySet = self.get_page_queryset(
+            queryset=queryset,
+            request=request
+        )
+        return self.get_page_rows(
+            rows=[row async for row in page_queryset]
+        )
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.next_position:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(position=self.next_position)
+        )
+
+    def get_paginated_response(self, data: Any) -> DRF_Response:
+        return DRF_Response(
+            {
+                "data": data,
+                "next": self.get_next_link(),
+            }
+        )
+
+
+class SearchRankCursorPagination(KeysetCursorPagination):
+    """Keyset pagination of search results by rank and id.
+
+    Ranks which change between requests can't be kept in cursors,
+    such searches pass an ordering by the stable key.
+    """
+
+    ordering: Sequence[str] = ("-search_rank", "-id")
+    page_size: int = 20
+    max_page_size: int = 100
+
+    def __init__(self, ordering: Optional[Sequence[str]] = None) -> None:
+        super().__init__()
+        if ordering:
+            self.ordering = ordering
+
+
+class WatermarkPagination(KeysetCursorPagination):
+    """Pagination of rows changed after the watermark.
+
+    Rows are read in the order of change, and the watermark of the
+    last returned row is given back even when there are no more rows.
+    Rows changed during the last safety_lag are left for the next
+    request, so transactions committing late are not skipped.
+    """
+
+    ordering: Sequence[str] = ("datetime_updated", "id")
+    cursor_query_param: str = "since"
+    page_size: int = 500
+    max_page_size: int = 5000
+    invalid_cursor_message: str = "Недопустимая отметка синхронизации"
+
+    def __init__(self, safety_lag: timedelta = timedelta()) -> None:
+        super().__init__()
+        self.safety_lag: timedelta = safety_lag
+        self.watermark: Optional[str] = None
+
+    def get_page_queryset(
+        self,
+        queryset: QuerySet,
+        request: DRF_Request
+    ) -> QuerySet:
+        self.watermark = request.query_params.get(self.cursor_query_param)
+        return super().get_page_queryset(
+            queryset=queryset.filter(
+                datetime_updated__lt=timezone.now() - self.safety_lag
+            ),
+            request=request
+        )
+
+    def get_page_rows(self, rows: list[Any]) -> list[Any]:
+        rows = super().get_page_rows(rows=rows)
+        if rows:
+            self.watermark = self.encode_cursor(
+                position=self.get_position(row=rows[-1])
+            )
+        return rows
+
+    def get_paginated_response(self, data: Any) -> DRF_Response:
+        return DRF_Response(
+            {
+                "data": data,
+                "watermark": self.watermark,
+                "has_more": self.next_position is not None,
+            }
+        )
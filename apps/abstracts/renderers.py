@@ -0,0 +1,91 @@
+# Python
+from typing import (
+    Any,
+    Optional,
+)
+from decimal import Decimal
+from math import isfinite
+
+# Third party
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Rest Framework
+from rest_framework.renderers import JSONRenderer
+
+SCALAR_TYPES: frozenset[type] = frozenset((str, int, bool, type(None)))
+
+
+def has_non_finite_numbers(data: Any) -> bool:
+    """Check if data has NaN or infinity which orjson writes as null."""
+    stack: list[Any] = [[data]]
+    while stack:
+        value: Any = stack.pop()
+        items: Any = value.values() if isinstance(value, dict) else value
+        item: Any
+        for item in items:
+            if type(item) in SCALAR_TYPES:
+                continue
+            if isinstance(item, (dict, list, tuple)):
+                stack.append(item)
+            elif isinstance(item, float):
+                if not isfinite(item):
+                    return True
+            elif isinstance(item, Decimal) and not item.is_finite():
+                return True
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer which encodes with orjson when it is installed.
+
+    Output is the same bytes as of JSONRenderer for strings, numbers
+    except floats in exponent notation (1e20 instead of 1e+20), dates
+    and UTC datetimes ("Z" suffix). Types orjson doesn't know go
+    through the DRF encoder, indented output and data orjson can't
+    encode (integers over 64 bits, NaN and infinity which it writes
+    as null) are rendered by JSONRenderer.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[dict[str, Any]] = None
+    ) -> bytes:
+        if orjson is None or data is None or self.get_indent(
+            accepted_media_type,
+            renderer_context or {}
+        ) is not None:
+            return super().render(
+                data,
+                accepted_media_type,
+                renderer_context
+            )
+        try:
+            content: bytes = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_UTC_Z
+            )
+        except orjson.JSONEncodeError:
+            return super().render(
+                data,
+                accepted_media_type,
+                renderer_context
+            )
+        # Data is walked only if it may have non-finite numbers.
+        if b"null" in content and has_non_finite_numbers(data=data):
+            return super().render(
+                data,
+                accepted_media_type,
+                renderer_context
+            )
+        # Keep JSON a strict javascript subset like JSONRenderer does.
+        return content.replace(
+            b"\xe2\x80\xa8", b"\\u2028"
+        ).replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
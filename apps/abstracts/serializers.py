@@ -2,15 +2,24 @@ from typing import (
     Tuple,
     Dict,
     Any,
+    Callable,
+    Iterable,
+    Optional,
 )
 
 from rest_framework.serializers import (
     SerializerMethodField,
     DateTimeField,
+    BaseSerializer,
+    Field,
+    PrimaryKeyRelatedField,
+    RelatedField,
 )
 
 from abstracts.models import AbstractDateTime
 
+FastField = Tuple[str, str, Callable[[Any], Any]]
+
 
 class AbstractDateTimeSerializer:
     """AbstractDateTimeSerializer."""
@@ -31,3 +40,86 @@ class AbstractDateTimeSerializer:
     ) -> bool:
         """Get is_deleted field."""
         return True if obj.datetime_deleted else False
+
+    @staticmethod
+    def _get_none_safe(
+        to_representation: Callable[[Any], Any]
+    ) -> Callable[[Any], Any]:
+        """Skip representation of None like Serializer does."""
+        def represent(value: Any) -> Any:
+            return None if value is None else to_representation(value)
+        return represent
+
+    @classmethod
+    def _compile_field(
+        cls,
+        field_name: str,
+        field: Field
+    ) -> Optional[FastField]:
+        """Get values() name and representation function of the field."""
+        if isinstance(field, SerializerMethodField) and \
+                field.method_name == "get_is_deleted" and \
+                cls.get_is_deleted is AbstractDateTimeSerializer.get_is_deleted:
+            return (field_name, "datetime_deleted", bool)
+        if isinstance(field, PrimaryKeyRelatedField) and \
+                field.pk_field is None:
+            return (field_name, field.source.replace(".", "__"), lambda v: v)
+        if isinstance(field, (
+            SerializerMethodField,
+            RelatedField,
+            BaseSerializer,
+        )) or field.source == "*":
+            return None
+        return (
+            field_name,
+            field.source.replace(".", "__"),
+            cls._get_none_safe(field.to_representation)
+        )
+
+    @classmethod
+    def get_fast_fields(cls) -> Optional[tuple[FastField]]:
+        """Compile readable fields for the values() based path once.
+
+        Returns None when a field (nested serializer, custom method
+        field) can only be represented from model instances.
+        """
+        if "_fast_fields" not in cls.__dict__:
+            fast_fields: list[FastField] = []
+            field_name: str
+            field: Field
+            for field_name, field in cls().fields.items():
+                if field.write_only:
+                    continue
+                fast_field: Optional[FastField] = cls._compile_field(
+                    field_name=field_name,
+                    field=field
+                )
+                if not fast_field:
+                    fast_fields = None
+                    break
+                fast_fields.append(fast_field)
+            cls._fast_fields = tuple(fast_fields) \
+                if fast_fields is not None else None
+        return cls._fast_fields
+
+    @classmethod
+    def get_fast_value_fields(cls) -> tuple[str]:
+        """Get names to pass to QuerySet.values() for the fast path."""
+        return tuple(
+            dict.fromkeys(source for _, source, _ in cls.get_fast_fields())
+        )
+
+    @classmethod
+    def get_fast_representation(
+        cls,
+        rows: Iterable[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Represent values() rows the same way the serializer does."""
+        fast_fields: tuple[FastField] = cls.get_fast_fields()
+        return [
+            {
+                name: represent(row[source])
+                for name, source, represent in fast_fields
+            }
+            for row in rows
+        ]
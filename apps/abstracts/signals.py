@@ -0,0 +1,13 @@
+# Django
+from django.dispatch import Signal
+
+# Sent after QuerySet.bulk_create with the created instances,
+# since bulk_create doesn't send post_save.
+post_bulk_create: Signal = Signal()
+# Sent once after AbstractDateTimeQuerySet.soft_delete/recover with
+# primary keys of all updated rows.
+post_soft_delete: Signal = Signal()
+post_recover: Signal = Signal()
+# Sent by purge_soft_deleted after a batch of expired rows is hard
+# deleted and committed, with their primary keys.
+post_purge: Signal = Signal()
@@ -0,0 +1,46 @@
+# Python
+from typing import (
+    Any,
+    Callable,
+)
+
+# Django
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections,
+)
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountTestMixin:
+    """Mixin of TestCase to catch N+1 queries."""
+
+    def get_queries_count(
+        self,
+        func: Callable[[], Any],
+        using: str = DEFAULT_DB_ALIAS
+    ) -> tuple[int, list[str]]:
+        """Run func and get number of executed queries with their sql."""
+        with CaptureQueriesContext(connections[using]) as context:
+            func()
+        return len(context), [query["sql"] for query in context]
+
+    def assertQueriesDoNotGrow(
+        self,
+        func: Callable[[], Any],
+        grow: Callable[[], Any],
+        using: str = DEFAULT_DB_ALIAS
+    ) -> None:
+        """Fail if func executes more queries after grow adds rows."""
+        before_count, _ = self.get_queries_count(func=func, using=using)
+        grow()
+        after_count, queries = self.get_queries_count(func=func, using=using)
+        if after_count > before_count:
+            self.fail(
+                f"{after_count - before_count} extra queries executed "
+                f"({before_count} -> {after_count}):\n" +
+                "\n".join(
+                    f"{index}. {sql}"
+                    for index, sql in enumerate(queries, start=1)
+                )
+            )
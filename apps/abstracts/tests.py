@@ -1,3 +1,247 @@
-from django.test import TestCase
+# Python
+from typing import (
+    Any,
+    Optional,
+)
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from decimal import Decimal
+from uuid import UUID
+import gzip
 
-# Create your tests here.
+# Third party
+import brotli
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Django
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.test import (
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+# Rest Framework
+from rest_framework.renderers import JSONRenderer
+
+# Project
+from abstracts.metrics import metrics_registry
+from abstracts.renderers import ORJSONRenderer
+from auths.models import CustomUser
+from chats.models import Message
+
+
+class MetricsMiddlewareTestCase(TestCase):
+    """Per view action histograms and their endpoint."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user: CustomUser = CustomUser.objects.create_user(
+            login="user",
+            first_name="User",
+            password="password"
+        )
+        cls.admin: CustomUser = CustomUser.objects.create_superuser(
+            login="admin",
+            first_name="Admin",
+            password="password"
+        )
+
+    def setUp(self) -> None:
+        metrics_registry.clear()
+
+    def get_auth_header(self, user: CustomUser) -> dict[str, str]:
+        return {
+            "HTTP_AUTHORIZATION": "JWT "
+            f"{RefreshToken.for_user(user=user).access_token}"
+        }
+
+    def test_request_is_recorded_by_view_action(self) -> None:
+        self.client.get(
+            "/api/v1/auths/users/messages",
+            **self.get_auth_header(user=self.user)
+        )
+        labels: str = 'view="CustomUserViewSet",action="get_user_messages",' \
+            'method="GET",status="2xx"'
+        content: str = self.client.get(
+            reverse("metrics"),
+            **self.get_auth_header(user=self.admin)
+        ).content.decode()
+        self.assertIn(
+            f"http_request_duration_seconds_count{{{labels}}} 1",
+            content
+        )
+        self.assertIn(
+            f"http_request_serialization_seconds_count{{{labels}}} 1",
+            content
+        )
+        self.assertNotIn(
+            f'http_request_db_queries_bucket{{{labels},le="0"}} 1',
+            content
+        )
+
+    def test_metrics_are_admin_only(self) -> None:
+        response = self.client.get(
+            reverse("metrics"),
+            **self.get_auth_header(user=self.user)
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(
+    MIDDLEWARE=[
+        settings.ADMIN_ONLY_MIDDLEWARE.get(middleware, middleware)
+        for middleware in settings.MIDDLEWARE
+    ],
+    JWT_STATELESS_LOGIN=True,
+    PASSWORD_HASHING_CONF={
+        **settings.PASSWORD_HASHING_CONF,
+        "PBKDF2_ITERATIONS": 1000,
+    }
+)
+class StatelessApiTestCase(TestCase):
+    """Sessions only for the admin site."""
+
+    def test_api_does_not_write_sessions(self) -> None:
+        response = self.client.post(
+            reverse("customuser-user_registration"),
+            data={
+                "login": "user",
+                "first_name": "User",
+                "password": "password",
+            },
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(
+            reverse("customuser-login_user"),
+            data={"login": "user", "password": "password"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertFalse(Session.objects.exists())
+
+    def test_admin_keeps_sessions_and_csrf(self) -> None:
+        response = self.client.get(reverse("admin:login"))
+        self.assertIn(settings.CSRF_COOKIE_NAME, response.cookies)
+        self.client.force_login(
+            CustomUser.objects.create_superuser(
+                login="admin",
+                first_name="Admin",
+                password="password"
+            )
+        )
+        self.assertEqual(
+            self.client.get(reverse("admin:index")).status_code,
+            200
+        )
+        self.assertTrue(Session.objects.exists())
+
+
+class ORJSONRendererTestCase(TestCase):
+    """ORJSONRenderer renders the same bytes as JSONRenderer."""
+
+    def assertRendersSame(
+        self,
+        data: Any,
+        media_type: Optional[str] = None
+    ) -> None:
+        self.assertEqual(
+            ORJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type)
+        )
+
+    def test_same_bytes(self) -> None:
+        self.assertRendersSame(
+            data={
+                "text": "".join(map(chr, range(32))) +
+                "\"\\/\u2028\u2029 привет 😀 </script>",
+                "datetimes": [
+                    datetime(2024, 1, 1, tzinfo=timezone.utc),
+                    datetime(2024, 1, 1, 1, 2, 3, 456, tzinfo=timezone.utc),
+                    datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=3))),
+                    datetime(2024, 1, 1),
+                ],
+                "numbers": [0, -1, 2 ** 63 - 1, 1.5, Decimal("1.25")],
+                "uuid": UUID(int=1),
+                "flags": (True, False, None),
+                "nested": [{"data": []}, {}],
+            }
+        )
+
+    def test_fallbacks(self) -> None:
+        self.assertRendersSame(data=None)
+        self.assertRendersSame(data={"big": 2 ** 64})
+        self.assertRendersSame(data={1: "key"})
+        self.assertRendersSame(
+            data={"data": [1, 2]},
+            media_type="application/json; indent=4"
+        )
+        value: Any
+        for value in (
+            float("nan"),
+            float("inf"),
+            -float("inf"),
+            Decimal("NaN"),
+        ):
+            with self.subTest(value=value):
+                data: dict[str, Any] = {"next": None, "data": [[value]]}
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render(data)
+                with self.assertRaises(ValueError):
+                    ORJSONRenderer().render(data)
+
+
+class CompressionMiddlewareTestCase(TestCase):
+    """Content negotiated compression of big responses."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user: CustomUser = CustomUser.objects.create_user(
+            login="user",
+            first_name="User",
+            password="password"
+        )
+        Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=cls.user)
+                for index in range(50)
+            ]
+        )
+
+    def get_messages(self, accept_encoding: str) -> Any:
+        return self.client.get(
+            reverse("customuser-user_messages"),
+            HTTP_ACCEPT_ENCODING=accept_encoding,
+            HTTP_AUTHORIZATION="JWT "
+            f"{RefreshToken.for_user(user=self.user).access_token}"
+        )
+
+    def test_negotiated_encoding(self) -> None:
+        plain: bytes = self.get_messages(accept_encoding="").content
+        response: Any = self.get_messages(accept_encoding="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), plain)
+        self.assertTrue(response["ETag"].startswith("W/"))
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        response = self.get_messages(accept_encoding="gzip, br;q=0.5")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain)
+
+        response = self.get_messages(accept_encoding="gzip;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, plain)
+
+    def test_small_responses_are_not_compressed(self) -> None:
+        response: Any = self.client.post(
+            reverse("customuser-login_user"),
+            data={"login": "user", "password": "password"},
+            HTTP_ACCEPT_ENCODING="gzip, br"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Content-Encoding"))
@@ -1,8 +1,17 @@
 # Python
 from typing import (
     Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
     Optional,
 )
+from itertools import islice
+import json
+
+# Django
+from django.core.serializers.json import DjangoJSONEncoder
 
 
 def cast_to_int(value: Any) -> Optional[int]:
@@ -10,3 +19,37 @@ def cast_to_int(value: Any) -> Optional[int]:
         return int(value)
     except ValueError:
         return None
+
+
+def iter_ndjson(
+    rows: Iterable[dict[str, Any]],
+    chunk_size: int = 1000
+) -> Iterator[str]:
+    """Encode rows to newline-delimited JSON by chunks of lines."""
+    encoder: DjangoJSONEncoder = DjangoJSONEncoder(ensure_ascii=False)
+    rows_iterator: Iterator[dict[str, Any]] = iter(rows)
+    while True:
+        chunk: list[str] = [
+            encoder.encode(row)
+            for row in islice(rows_iterator, chunk_size)
+        ]
+        if not chunk:
+            return
+        yield "\n".join(chunk) + "\n"
+
+
+async def aiter_ndjson(
+    rows: AsyncIterable[dict[str, Any]],
+    chunk_size: int = 1000
+) -> AsyncIterator[str]:
+    """Encode async rows to newline-delimited JSON by chunks of lines."""
+    encoder: DjangoJSONEncoder = DjangoJSONEncoder(ensure_ascii=False)
+    chunk: list[str] = []
+    row: dict[str, Any]
+    async for row in rows:
+        chunk.append(encoder.encode(row))
+        if len(chunk) >= chunk_size:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
@@ -1,3 +1,23 @@
-from django.shortcuts import render
+# Django
+from django.http import HttpResponse
 
-# Create your views here.
+# Rest Framework
+from rest_framework.request import Request as DRF_Request
+from rest_framework.permissions import IsAdminUser
+from rest_framework.decorators import (
+    api_view,
+    permission_classes,
+)
+
+# Project
+from abstracts.metrics import metrics_registry
+
+
+@api_view(["GET"])
+@permission_classes((IsAdminUser,))
+def get_metrics(request: DRF_Request) -> HttpResponse:
+    """Handle GET-request to obtain metrics in Prometheus format."""
+    return HttpResponse(
+        content=metrics_registry.render_prometheus(),
+        content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
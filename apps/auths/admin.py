@@ -15,11 +15,18 @@ from django.http.request import HttpRequest
 # Project
 from auths.models import CustomUser
 from abstracts.filters import DeletedStateFilter
-from abstracts.admin import AbstractAdminIsDeleted
+from abstracts.admin import (
+    AbstractAdminIsDeleted,
+    AbstractAdminPerformance,
+)
 
 
 @admin.register(CustomUser)
-class CustomUserAdmin(AbstractAdminIsDeleted, UserAdmin):
+class CustomUserAdmin(
+    AbstractAdminPerformance,
+    AbstractAdminIsDeleted,
+    UserAdmin
+):
     """CustomUser setting on Django admin site."""
 
     ordering: tuple[str] = ("-datetime_updated", "-id")
@@ -31,6 +38,8 @@ class CustomUserAdmin(AbstractAdminIsDeleted, UserAdmin):
         "is_active",
         "is_staff",
         "is_superuser",
+        "messages_count",
+        "last_message_at",
         "get_is_deleted",
     )
     list_display_links: Sequence[str] = (
@@ -39,15 +48,17 @@ class CustomUserAdmin(AbstractAdminIsDeleted, UserAdmin):
         "login",
     )
     readonly_fields: tuple[str] = (
+        "messages_count",
+        "last_message_at",
         "get_is_deleted",
         "datetime_deleted",
         "datetime_created",
         "datetime_updated",
     )
+    # Numeric terms match id, text ones use trigram indexes on PostgreSQL.
     search_fields: Sequence[str] = (
-        "id",
+        "^login",
         "first_name",
-        "login",
     )
     list_filter: tuple[str, Any] = (
         "is_active",
@@ -76,6 +87,15 @@ class CustomUserAdmin(AbstractAdminIsDeleted, UserAdmin):
                 )
             }
         ),
+        (
+            "Сообщения",
+            {
+                "fields": (
+                    "messages_count",
+                    "last_message_at",
+                )
+            }
+        ),
         (
             "Данные времени",
             {
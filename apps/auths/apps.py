@@ -5,3 +5,6 @@ class AuthsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'auths'
     verbose_name: str = "Пользователи"
+
+    def ready(self) -> None:
+        import auths.signals  # noqa
@@ -0,0 +1,86 @@
+# Python
+from typing import Any
+
+# Third party
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Django
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+)
+
+# Rest Framework
+from rest_framework.request import Request as DRF_Request
+from rest_framework.permissions import IsAuthenticated
+
+# Project
+from abstracts.decorators import (
+    async_api_view,
+    get_json_response,
+)
+from abstracts.handlers import DRFResponseHandler
+from abstracts.paginators import KeysetCursorPagination
+from auths.permission import IsNonDeletedUser
+from chats.models import Message
+from chats.serializers import MessageForeignKeySerializer
+
+
+@async_api_view(
+    methods=("GET",),
+    permission_classes=(IsAuthenticated, IsNonDeletedUser,)
+)
+async def get_user_messages(
+    request: HttpRequest,
+    *args: tuple[Any],
+    **kwargs: dict[Any, Any]
+) -> HttpResponse:
+    """Handle GET-request to obtain user messages asynchronously.
+
+    Pages carry the same ETag validator as the synchronous view.
+    """
+    handler: DRFResponseHandler = DRFResponseHandler()
+    paginator: KeysetCursorPagination = KeysetCursorPagination()
+    messages: list[Message] = await paginator.apaginate_queryset(
+        queryset=request.user.messages.get_not_deleted(),
+        request=DRF_Request(request)
+    )
+    etag: str = handler.get_etag(
+        request=request,
+        data=messages,
+        serializer_class=MessageForeignKeySerializer,
+        paginator=paginator
+    )
+    if handler.is_not_modified(request=request, etag=etag):
+        return handler.set_etag(
+            response=HttpResponseNotModified(),
+            etag=etag
+        )
+    return handler.set_etag(
+        response=get_json_response(
+            data={
+                "data": MessageForeignKeySerializer(messages, many=True).data,
+                "next": paginator.get_next_link(),
+            }
+        ),
+        etag=etag
+    )
+
+
+@async_api_view(
+    methods=("GET",),
+    permission_classes=(IsAuthenticated, IsNonDeletedUser,)
+)
+async def get_token(
+    request: HttpRequest,
+    *args: tuple[Any],
+    **kwargs: dict[Any, Any]
+) -> HttpResponse:
+    """Handle GET-request to obtain token asynchronously."""
+    refresh_token: RefreshToken = RefreshToken.for_user(user=request.user)
+    return get_json_response(
+        data={
+            "token": str(refresh_token.access_token),
+        }
+    )
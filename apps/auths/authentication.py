@@ -11,11 +11,20 @@ from jwt import (
     decode,
 )
 from jwt.exceptions import InvalidSignatureError
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication as SimpleJWTAuthentication,
+)
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
 
 # Django
 from django.conf import settings
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractBaseUser
+from django.http import HttpRequest
 
 # Rest Framework
 from rest_framework.authentication import BaseAuthentication
@@ -81,3 +90,91 @@ class JWTAuthentication(BaseAuthentication):
         #     'exp': exp,
 
         # }
+
+
+class CachedJWTAuthentication(SimpleJWTAuthentication):
+    """SimpleJWT authentication which keeps users in the cache.
+
+    Cached users are invalidated by CustomUser.save and delete,
+    counters of messages are deferred so message writes keep them.
+    """
+
+    def get_user_id(self, validated_token: Token) -> Any:
+        """Get user identifier from the token."""
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                "Token contained no recognizable user identification"
+            )
+
+    def check_user(self, user: CustomUser, validated_token: Token) -> None:
+        """Check user the same way SimpleJWT does."""
+        if not user.is_active:
+            raise AuthenticationFailed(
+                "User is inactive",
+                code="user_inactive"
+            )
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                "The user's password has been changed.",
+                code="password_changed"
+            )
+
+    def get_user(self, validated_token: Token) -> CustomUser:
+        """Get user of the token from cache or database."""
+        user_id: Any = self.get_user_id(validated_token=validated_token)
+        cache_key: str = CustomUser.get_cache_key(user_id=user_id)
+        user: Optional[CustomUser] = cache.get(cache_key)
+        if user is None:
+            try:
+                user = CustomUser.objects.defer(
+                    *CustomUser.COUNTER_FIELDS
+                ).get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except CustomUser.DoesNotExist:
+                raise AuthenticationFailed(
+                    "User not found",
+                    code="user_not_found"
+                )
+            cache.set(cache_key, user, settings.AUTH_USER_CACHE_TTL)
+        self.check_user(user=user, validated_token=validated_token)
+        return user
+
+    async def aget_user(self, validated_token: Token) -> CustomUser:
+        """Get user of the token from cache or database asynchronously."""
+        user_id: Any = self.get_user_id(validated_token=validated_token)
+        cache_key: str = CustomUser.get_cache_key(user_id=user_id)
+        user: Optional[CustomUser] = await cache.aget(cache_key)
+        if user is None:
+            try:
+                user = await CustomUser.objects.defer(
+                    *CustomUser.COUNTER_FIELDS
+                ).aget(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except CustomUser.DoesNotExist:
+                raise AuthenticationFailed(
+                    "User not found",
+                    code="user_not_found"
+                )
+            await cache.aset(cache_key, user, settings.AUTH_USER_CACHE_TTL)
+        self.check_user(user=user, validated_token=validated_token)
+        return user
+
+    async def aauthenticate(
+        self,
+        request: HttpRequest
+    ) -> Optional[tuple[CustomUser, Token]]:
+        """Authenticate plain django request in async views."""
+        header: Optional[bytes] = self.get_header(request)
+        if header is None:
+            return None
+        raw_token: Optional[bytes] = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token: Token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
@@ -0,0 +1,60 @@
+# Django
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+    Argon2PasswordHasher,
+)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 hasher with iterations from PASSWORD_HASHING_CONF.
+
+    Algorithm name isn't changed, so existing hashes are verified and
+    rehashed on login when the iterations setting changes.
+    """
+
+    @property
+    def iterations(self) -> int:
+        return settings.PASSWORD_HASHING_CONF["PBKDF2_ITERATIONS"]
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt hasher with parameters from PASSWORD_HASHING_CONF."""
+
+    @property
+    def work_factor(self) -> int:
+        return settings.PASSWORD_HASHING_CONF["SCRYPT_WORK_FACTOR"]
+
+    @property
+    def block_size(self) -> int:
+        return settings.PASSWORD_HASHING_CONF["SCRYPT_BLOCK_SIZE"]
+
+    @property
+    def parallelism(self) -> int:
+        return settings.PASSWORD_HASHING_CONF["SCRYPT_PARALLELISM"]
+
+    @property
+    def maxmem(self) -> int:
+        """Get memory limit of scrypt.
+
+        OpenSSL refuses scrypt above 32 MiB by default, and hashes
+        made with bigger previous parameters must stay verifiable.
+        """
+        return settings.PASSWORD_HASHING_CONF["SCRYPT_MAXMEM"]
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id hasher with parameters from PASSWORD_HASHING_CONF."""
+
+    @property
+    def time_cost(self) -> int:
+        return settings.PASSWORD_HASHING_CONF["ARGON2_TIME_COST"]
+
+    @property
+    def memory_cost(self) -> int:
+        return settings.PASSWORD_HASHING_CONF["ARGON2_MEMORY_COST"]
+
+    @property
+    def parallelism(self) -> int:
+        return settings.PASSWORD_HASHING_CONF["ARGON2_PARALLELISM"]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.5 on 2026-10-18 14:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auths', '0002_customuser_telegram_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='время и дата последнего сообщения'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='messages_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество сообщений'),
+        ),
+    ]
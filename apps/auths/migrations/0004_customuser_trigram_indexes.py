@@ -0,0 +1,45 @@
+from django.db import migrations
+
+TABLE = "auths_customuser"
+COLUMNS = ("login", "first_name")
+
+
+def create_trigram_indexes(apps, schema_editor) -> None:
+    """Index UPPER(column::text), the admin's icontains compares it.
+
+    Indexes are built concurrently, so the migration isn't atomic.
+    pg_trgm must be allowed for the database user.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in COLUMNS:
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {TABLE}_{column}_trgm "
+            f"ON {TABLE} USING GIN (UPPER({column}::text) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor) -> None:
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in COLUMNS:
+        schema_editor.execute(
+            f"DROP INDEX CONCURRENTLY IF EXISTS {TABLE}_{column}_trgm"
+        )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('auths', '0003_customuser_message_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            code=create_trigram_indexes,
+            reverse_code=drop_trigram_indexes
+        ),
+    ]
@@ -10,19 +10,27 @@ from django.contrib.auth.models import (
     PermissionsMixin,
     BaseUserManager,
 )
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db.transaction import on_commit
 from django.db.models import (
     CharField,
     BooleanField,
     BigIntegerField,
-    QuerySet,
+    PositiveIntegerField,
+    DateTimeField,
 )
 
 # Project
-from abstracts.models import AbstractDateTime
+from abstracts.models import (
+    AbstractDateTime,
+    AbstractDateTimeQuerySet,
+)
 
 
-class CustomUserManager(BaseUserManager):
+class CustomUserManager(
+    BaseUserManager.from_queryset(AbstractDateTimeQuerySet)
+):
     """CustomUserManger."""
 
     def __obtain_user_instance(
@@ -85,17 +93,17 @@ class CustomUserManager(BaseUserManager):
         new_user.save(using=self._db)
         return new_user
 
-    def get_deleted(self) -> QuerySet:
-        """Get deleted users."""
-        return self.filter(
-            datetime_deleted__isnull=False
-        )
+    def get_login_user(self, login: str) -> Optional['CustomUser']:
+        """Get user by login with only columns needed to log in.
 
-    def get_not_deleted(self) -> QuerySet:
-        """Get not deleted users."""
-        return self.filter(
-            datetime_deleted__isnull=True
-        )
+        Deleted and inactive users are not fetched, so their passwords
+        are never hashed and checked.
+        """
+        return self.only(*CustomUser.LOGIN_FIELDS).filter(
+            login=login,
+            datetime_deleted__isnull=True,
+            is_active=True
+        ).first()
 
     def get_user_by_login(self, login: str) -> Optional['CustomUser']:
         """Get user by provided login."""
@@ -115,6 +123,22 @@ class CustomUser(
     """CustomUser model database."""
     LOGIN_MAX_LEN = 200
     FIRST_NAME_LEN = 254
+    # Change with every message, so they are deferred in the cached
+    # authenticated user and read only where they are serialized.
+    COUNTER_FIELDS: tuple[str] = (
+        "messages_count",
+        "last_message_at",
+    )
+    LOGIN_FIELDS: tuple[str] = (
+        "id",
+        "login",
+        "password",
+        "first_name",
+        "is_active",
+        "is_staff",
+        "datetime_created",
+        "datetime_deleted",
+    ) + COUNTER_FIELDS
 
     login: CharField = CharField(
         max_length=LOGIN_MAX_LEN,
@@ -142,6 +166,16 @@ class CustomUser(
         default=False,
         verbose_name="Статус менеджера"
     )
+    # Denormalized from not deleted messages, see chats.signals.
+    messages_count: PositiveIntegerField = PositiveIntegerField(
+        default=0,
+        verbose_name="Количество сообщений"
+    )
+    last_message_at: DateTimeField = DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="время и дата последнего сообщения"
+    )
     objects = CustomUserManager()
 
     USERNAME_FIELD = 'login'
@@ -162,12 +196,40 @@ class CustomUser(
     def __str__(self) -> str:
         return self.login
 
+    @staticmethod
+    def get_cache_key(user_id: Any) -> str:
+        """Get cache key of the authenticated user."""
+        return f"auths:user:{user_id}"
+
+    @classmethod
+    def invalidate_cache_many(cls, user_ids: list[Any]) -> None:
+        """Drop cached users now and after the transaction is committed."""
+        cache_keys: list[str] = [
+            cls.get_cache_key(user_id=user_id) for user_id in user_ids
+        ]
+        cache.delete_many(cache_keys)
+        on_commit(lambda: cache.delete_many(cache_keys))
+
+    def invalidate_cache(self) -> None:
+        """Drop cached user now and after the transaction is committed."""
+        self.invalidate_cache_many(user_ids=[self.pk])
+
+    def save(self, *args: tuple[Any], **kwargs: dict[str, Any]) -> None:
+        """Save user and invalidate its cached copy."""
+        super().save(*args, **kwargs)
+        self.invalidate_cache()
+
+    def delete(self, *args: tuple[Any], **kwargs: dict[str, Any]) -> None:
+        """Delete user and invalidate its cached copy."""
+        super().delete(*args, **kwargs)
+        self.invalidate_cache()
+
     def recover(self, *args: tuple[Any], **kwargs: dict[str, Any]) -> None:
         """Recover the user if he is deleted."""
         if self.datetime_deleted:
             self.datetime_deleted = None
             self.save(
-                update_fields=['datetime_deleted']
+                update_fields=['datetime_deleted', 'datetime_updated']
             )
 
     def set_telegram_id(self, telegram_id: int) -> None:
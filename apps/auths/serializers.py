@@ -32,6 +32,8 @@ class CustomUserListSerializer(AbstractDateTimeSerializer, ModelSerializer):
             "is_staff",
             "datetime_created",
             "is_deleted",
+            "messages_count",
+            "last_message_at",
         )
 
 
@@ -0,0 +1,44 @@
+# Python
+from typing import Any
+
+# Django
+from django.dispatch import receiver
+from django.db.models.base import ModelBase
+
+# Project
+from abstracts.signals import (
+    post_purge,
+    post_soft_delete,
+    post_recover,
+)
+from auths.models import CustomUser
+
+
+@receiver(
+    signal=post_soft_delete,
+    sender=CustomUser
+)
+@receiver(
+    signal=post_recover,
+    sender=CustomUser
+)
+def post_bulk_update_users(
+    sender: ModelBase,
+    pks: list[Any],
+    **kwargs: dict
+) -> None:
+    """Triggers when users are soft deleted or recovered in bulk."""
+    CustomUser.invalidate_cache_many(user_ids=pks)
+
+
+@receiver(
+    signal=post_purge,
+    sender=CustomUser
+)
+def post_purge_users(
+    sender: ModelBase,
+    pks: list[Any],
+    **kwargs: dict
+) -> None:
+    """Triggers when expired users are hard deleted."""
+    CustomUser.invalidate_cache_many(user_ids=pks)
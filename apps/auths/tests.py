@@ -1,3 +1,590 @@
-from django.test import TestCase
+# Python
+from typing import Any
+from base64 import urlsafe_b64encode
+from datetime import timedelta
+from unittest.mock import patch
+import json
 
-# Create your tests here.
+# Third party
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.test import (
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+from django.utils import timezone
+
+# Project
+from abstracts.paginators import KeysetCursorPagination
+from auths.models import CustomUser
+from auths.serializers import CustomUserListSerializer
+from chats.models import Message
+
+
+class CustomUserListSerializerTestCase(TestCase):
+    """Fast values() path of CustomUserListSerializer."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        CustomUser.objects.create_user(
+            login="user",
+            first_name="Пользователь",
+            password="password"
+        )
+        CustomUser.objects.create_superuser(
+            login="admin",
+            first_name="Admin",
+            password="password"
+        ).delete()
+
+    def test_fast_representation_matches_serializer(self) -> None:
+        queryset = CustomUser.objects.order_by("id")
+        self.assertEqual(
+            CustomUserListSerializer.get_fast_representation(
+                rows=queryset.values(
+                    *CustomUserListSerializer.get_fast_value_fields()
+                )
+            ),
+            CustomUserListSerializer(queryset, many=True).data
+        )
+
+
+@override_settings(
+    PASSWORD_HASHING_CONF={
+        **settings.PASSWORD_HASHING_CONF,
+        "PBKDF2_ITERATIONS": 1000,
+        "SCRYPT_WORK_FACTOR": 2 ** 10,
+        "ARGON2_MEMORY_COST": 1024,
+    }
+)
+class PasswordHashingPolicyTestCase(TestCase):
+    """Rehashing passwords of the previous policy on login."""
+
+    def setUp(self) -> None:
+        self.user: CustomUser = CustomUser.objects.create_user(
+            login="user",
+            first_name="User",
+            password="password"
+        )
+
+    def login(self) -> int:
+        return self.client.post(
+            reverse("customuser-login_user"),
+            data={"login": "user", "password": "password"}
+        ).status_code
+
+    def test_new_policy_rehashes_on_login(self) -> None:
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+        with self.settings(
+            PASSWORD_HASHERS=[
+                "auths.hashers.TunedArgon2PasswordHasher",
+                "auths.hashers.TunedPBKDF2PasswordHasher",
+            ]
+        ):
+            self.assertEqual(self.login(), 200)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith("argon2$argon2id$"))
+            self.assertEqual(self.login(), 200)
+
+    def test_changed_cost_rehashes_on_login(self) -> None:
+        with self.settings(
+            PASSWORD_HASHING_CONF={
+                **settings.PASSWORD_HASHING_CONF,
+                "PBKDF2_ITERATIONS": 2000,
+            }
+        ):
+            self.assertEqual(self.login(), 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+
+
+@override_settings(
+    PASSWORD_HASHING_CONF={
+        **settings.PASSWORD_HASHING_CONF,
+        "PBKDF2_ITERATIONS": 1000,
+    },
+    JWT_STATELESS_LOGIN=True
+)
+class LoginUserTestCase(TestCase):
+    """Stateless login_user."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        CustomUser.objects.create_user(
+            login="user",
+            first_name="User",
+            password="password"
+        )
+        CustomUser.objects.create_user(
+            login="deleted",
+            first_name="Deleted",
+            password="password"
+        ).delete()
+        CustomUser.objects.create_user(
+            login="inactive",
+            first_name="Inactive",
+            password="password",
+            is_active=False
+        )
+
+    def login(self, login: str, password: str = "password") -> Any:
+        return self.client.post(
+            reverse("customuser-login_user"),
+            data={"login": login, "password": password}
+        )
+
+    def test_login_reads_once_and_writes_nothing(self) -> None:
+        with self.assertNumQueries(1):
+            response = self.login(login="user")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.data)
+        self.assertIsNone(CustomUser.objects.get(login="user").last_login)
+
+    def test_login_errors_are_generic(self) -> None:
+        login: str
+        password: str
+        for login, password in (
+            ("unknown", "password"),
+            ("user", "wrong"),
+            ("deleted", "password"),
+            ("inactive", "password"),
+            ("deleted", "wrong"),
+        ):
+            with self.subTest(login=login, password=password):
+                response: Any = self.login(login=login, password=password)
+                self.assertEqual(response.status_code, 403)
+                self.assertEqual(
+                    response.json(),
+                    {"detail": "Неверный логин или пароль"}
+                )
+
+    def test_unavailable_users_passwords_are_not_checked(self) -> None:
+        login: str
+        for login in ("deleted", "inactive"):
+            with self.subTest(login=login), patch.object(
+                CustomUser,
+                "check_password"
+            ) as check_password:
+                self.assertEqual(self.login(login=login).status_code, 403)
+            check_password.assert_not_called()
+
+
+class CachedJWTAuthenticationTestCase(TestCase):
+    """Authenticated users kept in the cache."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user: CustomUser = CustomUser.objects.create_user(
+            login="user",
+            first_name="User",
+            password="password"
+        )
+
+    def setUp(self) -> None:
+        self.cache_key: str = CustomUser.get_cache_key(user_id=self.user.pk)
+        cache.delete(self.cache_key)
+
+    def get_token_response(self) -> Any:
+        return self.client.get(
+            reverse("customuser-user_token"),
+            HTTP_AUTHORIZATION="JWT "
+            f"{RefreshToken.for_user(user=self.user).access_token}"
+        )
+
+    def test_message_writes_keep_cached_user(self) -> None:
+        self.assertEqual(self.get_token_response().status_code, 200)
+        cached: CustomUser = cache.get(self.cache_key)
+        self.assertEqual(
+            cached.get_deferred_fields(),
+            set(CustomUser.COUNTER_FIELDS)
+        )
+        Message.objects.create(text="Сообщение", owner=self.user)
+        Message.objects.filter(owner=self.user).soft_delete()
+        self.assertIsNotNone(cache.get(self.cache_key))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_token_response().status_code, 200)
+
+        self.user.first_name = "Renamed"
+        self.user.save()
+        self.assertIsNone(cache.get(self.cache_key))
+
+
+class UserMessagesETagTestCase(TestCase):
+    """Conditional GET of the user's messages page."""
+
+    url_name: str = "customuser-user_messages"
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user: CustomUser = CustomUser.objects.create_user(
+            login="user",
+            first_name="User",
+            password="password"
+        )
+        Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=cls.user)
+                for index in range(4)
+            ]
+        )
+
+    def get_messages(self, **headers: str) -> Any:
+        return self.client.get(
+            reverse(self.url_name),
+            {"page_size": 2},
+            HTTP_AUTHORIZATION="JWT "
+            f"{RefreshToken.for_user(user=self.user).access_token}",
+            **headers
+        )
+
+    def test_etag_is_computed_from_the_page(self) -> None:
+        response: Any = self.get_messages()
+        self.assertEqual(response.status_code, 200)
+        etag: str = response["ETag"].removeprefix("W/")
+        # Only the page is read, the auth user is cached.
+        with self.assertNumQueries(1):
+            response = self.get_messages(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Messages behind the page don't change it.
+        Message.objects.order_by("id").first().delete()
+        self.assertEqual(
+            self.get_messages(HTTP_IF_NONE_MATCH=etag).status_code,
+            304
+        )
+        Message.objects.create(text="Новое", owner=self.user)
+        self.assertEqual(
+            self.get_messages(HTTP_IF_NONE_MATCH=etag).status_code,
+            200
+        )
+
+
+class AsyncUserMessagesETagTestCase(UserMessagesETagTestCase):
+    """Async view keeps the conditional GET of the sync one."""
+
+    url_name: str = "async_user_messages"
+
+
+class UserMessagesPaginationTestCase(TestCase):
+    """Keyset cursor pages of the user's messages."""
+
+    url_name: str = "customuser-user_messages"
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user: CustomUser = CustomUser.objects.create_user(
+            login="user",
+            first_name="User",
+            password="password"
+        )
+        messages: list[Message] = Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=cls.user)
+                for index in range(7)
+            ]
+        )
+        # Pairs of messages share datetime_updated, so pages are split
+        # inside ties and rely on the id tiebreak.
+        started: Any = timezone.now() - timedelta(hours=1)
+        index: int
+        message: Message
+        for index, message in enumerate(messages):
+            Message.objects.filter(pk=message.pk).update(
+                datetime_updated=started + timedelta(seconds=index // 2)
+            )
+        cls.expected_ids: list[int] = list(
+            Message.objects.order_by(
+                "-datetime_updated", "-id"
+            ).values_list("id", flat=True)
+        )
+
+    def get_page(self, url: str, status_code: int = 200, **params) -> Any:
+        response: Any = self.client.get(
+            url,
+            params,
+            HTTP_AUTHORIZATION="JWT "
+            f"{RefreshToken.for_user(user=self.user).access_token}"
+        )
+        self.assertEqual(response.status_code, status_code)
+        return response.json()
+
+    def test_anonymous_is_rejected(self) -> None:
+        response: Any = self.client.get(reverse(self.url_name))
+        self.assertEqual(response.status_code, 401)
+
+    def test_pages_follow_next_links(self) -> None:
+        ids: list[int] = []
+        data: dict = self.get_page(
+            url=reverse(self.url_name),
+            page_size="2"
+        )
+        ids.extend(message["id"] for message in data["data"])
+        while data["next"]:
+            data = self.get_page(url=data["next"])
+            ids.extend(message["id"] for message in data["data"])
+        self.assertEqual(ids, self.expected_ids)
+        self.assertEqual(len(data["data"]), 1)
+        self.assertIsNone(data["next"])
+
+    def test_invalid_cursors(self) -> None:
+        cursor: str
+        for cursor in (
+            "not-base64!",
+            urlsafe_b64encode(b"{}").decode(),
+            urlsafe_b64encode(b'["2024-01-01T00:00:00"]').decode(),
+            urlsafe_b64encode(b'["not a date", 1]').decode(),
+        ):
+            with self.subTest(cursor=cursor):
+                self.get_page(
+                    url=reverse(self.url_name),
+                    status_code=404,
+                    cursor=cursor
+                )
+
+    def test_page_size_is_clamped(self) -> None:
+        with patch.object(KeysetCursorPagination, "max_page_size", 3):
+            data: dict = self.get_page(
+                url=reverse(self.url_name),
+                page_size="100"
+            )
+        self.assertEqual(
+            [message["id"] for message in data["data"]],
+            self.expected_ids[:3]
+        )
+        self.assertIsNotNone(data["next"])
+
+
+class AsyncUserMessagesPaginationTestCase(UserMessagesPaginationTestCase):
+    """Async view keeps the pagination of the sync one."""
+
+    url_name: str = "async_user_messages"
+
+
+@override_settings(MESSAGES_EXPORT_CHUNK_SIZE=2)
+class UserMessagesExportTestCase(TestCase):
+    """NDJSON export of the user's messages on WSGI and ASGI."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user: CustomUser = CustomUser.objects.create_user(
+            login="user",
+            first_name="User",
+            password="password"
+        )
+        other: CustomUser = CustomUser.objects.create_user(
+            login="other",
+            first_name="Other",
+            password="password"
+        )
+        cls.messages: list[Message] = Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=cls.user)
+                for index in range(5)
+            ] + [Message(text="Чужое", owner=other)]
+        )
+        cls.messages[0].delete()
+        cls.token: str = str(RefreshToken.for_user(user=cls.user).access_token)
+
+    def assertExported(self, content: bytes) -> None:
+        rows: list[dict[str, Any]] = [
+            json.loads(line) for line in content.decode().splitlines()
+        ]
+        self.assertEqual(
+            [row["id"] for row in rows],
+            [message.pk for message in self.messages[1:5]]
+        )
+        self.assertEqual(rows[0]["text"], "Сообщение 1")
+        self.assertEqual(
+            set(rows[0]),
+            {"id", "text", "datetime_created", "datetime_updated"}
+        )
+
+    def test_export_streams_rows(self) -> None:
+        response: Any = self.client.get(
+            reverse("customuser-user_messages_export"),
+            HTTP_AUTHORIZATION=f"JWT {self.token}"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertFalse(response.is_async)
+        self.assertExported(content=b"".join(response.streaming_content))
+
+    async def test_export_streams_rows_asynchronously(self) -> None:
+        response: Any = await self.async_client.get(
+            reverse("customuser-user_messages_export"),
+            headers={"Authorization": f"JWT {self.token}"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        # Async iterator is streamed by ASGI instead of being buffered.
+        self.assertTrue(response.is_async)
+        chunks: list[bytes] = [
+            chunk async for chunk in response.streaming_content
+        ]
+        self.assertEqual(len(chunks), 2)
+        self.assertExported(content=b"".join(chunks))
+
+    def test_export_created_range(self) -> None:
+        Message.objects.filter(pk=self.messages[1].pk).update(
+            datetime_created=timezone.now() - timedelta(days=400)
+        )
+        response: Any = self.client.get(
+            reverse("customuser-user_messages_export"),
+            {
+                "created_from": (
+                    timezone.now() - timedelta(days=365)
+                ).isoformat(),
+            },
+            HTTP_AUTHORIZATION=f"JWT {self.token}"
+        )
+        self.assertEqual(
+            [
+                json.loads(line)["id"] for line in b"".join(
+                    response.streaming_content
+                ).decode().splitlines()
+            ],
+            [message.pk for message in self.messages[2:5]]
+        )
+        response = self.client.get(
+            reverse("customuser-user_messages_export"),
+            {"created_to": "вчера"},
+            HTTP_AUTHORIZATION=f"JWT {self.token}"
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(MESSAGES_SYNC_SAFETY_LAG_SECONDS=0)
+class UserMessagesSyncTestCase(TestCase):
+    """Watermark and tombstones of the messages sync."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user: CustomUser = CustomUser.objects.create_user(
+            login="user",
+            first_name="User",
+            password="password"
+        )
+        cls.messages: list[Message] = Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=cls.user)
+                for index in range(3)
+            ]
+        )
+        started: Any = timezone.now() - timedelta(hours=1)
+        index: int
+        message: Message
+        for index, message in enumerate(cls.messages):
+            Message.objects.filter(pk=message.pk).update(
+                datetime_updated=started + timedelta(seconds=index)
+            )
+
+    def sync(self, status_code: int = 200, **params: str) -> dict:
+        response: Any = self.client.get(
+            reverse("customuser-user_messages_sync"),
+            params,
+            HTTP_AUTHORIZATION="JWT "
+            f"{RefreshToken.for_user(user=self.user).access_token}"
+        )
+        self.assertEqual(response.status_code, status_code)
+        return response.json()
+
+    def get_ids(self, data: dict) -> list[int]:
+        return [message["id"] for message in data["data"]["updated"]]
+
+    def test_watermark_is_stable_without_changes(self) -> None:
+        first: dict = self.sync()
+        self.assertEqual(
+            self.get_ids(data=first),
+            [message.pk for message in self.messages]
+        )
+        self.assertEqual(first["data"]["deleted"], [])
+        self.assertFalse(first["has_more"])
+        second: dict = self.sync(since=first["watermark"])
+        self.assertEqual(second["data"], {"updated": [], "deleted": []})
+        self.assertEqual(second["watermark"], first["watermark"])
+
+    def test_soft_delete_is_sent_as_tombstone(self) -> None:
+        watermark: str = self.sync()["watermark"]
+        Message.objects.filter(pk=self.messages[1].pk).soft_delete()
+        data: dict = self.sync(since=watermark)
+        self.assertEqual(data["data"]["updated"], [])
+        self.assertEqual(data["data"]["deleted"], [self.messages[1].pk])
+        self.assertNotEqual(data["watermark"], watermark)
+
+    def test_has_more_pages(self) -> None:
+        first: dict = self.sync(page_size="2")
+        self.assertEqual(
+            self.get_ids(data=first),
+            [self.messages[0].pk, self.messages[1].pk]
+        )
+        self.assertTrue(first["has_more"])
+        second: dict = self.sync(page_size="2", since=first["watermark"])
+        self.assertEqual(self.get_ids(data=second), [self.messages[2].pk])
+        self.assertFalse(second["has_more"])
+
+    @override_settings(MESSAGES_SYNC_SAFETY_LAG_SECONDS=60)
+    def test_recent_changes_are_held_back(self) -> None:
+        watermark: str = self.sync()["watermark"]
+        Message.objects.create(text="Новое", owner=self.user)
+        data: dict = self.sync(since=watermark)
+        self.assertEqual(data["data"], {"updated": [], "deleted": []})
+        self.assertEqual(data["watermark"], watermark)
+
+    def test_malformed_since(self) -> None:
+        self.sync(status_code=404, since="not-a-watermark")
+        self.sync(status_code=404, since="WyJ4Il0=")
+
+
+class CustomUserAdminTestCase(TestCase):
+    """Search and performance mode of the users changelist."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin: CustomUser = CustomUser.objects.create_superuser(
+            login="admin",
+            first_name="Администратор",
+            password="password"
+        )
+        cls.user: CustomUser = CustomUser.objects.create_user(
+            login="user",
+            first_name="Пользователь",
+            password="password"
+        )
+
+    def get_changelist(self, **params: str) -> Any:
+        self.client.force_login(self.admin)
+        return self.client.get(
+            reverse("admin:auths_customuser_changelist"),
+            params
+        ).context["cl"]
+
+    def search(self, term: str) -> list[int]:
+        return [
+            user.pk for user in self.get_changelist(q=term).result_list
+        ]
+
+    def test_search_by_id_and_login_prefix(self) -> None:
+        self.assertEqual(self.search(term=str(self.user.pk)), [self.user.pk])
+        self.assertEqual(self.search(term="adm"), [self.admin.pk])
+        self.assertEqual(self.search(term="dmin"), [])
+        self.assertEqual(self.search(term="Пользов"), [self.user.pk])
+
+    def test_performance_mode(self) -> None:
+        self.assertEqual(self.get_changelist().full_result_count, 2)
+        with override_settings(
+            ADMIN_PERFORMANCE_CONF={
+                **settings.ADMIN_PERFORMANCE_CONF,
+                "ENABLED": True,
+            }
+        ):
+            changelist: Any = self.get_changelist()
+        self.assertIsNone(changelist.full_result_count)
+        self.assertEqual(changelist.result_count, 2)
+        self.assertEqual(
+            [user.pk for user in changelist.result_list],
+            [self.user.pk, self.admin.pk]
+        )
@@ -3,13 +3,19 @@ from typing import (
     Any,
     Optional,
 )
+from datetime import timedelta
 
 # Third party
 from rest_framework_simplejwt.tokens import RefreshToken
 
 # Django
+from django.conf import settings
 from django.db.models import QuerySet
 from django.contrib.auth import login
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 # Rest Framework
 from rest_framework.request import Request as DRF_Request
@@ -23,7 +29,6 @@ from rest_framework.decorators import action
 from rest_framework.status import (
     HTTP_400_BAD_REQUEST,
     HTTP_200_OK,
-    HTTP_404_NOT_FOUND,
     HTTP_403_FORBIDDEN,
 )
 
@@ -38,9 +43,18 @@ from auths.permission import (
     IsSuperUserRequestAdmin,
     IsNonDeletedUser,
 )
-from abstracts.utils import cast_to_int
+from abstracts.utils import (
+    cast_to_int,
+    aiter_ndjson,
+    iter_ndjson,
+)
 from abstracts.handlers import DRFResponseHandler
 from abstracts.mixins import ModelInstanceMixin
+from abstracts.paginators import (
+    KeysetCursorPagination,
+    WatermarkPagination,
+)
+from chats.models import Message
 from chats.serializers import MessageForeignKeySerializer
 
 
@@ -89,10 +103,11 @@ class CustomUserViewSet(ModelInstanceMixin, DRFResponseHandler, ViewSet):
             )
             new_cust_user.set_password(raw_password=new_password)
             new_cust_user.save()
-            login(
-                request=request,
-                user=new_cust_user
-            )
+            if not settings.JWT_STATELESS_LOGIN:
+                login(
+                    request=request,
+                    user=new_cust_user
+                )
             refresh_token: RefreshToken = RefreshToken.for_user(
                 user=new_cust_user
             )
@@ -130,9 +145,122 @@ class CustomUserViewSet(ModelInstanceMixin, DRFResponseHandler, ViewSet):
             request=request,
             data=request.user.messages.get_not_deleted(),
             serializer_class=MessageForeignKeySerializer,
-            many=True
+            many=True,
+            paginator=KeysetCursorPagination(),
+            use_etag=True
+        )
+
+    @action(
+        methods=["GET"],
+        url_path="messages/sync",
+        url_name="user_messages_sync",
+        detail=False,
+        permission_classes=(IsAuthenticated, IsNonDeletedUser,)
+    )
+    def sync_messages(
+        self,
+        request: DRF_Request,
+        *args: tuple[Any],
+        **kwargs: dict[Any, Any]
+    ) -> DRF_Response:
+        """Handle GET-request to obtain messages changed since watermark."""
+        paginator: WatermarkPagination = WatermarkPagination(
+            safety_lag=timedelta(
+                seconds=settings.MESSAGES_SYNC_SAFETY_LAG_SECONDS
+            )
+        )
+        messages: list[Message] = paginator.paginate_queryset(
+            queryset=request.user.messages.all(),
+            request=request
+        )
+        return paginator.get_paginated_response(
+            data={
+                "updated": MessageForeignKeySerializer(
+                    [
+                        message for message in messages
+                        if not message.datetime_deleted
+                    ],
+                    many=True
+                ).data,
+                "deleted": [
+                    message.id for message in messages
+                    if message.datetime_deleted
+                ],
+            }
         )
 
+    @action(
+        methods=["GET"],
+        url_path="messages/export",
+        url_name="user_messages_export",
+        detail=False,
+        permission_classes=(IsAuthenticated, IsNonDeletedUser,)
+    )
+    def export_messages(
+        self,
+        request: DRF_Request,
+        *args: tuple[Any],
+        **kwargs: dict[Any, Any]
+    ) -> StreamingHttpResponse:
+        """Handle GET-request to export user messages as NDJSON.
+
+        Optional created_from and created_to bound datetime_created,
+        so only partitions of the range are read. ASGI serves only
+        async iterators without buffering them, so rows are read with
+        aiterator there and with iterator on WSGI.
+        """
+        bounds: dict[str, Any] = {}
+        param: str
+        for param in ("created_from", "created_to"):
+            value: Optional[str] = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                bounds[param] = parse_datetime(value)
+            except ValueError:
+                bounds[param] = None
+            if not bounds[param]:
+                return DRF_Response(
+                    data={
+                        "detail": f"Параметр {param} должен быть "
+                        "датой и временем в формате ISO 8601"
+                    },
+                    status=HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(bounds[param]):
+                bounds[param] = timezone.make_aware(bounds[param])
+        chunk_size: int = settings.MESSAGES_EXPORT_CHUNK_SIZE
+        rows: QuerySet = request.user.messages.get_not_deleted(
+        ).get_created_in_range(
+            start=bounds.get("created_from"),
+            end=bounds.get("created_to")
+        ).order_by(
+            "id"
+        ).values(
+            "id",
+            "text",
+            "datetime_created",
+            "datetime_updated",
+        )
+        content: Any
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_ndjson(
+                rows=rows.aiterator(chunk_size=chunk_size),
+                chunk_size=chunk_size
+            )
+        else:
+            content = iter_ndjson(
+                rows=rows.iterator(chunk_size=chunk_size),
+                chunk_size=chunk_size
+            )
+        response: StreamingHttpResponse = StreamingHttpResponse(
+            streaming_content=content,
+            content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = \
+            'attachment; filename="messages.ndjson"'
+        return response
+
     @action(
         methods=["POST"],
         url_path="login_user",
@@ -152,39 +280,26 @@ class CustomUserViewSet(ModelInstanceMixin, DRFResponseHandler, ViewSet):
         )
         valid: bool = serializer.is_valid()
         if valid:
-            prov_login: str = request.data.get("login", "")
-            prov_password: str = request.data.get("password", "")
+            prov_login: str = serializer.validated_data["login"]
+            prov_password: str = serializer.validated_data["password"]
 
-            user: Optional[CustomUser] = self.queryset.get_user_by_login(
+            user: Optional[CustomUser] = self.queryset.get_login_user(
                 login=prov_login
             )
-
-            if not user:
-                return DRF_Response(
-                    data={
-                        "detail": "Пользователь с "
-                        f"логином '{prov_login}' не найден"
-                    },
-                    status=HTTP_404_NOT_FOUND
-                )
-
-            same_passwords: bool = user.check_password(
+            # Unknown, deleted and inactive users get the same answer
+            # as a wrong password.
+            if not user or not user.check_password(
                 raw_password=prov_password
-            )
-            if not same_passwords:
+            ):
                 return DRF_Response(
-                    data={"response": "Вы ввели неправильный пароль"},
+                    data={"detail": "Неверный логин или пароль"},
                     status=HTTP_403_FORBIDDEN
                 )
-            if user.datetime_deleted:
-                return DRF_Response(
-                    data={"response": "Извините, но ваше пользователь удалён"},
-                    status=HTTP_403_FORBIDDEN
+            if not settings.JWT_STATELESS_LOGIN:
+                login(
+                    request=request,
+                    user=user
                 )
-            login(
-                request=request,
-                user=user
-            )
             refresh_token: RefreshToken = RefreshToken.for_user(user=user)
             det_ser: CustomUserListSerializer = CustomUserListSerializer(
                 instance=user,
@@ -3,14 +3,66 @@ from django.contrib.admin import (
     ModelAdmin,
     register,
 )
+from django.db.models import QuerySet
+from django.http.request import HttpRequest
 
 # Project
-from chats.models import Message
+from abstracts.admin import (
+    AbstractAdminIsDeleted,
+    AbstractAdminPerformance,
+)
+from abstracts.filters import (
+    CreatedPeriodFilter,
+    DeletedStateFilter,
+)
+from chats.models import (
+    Message,
+    TelegramDelivery,
+)
 
 
 @register(Message)
-class MessageAdmin(ModelAdmin):
+class MessageAdmin(
+    AbstractAdminPerformance,
+    AbstractAdminIsDeleted,
+    ModelAdmin
+):
     list_display: tuple[str] = (
         "id",
         "owner",
     )
+    list_filter: tuple[type] = (
+        DeletedStateFilter,
+        CreatedPeriodFilter,
+    )
+    list_select_related: tuple[str] = ("owner",)
+    search_fields: tuple[str] = ("text",)
+
+    def get_search_results(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        search_term: str
+    ) -> tuple[QuerySet, bool]:
+        """Search messages by the full-text index instead of icontains."""
+        if not search_term.strip():
+            return queryset, False
+        return queryset.search(text=search_term), False
+
+
+@register(TelegramDelivery)
+class TelegramDeliveryAdmin(AbstractAdminPerformance, ModelAdmin):
+    list_display: tuple[str] = (
+        "id",
+        "message",
+        "status",
+        "attempts",
+        "datetime_available",
+    )
+    list_filter: tuple[str] = ("status",)
+    list_select_related: tuple[str] = ("message",)
+    readonly_fields: tuple[str] = (
+        "datetime_created",
+        "datetime_updated",
+        "last_error",
+    )
@@ -0,0 +1,63 @@
+# Python
+from typing import Any
+import json
+
+# Django
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+)
+
+# Rest Framework
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import IsAuthenticated
+
+# Project
+from abstracts.decorators import (
+    async_api_view,
+    get_json_response,
+)
+from chats.models import Message
+from chats.serializers import (
+    MessageCreateSerializer,
+    MessageDetailSerializer,
+)
+from auths.permission import (
+    IsConnectedTelegram,
+    IsNonDeletedUser,
+)
+
+
+@async_api_view(
+    methods=("POST",),
+    permission_classes=(
+        IsAuthenticated,
+        IsNonDeletedUser,
+        IsConnectedTelegram,
+    )
+)
+async def upload_message(
+    request: HttpRequest,
+    *args: tuple[Any],
+    **kwargs: dict[Any, Any]
+) -> HttpResponse:
+    """Handle POST-request to upload message asynchronously."""
+    try:
+        data: Any = json.loads(request.body or b"{}")
+    except ValueError as exc:
+        raise ParseError(detail=f"JSON parse error - {exc}")
+    serializer: MessageCreateSerializer = MessageCreateSerializer(
+        data=data,
+        context={"request": request}
+    )
+    valid: bool = serializer.is_valid()
+    if valid:
+        new_message: Message = await Message.objects.acreate(
+            **serializer.validated_data
+        )
+        return get_json_response(
+            data={
+                "data": MessageDetailSerializer(new_message).data
+            }
+        )
+    return get_json_response(data=serializer.errors, status=400)
@@ -0,0 +1,73 @@
+# Python
+from typing import (
+    Any,
+    Optional,
+)
+from urllib.parse import parse_qs
+
+# Third party
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from rest_framework_simplejwt.exceptions import (
+    InvalidToken,
+    TokenError,
+)
+
+# Rest Framework
+from rest_framework.exceptions import AuthenticationFailed
+
+# Project
+from auths.authentication import CachedJWTAuthentication
+from auths.models import CustomUser
+from chats.models import Message
+
+
+class MessageConsumer(AsyncJsonWebsocketConsumer):
+    """Push user's new messages through the websocket.
+
+    Connect with the same JWT as the API: ws/v1/chats/messages?token=...
+    """
+
+    UNAUTHORIZED_CODE = 4401
+
+    group_name: Optional[str] = None
+
+    async def authenticate(self) -> Optional[CustomUser]:
+        """Get user of the token provided in the query string."""
+        query: dict[str, list[str]] = parse_qs(
+            self.scope.get("query_string", b"").decode()
+        )
+        tokens: list[str] = query.get("token", [])
+        if not tokens:
+            return None
+        authentication: CachedJWTAuthentication = CachedJWTAuthentication()
+        try:
+            return await authentication.aget_user(
+                authentication.get_validated_token(tokens[0].encode())
+            )
+        except (InvalidToken, TokenError, AuthenticationFailed):
+            return None
+
+    async def connect(self) -> None:
+        user: Optional[CustomUser] = await self.authenticate()
+        if not user or user.datetime_deleted:
+            await self.close(code=self.UNAUTHORIZED_CODE)
+            return
+        self.group_name = Message.get_group_name(owner_id=user.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code: int) -> None:
+        if self.group_name:
+            await self.channel_layer.group_discard(
+                self.group_name,
+                self.channel_name
+            )
+
+    async def messages_created(self, event: dict[str, Any]) -> None:
+        """Send created messages to the client."""
+        await self.send_json(
+            {
+                "event": "messages_created",
+                "data": event["data"],
+            }
+        )
@@ -0,0 +1,236 @@
+# Python
+from typing import (
+    Any,
+    Optional,
+)
+from asyncio import (
+    Semaphore,
+    sleep,
+)
+from collections import deque
+from concurrent.futures import Future
+from time import monotonic
+
+# Third party
+from telegram.error import RetryAfter
+from django.conf import settings
+
+# Project
+from chats.utils import (
+    bot_registry,
+    asend_telegram_bot_message,
+)
+
+
+class TokenBucket:
+    """Token bucket which refills with the constant rate."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.tokens: float = capacity
+        self.updated: float = monotonic()
+        self.blocked_until: float = 0.0
+
+    def refill(self, now: float) -> None:
+        """Add tokens accumulated since the last update."""
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def get_delay(self, now: float) -> float:
+        """Get seconds until the token is available."""
+        self.refill(now=now)
+        delay: float = max(0.0, self.blocked_until - now)
+        if self.tokens < 1:
+            delay = max(delay, (1 - self.tokens) / self.rate)
+        return delay
+
+    def consume(self) -> None:
+        """Take one token."""
+        self.tokens -= 1
+
+    def block(self, seconds: float) -> None:
+        """Do not give tokens during provided seconds."""
+        self.blocked_until = max(self.blocked_until, monotonic() + seconds)
+
+    def is_idle(self, now: float) -> bool:
+        """Check if bucket is full and can be recreated later."""
+        self.refill(now=now)
+        return self.tokens >= self.capacity and self.blocked_until <= now
+
+
+class TelegramDispatcher:
+    """Rate-limit-aware dispatcher of telegram messages.
+
+    Keeps global and per-chat token buckets and sends messages
+    concurrently in the bot registry's background loop.
+    """
+
+    MAX_IDLE_BUCKETS = 10000
+    THROUGHPUT_WINDOW_SECONDS = 60
+
+    def __init__(
+        self,
+        global_rate: float,
+        chat_rate: float,
+        chat_burst: float,
+        concurrency: int,
+        max_retries: int
+    ) -> None:
+        self.global_bucket: TokenBucket = TokenBucket(
+            rate=global_rate,
+            capacity=global_rate
+        )
+        self.chat_rate: float = chat_rate
+        self.chat_burst: float = chat_burst
+        self.chat_buckets: dict[int, TokenBucket] = {}
+        self.concurrency: int = concurrency
+        self.max_retries: int = max_retries
+        self._semaphore: Optional[Semaphore] = None
+        self.queued: int = 0
+        self.in_flight: int = 0
+        self.sent: int = 0
+        self.failed: int = 0
+        self.sent_times: deque[float] = deque()
+
+    def get_chat_bucket(self, chat_id: int) -> TokenBucket:
+        """Get token bucket of the chat."""
+        bucket: Optional[TokenBucket] = self.chat_buckets.get(chat_id)
+        if not bucket:
+            if len(self.chat_buckets) >= self.MAX_IDLE_BUCKETS:
+                self.prune_chat_buckets()
+            bucket = TokenBucket(rate=self.chat_rate, capacity=self.chat_burst)
+            self.chat_buckets[chat_id] = bucket
+        return bucket
+
+    def prune_chat_buckets(self) -> None:
+        """Drop buckets which are full and would be recreated the same."""
+        now: float = monotonic()
+        self.chat_buckets = {
+            chat_id: bucket
+            for chat_id, bucket in self.chat_buckets.items()
+            if not bucket.is_idle(now=now)
+        }
+
+    async def acquire(self, chat_id: int) -> None:
+        """Wait until both global and chat buckets give a token."""
+        chat_bucket: TokenBucket = self.get_chat_bucket(chat_id=chat_id)
+        while True:
+            now: float = monotonic()
+            delay: float = max(
+                self.global_bucket.get_delay(now=now),
+                chat_bucket.get_delay(now=now)
+            )
+            if delay <= 0:
+                self.global_bucket.consume()
+                chat_bucket.consume()
+                return
+            await sleep(delay)
+
+    async def asend(
+        self,
+        msg_content: str,
+        chat_id: int,
+        user_first_name: str
+    ) -> None:
+        """Send message respecting rate limits and retry_after."""
+        if not self._semaphore:
+            self._semaphore = Semaphore(self.concurrency)
+
+        self.queued += 1
+        try:
+            await self._send_with_retries(
+                msg_content=msg_content,
+                chat_id=chat_id,
+                user_first_name=user_first_name
+            )
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self.queued -= 1
+        self.sent += 1
+        self.sent_times.append(monotonic())
+
+    async def _send_with_retries(
+        self,
+        msg_content: str,
+        chat_id: int,
+        user_first_name: str
+    ) -> None:
+        """Send message, retry it after the flood limit is over.
+
+        Tokens are awaited before the semaphore is taken and it is
+        released before waiting for retry_after, so slots are held only
+        by sending messages and a limited chat doesn't block others.
+        """
+        retries: int = 0
+        while True:
+            await self.acquire(chat_id=chat_id)
+            async with self._semaphore:
+                self.queued -= 1
+                self.in_flight += 1
+                try:
+                    return await asend_telegram_bot_message(
+                        msg_content=msg_content,
+                        chat_id=chat_id,
+                        user_first_name=user_first_name
+                    )
+                except RetryAfter as exc:
+                    # Flood limit is applied to the whole bot.
+                    self.global_bucket.block(seconds=exc.retry_after)
+                    self.get_chat_bucket(chat_id=chat_id).block(
+                        seconds=exc.retry_after
+                    )
+                    retries += 1
+                    if retries > self.max_retries:
+                        raise
+                finally:
+                    self.in_flight -= 1
+                    self.queued += 1
+
+    def submit(
+        self,
+        msg_content: str,
+        chat_id: int,
+        user_first_name: str
+    ) -> Future:
+        """Hand message to the dispatcher from synchronous code."""
+        return bot_registry.submit(
+            self.asend(
+                msg_content=msg_content,
+                chat_id=chat_id,
+                user_first_name=user_first_name
+            )
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get queue depth and throughput of the last minute."""
+        window_start: float = monotonic() - self.THROUGHPUT_WINDOW_SECONDS
+        while self.sent_times and self.sent_times[0] < window_start:
+            self.sent_times.popleft()
+        throughput: float = 0.0
+        if self.sent_times:
+            throughput = len(self.sent_times) / max(
+                monotonic() - self.sent_times[0],
+                1.0
+            )
+        return {
+            "queue_depth": self.queued,
+            "in_flight": self.in_flight,
+            "sent": self.sent,
+            "failed": self.failed,
+            "throughput": round(throughput, 2),
+        }
+
+
+telegram_dispatcher: TelegramDispatcher = TelegramDispatcher(
+    global_rate=settings.TELEGRAM_BOT_CONF["GLOBAL_RATE"],
+    chat_rate=settings.TELEGRAM_BOT_CONF["CHAT_RATE"],
+    chat_burst=settings.TELEGRAM_BOT_CONF["CHAT_BURST"],
+    concurrency=settings.TELEGRAM_BOT_CONF["CONCURRENCY"],
+    max_retries=settings.TELEGRAM_BOT_CONF["MAX_RETRIES"]
+)
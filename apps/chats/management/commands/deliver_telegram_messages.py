@@ -0,0 +1,133 @@
+# Python
+from typing import (
+    Any,
+    Optional,
+)
+from concurrent.futures import Future
+from datetime import timedelta
+from time import sleep
+
+# Third party
+from telegram.error import RetryAfter
+
+# Django
+from django.conf import settings
+from django.db import DatabaseError
+from django.core.management.base import (
+    BaseCommand,
+    CommandParser,
+)
+
+# Project
+from chats.models import TelegramDelivery
+from chats.dispatcher import telegram_dispatcher
+from chats.utils import bot_registry
+
+
+class Command(BaseCommand):
+    """Drain telegram delivery outbox."""
+
+    help: str = "Send pending messages from the telegram outbox."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TELEGRAM_DELIVERY_CONF["BATCH_SIZE"]
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.TELEGRAM_DELIVERY_CONF["POLL_INTERVAL_SECONDS"]
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox once and exit."
+        )
+
+    def submit(self, delivery: TelegramDelivery) -> Optional[Future]:
+        """Hand delivery to the dispatcher, errors go to its future."""
+        try:
+            return delivery.message.send_telegram_message()
+        except Exception as exc:
+            failed: Future = Future()
+            failed.set_exception(exc)
+            return failed
+
+    def deliver(
+        self,
+        delivery: TelegramDelivery,
+        sending: Optional[Future]
+    ) -> bool:
+        """Wait for single delivery and store its result.
+
+        Any error of the delivery is stored as a failed attempt, so the
+        rest of the batch isn't left until the lease is over.
+        """
+        if not sending:
+            delivery.mark_failed(
+                error="Телеграм пользователя не подключён",
+                max_attempts=0
+            )
+            return False
+        try:
+            sending.result()
+        except RetryAfter as exc:
+            delivery.postpone(seconds=exc.retry_after)
+            return False
+        except Exception as exc:
+            delivery.mark_failed(
+                error=str(exc) or repr(exc),
+                max_attempts=settings.TELEGRAM_DELIVERY_CONF["MAX_ATTEMPTS"]
+            )
+            return False
+        delivery.mark_sent()
+        return True
+
+    def drain(self, batch_size: int) -> int:
+        """Deliver one batch of pending messages."""
+        claimed_ids: list[int] = TelegramDelivery.objects.claim_pending(
+            batch_size=batch_size,
+            lease=timedelta(
+                seconds=settings.TELEGRAM_DELIVERY_CONF["LEASE_SECONDS"]
+            )
+        )
+        deliveries = TelegramDelivery.objects.filter(
+            id__in=claimed_ids
+        ).select_related("message__owner")
+        sendings: list[tuple[TelegramDelivery, Optional[Future]]] = [
+            (delivery, self.submit(delivery=delivery))
+            for delivery in deliveries
+        ]
+        sent: int = 0
+        delivery: TelegramDelivery
+        sending: Optional[Future]
+        for delivery, sending in sendings:
+            try:
+                sent += self.deliver(delivery=delivery, sending=sending)
+            except DatabaseError as exc:
+                # The delivery is sent again after its lease is over.
+                self.stderr.write(
+                    f"Не удалось сохранить отправку {delivery.pk}: {exc}"
+                )
+        if claimed_ids:
+            stats: dict[str, Any] = telegram_dispatcher.get_stats()
+            self.stdout.write(
+                f"Отправлено {sent} из {len(claimed_ids)} сообщений, "
+                f"очередь: {stats['queue_depth']}, "
+                f"скорость: {stats['throughput']} сообщений/сек"
+            )
+        return len(claimed_ids)
+
+    def handle(self, *args: tuple[Any], **options: dict[str, Any]) -> None:
+        batch_size: int = options["batch_size"]
+        try:
+            while True:
+                claimed: int = self.drain(batch_size=batch_size)
+                if options["once"] and claimed < batch_size:
+                    return
+                if claimed < batch_size:
+                    sleep(options["poll_interval"])
+        finally:
+            bot_registry.close()
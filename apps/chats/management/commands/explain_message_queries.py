@@ -0,0 +1,113 @@
+# Python
+from typing import (
+    Any,
+    Optional,
+)
+
+# Django
+from django.db import connection
+from django.db.models import (
+    Count,
+    QuerySet,
+)
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+# Project
+from abstracts.paginators import KeysetCursorPagination
+from auths.models import CustomUser
+from chats.models import Message
+
+
+class Command(BaseCommand):
+    """Show query plans of the hot message queries."""
+
+    help: str = "Run EXPLAIN on the hot queries of the messages API."
+
+    INDEX_NAME = "chats_message_owner_live_idx"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--owner",
+            type=int,
+            help="User id, the user with most messages by default."
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=KeysetCursorPagination.page_size
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Execute queries with EXPLAIN ANALYZE on PostgreSQL."
+        )
+
+    def get_owner_id(self, owner_id: Optional[int]) -> int:
+        """Get provided owner or the one with most messages."""
+        if owner_id:
+            return owner_id
+        owner: Optional[dict[str, Any]] = Message.objects.values(
+            "owner"
+        ).annotate(
+            messages_count=Count("id")
+        ).order_by("-messages_count").first()
+        if not owner:
+            raise CommandError("Сообщений не найдено")
+        return owner["owner"]
+
+    def get_queries(
+        self,
+        owner_id: int,
+        page_size: int
+    ) -> dict[str, QuerySet]:
+        """Get the queries made by the messages endpoints."""
+        paginator: KeysetCursorPagination = KeysetCursorPagination()
+        messages: QuerySet = Message.objects.get_not_deleted().filter(
+            owner_id=owner_id
+        ).order_by(*paginator.ordering)
+        queries: dict[str, QuerySet] = {
+            "first_page": messages[:page_size + 1],
+        }
+        middle: Optional[Message] = messages[
+            messages.count() // 2:
+        ].first()
+        if middle:
+            queries["deep_page"] = messages.filter(
+                paginator.get_position_filter(
+                    position=paginator.get_position(row=middle)
+                )
+            )[:page_size + 1]
+        return queries
+
+    def handle(self, *args: tuple[Any], **options: dict[str, Any]) -> None:
+        owner_id: int = self.get_owner_id(owner_id=options["owner"])
+        if not CustomUser.objects.filter(id=owner_id).exists():
+            raise CommandError(f"Пользователь {owner_id} не найден")
+
+        explain_options: dict[str, Any] = {}
+        if options["analyze"] and connection.vendor == "postgresql":
+            explain_options = {"analyze": True, "buffers": True}
+
+        name: str
+        queryset: QuerySet
+        for name, queryset in self.get_queries(
+            owner_id=owner_id,
+            page_size=options["page_size"]
+        ).items():
+            plan: str = queryset.explain(**explain_options)
+            uses_index: bool = self.INDEX_NAME in plan
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(plan)
+            if uses_index:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Использует {self.INDEX_NAME}")
+                )
+            else:
+                self.stdout.write(
+                    self.style.WARNING(f"Не использует {self.INDEX_NAME}")
+                )
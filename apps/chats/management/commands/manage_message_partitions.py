@@ -0,0 +1,136 @@
+# Python
+from typing import Any
+import os
+
+# Django
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.utils import timezone
+
+# Project
+from abstracts.utils import iter_ndjson
+from chats.partitions import (
+    MessagePartitions,
+    Partition,
+)
+
+
+class Command(BaseCommand):
+    """Maintain monthly partitions of the messages table."""
+
+    help: str = "Create upcoming message partitions and detach, " \
+        "archive or drop expired ones (PostgreSQL only)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        conf: dict[str, Any] = settings.MESSAGE_PARTITIONS_CONF
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=conf["AHEAD_MONTHS"],
+            help="Number of next months to create partitions for."
+        )
+        parser.add_argument(
+            "--retain",
+            type=int,
+            default=conf["RETAIN_MONTHS"],
+            help="Detach partitions older than this number of months, "
+            "0 keeps all partitions."
+        )
+        parser.add_argument(
+            "--archive-dir",
+            default=conf["ARCHIVE_DIR"],
+            help="Write rows of detached partitions to NDJSON files."
+        )
+        parser.add_argument(
+            "--archive-tablespace",
+            default=conf["ARCHIVE_TABLESPACE"],
+            help="Move detached partitions to this tablespace."
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop detached partitions."
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only show partitions which would be detached."
+        )
+
+    def archive(
+        self,
+        partitions: MessagePartitions,
+        name: str,
+        archive_dir: str
+    ) -> str:
+        """Write rows of the detached partition to NDJSON file."""
+        os.makedirs(archive_dir, exist_ok=True)
+        path: str = os.path.join(archive_dir, f"{name}.ndjson")
+        chunk_size: int = settings.MESSAGES_EXPORT_CHUNK_SIZE
+        with open(path, "w", encoding="utf-8") as archive:
+            chunk: str
+            for chunk in iter_ndjson(
+                rows=partitions.iter_rows(name=name, chunk_size=chunk_size),
+                chunk_size=chunk_size
+            ):
+                archive.write(chunk)
+        return path
+
+    def handle(self, *args: tuple[Any], **options: dict[str, Any]) -> None:
+        partitions: MessagePartitions = MessagePartitions()
+        if not partitions.is_partitioned:
+            raise CommandError(
+                "Секционирование сообщений поддерживается только "
+                "в PostgreSQL после применения миграций chats"
+            )
+        if options["drop"] and not options["archive_dir"]:
+            raise CommandError(
+                "Удаление секций без архива требует --archive-dir"
+            )
+
+        now: Any = timezone.now()
+        if not options["dry_run"]:
+            name: str
+            for name in partitions.create_ahead(
+                now=now,
+                months=options["ahead"]
+            ):
+                self.stdout.write(f"Создана секция {name}")
+
+        if not options["retain"]:
+            return
+        partition: Partition
+        for partition in partitions.get_expired(
+            now=now,
+            retain_months=options["retain"]
+        ):
+            if options["dry_run"]:
+                self.stdout.write(f"Будет отсоединена секция {partition.name}")
+                continue
+            partitions.detach_partition(partition=partition)
+            self.stdout.write(f"Отсоединена секция {partition.name}")
+            if options["archive_dir"]:
+                path: str = self.archive(
+                    partitions=partitions,
+                    name=partition.name,
+                    archive_dir=options["archive_dir"]
+                )
+                self.stdout.write(
+                    f"Секция {partition.name} сохранена в {path}"
+                )
+            if options["drop"]:
+                partitions.drop_partition(name=partition.name)
+                self.stdout.write(f"Удалена секция {partition.name}")
+            elif options["archive_tablespace"]:
+                partitions.set_tablespace(
+                    name=partition.name,
+                    tablespace=options["archive_tablespace"]
+                )
+                self.stdout.write(
+                    f"Секция {partition.name} перенесена в "
+                    f"{options['archive_tablespace']}"
+                )
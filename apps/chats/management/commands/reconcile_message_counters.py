@@ -0,0 +1,80 @@
+# Python
+from typing import Any
+
+# Django
+from django.core.management.base import (
+    BaseCommand,
+    CommandParser,
+)
+
+# Project
+from auths.models import CustomUser
+from chats.models import (
+    Message,
+    MessageQuerySet,
+)
+
+
+class Command(BaseCommand):
+    """Recompute denormalized message counters of users."""
+
+    help: str = "Compare messages_count and last_message_at of users " \
+        "with their messages, report and fix the drift."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=MessageQuerySet.CHUNK_SIZE
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report users with the drift."
+        )
+
+    def handle(self, *args: tuple[Any], **options: dict[str, Any]) -> None:
+        checked: int = 0
+        drifted: int = 0
+        count_drift: int = 0
+        last_pk: int = 0
+        while True:
+            users: list[tuple[int, int, Any]] = list(
+                CustomUser.objects.filter(pk__gt=last_pk).order_by(
+                    "pk"
+                ).values_list(
+                    "pk",
+                    "messages_count",
+                    "last_message_at"
+                )[:options["batch_size"]]
+            )
+            if not users:
+                break
+            last_pk = users[-1][0]
+            counters: dict[int, tuple[int, Any]] = \
+                Message.objects.get_owners_counters(
+                    owner_ids=[user[0] for user in users]
+                )
+            drifted_ids: list[int] = []
+            user_id: int
+            for user_id, *stored in users:
+                actual: tuple[int, Any] = counters.get(user_id, (0, None))
+                if tuple(stored) == actual:
+                    continue
+                drifted_ids.append(user_id)
+                count_drift += abs(stored[0] - actual[0])
+                self.stdout.write(
+                    f"Пользователь {user_id}: {stored[0]} сообщений, "
+                    f"последнее {stored[1]}, на самом деле {actual[0]}, "
+                    f"последнее {actual[1]}",
+                    style_func=self.style.WARNING
+                )
+            if drifted_ids and not options["dry_run"]:
+                Message.objects.update_owners_counters(owner_ids=drifted_ids)
+            checked += len(users)
+            drifted += len(drifted_ids)
+        self.stdout.write(
+            f"Проверено пользователей: {checked}, расхождений: {drifted}, "
+            f"расхождение количества сообщений: {count_drift}"
+            + ("" if options["dry_run"] or not drifted else ", исправлено")
+        )
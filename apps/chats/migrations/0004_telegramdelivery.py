@@ -0,0 +1,35 @@
+# Generated by Django 4.2.5 on 2026-10-18 14:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0003_remove_message_telegram_chat_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TelegramDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('datetime_created', models.DateTimeField(auto_now_add=True, verbose_name='время и дата создания')),
+                ('datetime_updated', models.DateTimeField(auto_now=True, verbose_name='время и дата обновления')),
+                ('datetime_deleted', models.DateTimeField(blank=True, null=True, verbose_name='время и дата удаления')),
+                ('status', models.PositiveSmallIntegerField(choices=[(0, 'Ожидает отправки'), (1, 'Отправлено'), (2, 'Ошибка отправки')], default=0, verbose_name='Статус отправки')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Количество попыток')),
+                ('datetime_available', models.DateTimeField(default=django.utils.timezone.now, verbose_name='время и дата следующей попытки')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='Последняя ошибка')),
+                ('message', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='chats.message', verbose_name='Сообщение')),
+            ],
+            options={
+                'verbose_name': 'Отправка в телеграм',
+                'verbose_name_plural': 'Отправки в телеграм',
+                'ordering': ('datetime_available', 'id'),
+                'indexes': [models.Index(condition=models.Q(('status', 0)), fields=['datetime_available'], name='chats_delivery_pending_idx')],
+            },
+        ),
+    ]
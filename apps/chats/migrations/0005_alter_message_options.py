@@ -0,0 +1,17 @@
+# Generated by Django 4.2.5 on 2026-10-18 14:07
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0004_telegramdelivery'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='message',
+            options={'ordering': ('-datetime_updated', '-id'), 'verbose_name': 'Сообщение', 'verbose_name_plural': 'Сообщения'},
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.5 on 2026-10-18 14:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0005_alter_message_options'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(condition=models.Q(('datetime_deleted__isnull', True)), fields=['owner', '-datetime_updated', '-id'], name='chats_message_owner_live_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.5 on 2026-10-18 14:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0006_message_owner_live_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['owner', 'datetime_updated', 'id'], name='chats_message_owner_sync_idx'),
+        ),
+    ]
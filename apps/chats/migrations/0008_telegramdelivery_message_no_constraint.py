@@ -0,0 +1,19 @@
+# Generated by Django 4.2.5 on 2026-10-18 14:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0007_message_owner_sync_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='telegramdelivery',
+            name='message',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='chats.message', verbose_name='Сообщение'),
+        ),
+    ]
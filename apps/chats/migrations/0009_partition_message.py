@@ -0,0 +1,134 @@
+from datetime import datetime
+
+from django.db import migrations
+from django.db.migrations.exceptions import IrreversibleError
+from django.utils import timezone
+
+TABLE = "chats_message"
+LEGACY_TABLE = "chats_message_legacy"
+DEFAULT_TABLE = "chats_message_default"
+SEQUENCE = "chats_message_id_seq"
+AHEAD_MONTHS = 3
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    month: int = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1)
+
+
+def partition_message(apps, schema_editor) -> None:
+    """Turn chats_message into a table partitioned by datetime_created.
+
+    Existing table is attached as the partition of all rows created
+    before the next month, so rows aren't copied. Primary key becomes
+    (id, datetime_created) and ids come from an explicit sequence.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        constraints: dict = connection.introspection.get_constraints(
+            cursor,
+            TABLE
+        )
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = %s",
+            (TABLE,)
+        )
+        indexes: list[tuple[str, str]] = cursor.fetchall()
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {TABLE}")
+        max_id: int = cursor.fetchone()[0]
+
+        schema_editor.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}")
+        for name, _ in indexes:
+            schema_editor.execute(
+                f'ALTER INDEX "{name}" RENAME TO "{name[:56]}_legacy"'
+            )
+        for name, constraint in constraints.items():
+            if constraint["foreign_key"]:
+                schema_editor.execute(
+                    f'ALTER TABLE {LEGACY_TABLE} DROP CONSTRAINT "{name}"'
+                )
+        schema_editor.execute(
+            f"ALTER TABLE {LEGACY_TABLE} "
+            "ALTER COLUMN id DROP IDENTITY IF EXISTS"
+        )
+        schema_editor.execute(
+            f"ALTER TABLE {LEGACY_TABLE} ALTER COLUMN id DROP DEFAULT"
+        )
+
+        schema_editor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {LEGACY_TABLE} INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (datetime_created)"
+        )
+        schema_editor.execute(
+            f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey "
+            "PRIMARY KEY (id, datetime_created)"
+        )
+        schema_editor.execute(f"CREATE SEQUENCE IF NOT EXISTS {SEQUENCE}")
+        schema_editor.execute(
+            f"ALTER TABLE {TABLE} "
+            f"ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')"
+        )
+        schema_editor.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+        cursor.execute(
+            "SELECT setval(%s, %s, false)",
+            (SEQUENCE, max_id + 1)
+        )
+        for name, definition in indexes:
+            if not constraints.get(name, {}).get("primary_key"):
+                schema_editor.execute(definition)
+        for name, constraint in constraints.items():
+            if constraint["foreign_key"]:
+                to_table, to_column = constraint["foreign_key"]
+                schema_editor.execute(
+                    f'ALTER TABLE {TABLE} ADD CONSTRAINT "{name}" '
+                    f'FOREIGN KEY ({constraint["columns"][0]}) '
+                    f"REFERENCES {to_table} ({to_column}) "
+                    "DEFERRABLE INITIALLY DEFERRED"
+                )
+
+        boundary: datetime = add_months(
+            timezone.now().replace(
+                day=1, hour=0, minute=0, second=0, microsecond=0
+            ),
+            1
+        )
+        schema_editor.execute(
+            f"ALTER TABLE {TABLE} ATTACH PARTITION {LEGACY_TABLE} "
+            "FOR VALUES FROM (MINVALUE) TO (%s)",
+            (boundary,)
+        )
+        for month in range(AHEAD_MONTHS):
+            start: datetime = add_months(boundary, month)
+            schema_editor.execute(
+                f"CREATE TABLE {TABLE}_p{start:%Y%m} PARTITION OF {TABLE} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                (start, add_months(start, 1))
+            )
+        schema_editor.execute(
+            f"CREATE TABLE {DEFAULT_TABLE} PARTITION OF {TABLE} DEFAULT"
+        )
+
+
+def unpartition_message(apps, schema_editor) -> None:
+    if schema_editor.connection.vendor == "postgresql":
+        raise IrreversibleError(
+            "Partitioned chats_message can't be merged back automatically"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0008_telegramdelivery_message_no_constraint'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            code=partition_message,
+            reverse_code=unpartition_message
+        ),
+    ]
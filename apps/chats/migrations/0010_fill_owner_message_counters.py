@@ -0,0 +1,42 @@
+from django.db import migrations
+from django.db.models import (
+    Count,
+    Max,
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor) -> None:
+    """Count not deleted messages of existing users."""
+    CustomUser = apps.get_model("auths", "CustomUser")
+    Message = apps.get_model("chats", "Message")
+    messages = Message.objects.using(schema_editor.connection.alias).filter(
+        owner=OuterRef("pk"),
+        datetime_deleted__isnull=True
+    ).order_by().values("owner")
+    CustomUser.objects.using(schema_editor.connection.alias).update(
+        messages_count=Coalesce(
+            Subquery(messages.annotate(count=Count("id")).values("count")),
+            0
+        ),
+        last_message_at=Subquery(
+            messages.annotate(last=Max("datetime_created")).values("last")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auths', '0003_customuser_message_counters'),
+        ('chats', '0009_partition_message'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            code=fill_counters,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
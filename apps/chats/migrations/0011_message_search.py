@@ -0,0 +1,82 @@
+from django.db import migrations
+
+TABLE = "chats_message"
+SEARCH_CONFIG = "russian"
+FTS_TABLE = "chats_message_fts"
+
+
+def create_search_index(apps, schema_editor) -> None:
+    """Index text of messages for full-text search.
+
+    PostgreSQL gets a generated tsvector column with a GIN index,
+    adding it rewrites the table. SQLite gets an external content FTS5
+    table kept in sync by triggers, migrations which remake
+    chats_message on SQLite drop them, so they must be created again.
+    """
+    vendor: str = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            f"ALTER TABLE {TABLE} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', text)) "
+            "STORED"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX {TABLE}_search_idx ON {TABLE} "
+            "USING GIN (search_vector)"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"text, content='{TABLE}', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON {TABLE} "
+            f"BEGIN INSERT INTO {FTS_TABLE} (rowid, text) "
+            "VALUES (new.id, new.text); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON {TABLE} "
+            f"BEGIN INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, text) "
+            "VALUES ('delete', old.id, old.text); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF text "
+            f"ON {TABLE} "
+            f"BEGIN INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, text) "
+            "VALUES ('delete', old.id, old.text); "
+            f"INSERT INTO {FTS_TABLE} (rowid, text) "
+            "VALUES (new.id, new.text); END"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def drop_search_index(apps, schema_editor) -> None:
+    vendor: str = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {TABLE}_search_idx")
+        schema_editor.execute(
+            f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector"
+        )
+    elif vendor == "sqlite":
+        for trigger in ("insert", "delete", "update"):
+            schema_editor.execute(
+                f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{trigger}"
+            )
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0010_fill_owner_message_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            code=create_search_index,
+            reverse_code=drop_search_index
+        ),
+    ]
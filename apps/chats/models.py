@@ -1,14 +1,237 @@
+# Python
+from typing import (
+    Any,
+    Optional,
+)
+from datetime import timedelta
+from concurrent.futures import Future
+
 # Django
+from django.db import connections
 from django.db.models import (
     TextField,
     ForeignKey,
     CASCADE,
+    DateTimeField,
+    PositiveSmallIntegerField,
+    QuerySet,
+    Index,
+    Q,
+    F,
+    Value,
+    Count,
+    Max,
+    Case,
+    When,
+    OuterRef,
+    Subquery,
 )
+from django.db.models.functions import (
+    Coalesce,
+    Greatest,
+)
+from django.db.transaction import atomic
+from django.utils import timezone
 
 # Project
-from abstracts.models import AbstractDateTime
+from abstracts.models import (
+    AbstractDateTime,
+    AbstractDateTimeQuerySet,
+)
+from abstracts.signals import (
+    post_bulk_create,
+    post_soft_delete,
+)
 from auths.models import CustomUser
-from chats.utils import send_telegram_bot_message
+from chats.dispatcher import telegram_dispatcher
+from chats.search import (
+    get_search_expressions,
+    get_search_ordering,
+)
+
+
+class MessageQuerySet(AbstractDateTimeQuerySet):
+    """MessageQuerySet."""
+
+    def bulk_upload(
+        self,
+        messages: list['Message'],
+        batch_size: Optional[int] = None
+    ) -> list['Message']:
+        """Create messages and their telegram deliveries in one batch.
+
+        bulk_create doesn't send post_save, so the outbox entries
+        are created here together with the messages.
+        """
+        with atomic(using=self.db):
+            created: list[Message] = self.bulk_create(
+                messages,
+                batch_size=batch_size
+            )
+            TelegramDelivery.objects.using(self.db).bulk_create(
+                [
+                    TelegramDelivery(message=message)
+                    for message in created
+                    if message.owner.telegram_id
+                ],
+                batch_size=batch_size
+            )
+            post_bulk_create.send(
+                sender=self.model,
+                instances=created,
+                using=self.db
+            )
+        return created
+
+    def search(self, text: str) -> QuerySet:
+        """Get messages matching all words of the text with search_rank.
+
+        PostgreSQL uses the GIN indexed search_vector column and SQLite
+        the FTS5 table, both are created by chats migrations.
+        """
+        rank: Any
+        condition: Any
+        rank, condition = get_search_expressions(
+            vendor=connections[self.db].vendor,
+            text=text
+        )
+        return self.filter(condition).annotate(search_rank=rank)
+
+    def get_search_ordering(self) -> tuple[str]:
+        """Get ordering of search results usable by keyset cursors."""
+        return get_search_ordering(vendor=connections[self.db].vendor)
+
+    def count_owners_messages(
+        self,
+        pks: list[Any]
+    ) -> dict[int, tuple[int, Any]]:
+        """Count messages of the keys and the last of them per owner."""
+        owners: dict[int, tuple[int, Any]] = {}
+        index: int
+        for index in range(0, len(pks), self.CHUNK_SIZE):
+            row: dict[str, Any]
+            for row in self.filter(
+                pk__in=pks[index:index + self.CHUNK_SIZE]
+            ).order_by().values("owner").annotate(
+                count=Count("id"),
+                last=Max("datetime_created")
+            ):
+                count, last = owners.get(row["owner"], (0, row["last"]))
+                owners[row["owner"]] = (
+                    count + row["count"],
+                    max(last, row["last"])
+                )
+        return owners
+
+    def increment_owners_counters(self, messages: list['Message']) -> None:
+        """Add created messages to counters of their owners."""
+        owners: dict[int, tuple[int, Any]] = {}
+        message: Message
+        for message in messages:
+            count, last = owners.get(
+                message.owner_id,
+                (0, message.datetime_created)
+            )
+            owners[message.owner_id] = (
+                count + 1,
+                max(last, message.datetime_created)
+            )
+        self.shift_owners_counters(owners=owners)
+
+    def shift_owners_counters(
+        self,
+        owners: dict[int, tuple[int, Any]]
+    ) -> None:
+        """Add numbers of messages to counters of their owners.
+
+        owners maps an owner to the number of created or recovered
+        messages, negative for soft deleted ones, and the last of them.
+        Owners of a chunk are updated with one UPDATE of F() expressions,
+        so concurrent changes don't overwrite each other. Deleted
+        messages make last_message_at recomputed only if they are at
+        or after it, drift is fixed by reconcile_message_counters.
+        """
+        live_last: QuerySet = Message.objects.using(
+            self.db
+        ).get_not_deleted().filter(
+            owner=OuterRef("pk")
+        ).order_by().values("owner").annotate(
+            last=Max("datetime_created")
+        ).values("last")
+        owner_ids: list[int] = sorted(owners)
+        index: int
+        for index in range(0, len(owner_ids), self.CHUNK_SIZE):
+            counts: list[When] = []
+            lasts: list[When] = []
+            owner_id: int
+            for owner_id in owner_ids[index:index + self.CHUNK_SIZE]:
+                count, last = owners[owner_id]
+                counts.append(When(pk=owner_id, then=Value(count)))
+                lasts.append(
+                    When(
+                        pk=owner_id,
+                        then=Greatest(
+                            Coalesce(F("last_message_at"), Value(last)),
+                            Value(last)
+                        ) if count >= 0 else Case(
+                            When(
+                                last_message_at__lte=last,
+                                then=Subquery(live_last)
+                            ),
+                            default=F("last_message_at")
+                        )
+                    )
+                )
+            CustomUser.objects.using(self.db).filter(
+                pk__in=owner_ids[index:index + self.CHUNK_SIZE]
+            ).update(
+                messages_count=Greatest(
+                    F("messages_count") + Case(*counts, default=Value(0)),
+                    Value(0)
+                ),
+                last_message_at=Case(
+                    *lasts,
+                    default=F("last_message_at")
+                )
+            )
+
+    def update_owners_counters(self, owner_ids: list[int]) -> int:
+        """Recompute counters of the owners from not deleted messages.
+
+        Counts the whole history of the owners, so it is only used by
+        reconcile_message_counters and detaching of partitions.
+        """
+        messages: QuerySet = Message.objects.using(self.db).get_not_deleted(
+        ).filter(owner=OuterRef("pk")).order_by().values("owner")
+        updated: int = CustomUser.objects.using(self.db).filter(
+            pk__in=owner_ids
+        ).update(
+            messages_count=Coalesce(
+                Subquery(messages.annotate(count=Count("id")).values("count")),
+                0
+            ),
+            last_message_at=Subquery(
+                messages.annotate(
+                    last=Max("datetime_created")
+                ).values("last")
+            )
+        )
+        return updated
+
+    def get_owners_counters(
+        self,
+        owner_ids: list[int]
+    ) -> dict[int, tuple[int, Any]]:
+        """Count not deleted messages of the owners with one query."""
+        return {
+            row["owner"]: (row["count"], row["last"])
+            for row in self.get_not_deleted().filter(
+                owner__in=owner_ids
+            ).order_by().values("owner").annotate(
+                count=Count("id"),
+                last=Max("datetime_created")
+            )
+        }
 
 
 class Message(AbstractDateTime):
@@ -23,23 +246,201 @@ class Message(AbstractDateTime):
         related_name="messages",
         verbose_name="Кто написал"
     )
+    objects = MessageQuerySet.as_manager()
 
     class Meta:
         """Customization of the Message model class."""
 
         verbose_name: str = "Сообщение"
         verbose_name_plural: str = "Сообщения"
-        ordering: tuple[str] = ("-datetime_updated",)
+        ordering: tuple[str] = ("-datetime_updated", "-id")
+        indexes: tuple[Index] = (
+            Index(
+                fields=("owner", "-datetime_updated", "-id"),
+                condition=Q(datetime_deleted__isnull=True),
+                name="chats_message_owner_live_idx",
+            ),
+            Index(
+                fields=("owner", "datetime_updated", "id"),
+                name="chats_message_owner_sync_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         """Override default classes' instance view."""
         return f"{self.text[:50]}..."
 
-    def send_telegram_message(self) -> None:
-        """Send message to the telegram chat."""
+    def save(self, *args: tuple[Any], **kwargs: dict[str, Any]) -> None:
+        """Save message and its post_save side effects atomically."""
+        with atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
+    def delete(self, *args: tuple[Any], **kwargs: dict[str, Any]) -> None:
+        """Soft delete message like the bulk soft_delete does."""
+        is_deleted: bool = self.datetime_deleted is not None
+        with atomic(using=self._state.db):
+            super().delete(*args, **kwargs)
+            if not is_deleted:
+                post_soft_delete.send(
+                    sender=self.__class__,
+                    pks=[self.pk],
+                    using=self._state.db
+                )
+
+    @staticmethod
+    def get_group_name(owner_id: int) -> str:
+        """Get channel layer group of the owner's messages."""
+        return f"user_messages_{owner_id}"
+
+    def enqueue_telegram_message(self) -> None:
+        """Put message into telegram delivery outbox."""
+        if self.owner.telegram_id:
+            TelegramDelivery.objects.create(message=self)
+
+    def send_telegram_message(self) -> Optional[Future]:
+        """Hand message to the telegram dispatcher."""
         if self.owner.telegram_id:
-            send_telegram_bot_message(
+            return telegram_dispatcher.submit(
                 msg_content=self.text,
                 chat_id=self.owner.telegram_id,
                 user_first_name=self.owner.first_name
             )
+        return None
+
+
+class TelegramDeliveryQuerySet(AbstractDateTimeQuerySet):
+    """TelegramDeliveryQuerySet."""
+
+    def get_pending(self) -> QuerySet:
+        """Get deliveries which are ready to be sent."""
+        return self.filter(
+            status=TelegramDelivery.STATUS_PENDING,
+            datetime_available__lte=timezone.now()
+        )
+
+    def claim_pending(
+        self,
+        batch_size: int,
+        lease: timedelta
+    ) -> list[int]:
+        """Lock pending deliveries for the worker during the lease time."""
+        with atomic(using=self.db):
+            claimed_ids: list[int] = list(
+                self.get_pending().order_by(
+                    "datetime_available", "id"
+                ).select_for_update(
+                    skip_locked=True
+                ).values_list("id", flat=True)[:batch_size]
+            )
+            if claimed_ids:
+                self.filter(id__in=claimed_ids).update(
+                    datetime_available=timezone.now() + lease
+                )
+        return claimed_ids
+
+
+class TelegramDelivery(AbstractDateTime):
+    """Outbox entry of the message which must be sent to telegram."""
+
+    STATUS_PENDING = 0
+    STATUS_SENT = 1
+    STATUS_FAILED = 2
+    STATUSES = (
+        (STATUS_PENDING, "Ожидает отправки"),
+        (STATUS_SENT, "Отправлено"),
+        (STATUS_FAILED, "Ошибка отправки"),
+    )
+    RETRY_DELAY_SECONDS = 5
+    RETRY_MAX_DELAY_SECONDS = 600
+
+    # Partitioned chats_message has no unique index on id alone,
+    # so the database can't reference it.
+    message: Message = ForeignKey(
+        to=Message,
+        on_delete=CASCADE,
+        related_name="deliveries",
+        db_constraint=False,
+        verbose_name="Сообщение"
+    )
+    status: PositiveSmallIntegerField = PositiveSmallIntegerField(
+        choices=STATUSES,
+        default=STATUS_PENDING,
+        verbose_name="Статус отправки"
+    )
+    attempts: PositiveSmallIntegerField = PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Количество попыток"
+    )
+    datetime_available: DateTimeField = DateTimeField(
+        default=timezone.now,
+        verbose_name="время и дата следующей попытки"
+    )
+    last_error: TextField = TextField(
+        blank=True,
+        default="",
+        verbose_name="Последняя ошибка"
+    )
+    objects = TelegramDeliveryQuerySet.as_manager()
+
+    class Meta:
+        """Customization of the TelegramDelivery model class."""
+
+        verbose_name: str = "Отправка в телеграм"
+        verbose_name_plural: str = "Отправки в телеграм"
+        ordering: tuple[str] = ("datetime_available", "id")
+        indexes: tuple[Index] = (
+            Index(
+                fields=("datetime_available",),
+                condition=Q(status=0),
+                name="chats_delivery_pending_idx",
+            ),
+        )
+
+    def __str__(self) -> str:
+        """Override default classes' instance view."""
+        return f"{self.message_id}: {self.get_status_display()}"
+
+    def mark_sent(self) -> None:
+        """Mark delivery as successfully sent."""
+        self.status = self.STATUS_SENT
+        self.attempts += 1
+        self.last_error = ""
+        self.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "last_error",
+                "datetime_updated",
+            ]
+        )
+
+    def mark_failed(self, error: str, max_attempts: int) -> None:
+        """Reschedule delivery with backoff or fail it completely."""
+        self.attempts += 1
+        self.last_error = error
+        if self.attempts >= max_attempts:
+            self.status = self.STATUS_FAILED
+        else:
+            delay: int = min(
+                self.RETRY_DELAY_SECONDS * 2 ** (self.attempts - 1),
+                self.RETRY_MAX_DELAY_SECONDS
+            )
+            self.datetime_available = timezone.now() + timedelta(
+                seconds=delay
+            )
+        self.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "last_error",
+                "datetime_available",
+                "datetime_updated",
+            ]
+        )
+
+    def postpone(self, seconds: float) -> None:
+        """Postpone delivery without spending an attempt."""
+        self.datetime_available = timezone.now() + timedelta(seconds=seconds)
+        self.save(
+            update_fields=["datetime_available", "datetime_updated"]
+        )
@@ -0,0 +1,261 @@
+# Python
+from typing import (
+    Any,
+    Iterator,
+    NamedTuple,
+    Optional,
+)
+from datetime import (
+    datetime,
+    timezone as dt_timezone,
+)
+import re
+
+# Django
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.transaction import atomic
+
+# Project
+from chats.models import (
+    Message,
+    MessageQuerySet,
+    TelegramDelivery,
+)
+
+BOUND_RE: re.Pattern = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+
+class Partition(NamedTuple):
+    """Partition of the messages table with its range of datetime_created."""
+
+    name: str
+    start: Optional[datetime]
+    end: Optional[datetime]
+    is_default: bool = False
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Check if range [start, end) intersects range of the partition."""
+        if self.is_default:
+            return False
+        return (self.start is None or self.start < end) and \
+            (self.end is None or start < self.end)
+
+
+def get_month_start(value: datetime) -> datetime:
+    """Get beginning of the month of value in UTC."""
+    return value.astimezone(dt_timezone.utc).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    month: int = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1)
+
+
+def parse_bound(value: str) -> Optional[datetime]:
+    """Parse partition bound, MINVALUE and MAXVALUE are None."""
+    if value in ("MINVALUE", "MAXVALUE"):
+        return None
+    return datetime.fromisoformat(value.strip("'"))
+
+
+class MessagePartitions:
+    """Monthly range partitions of chats_message on PostgreSQL."""
+
+    table: str = Message._meta.db_table
+
+    def __init__(self, using: str = "default") -> None:
+        self.connection: BaseDatabaseWrapper = connections[using]
+
+    @property
+    def is_partitioned(self) -> bool:
+        if self.connection.vendor != "postgresql":
+            return False
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = %s::regclass",
+                (self.table,)
+            )
+            return cursor.fetchone() is not None
+
+    def get_partition_name(self, start: datetime) -> str:
+        return f"{self.table}_p{start:%Y%m}"
+
+    def get_partitions(self) -> list[Partition]:
+        """Get attached partitions ordered by their ranges."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT child.relname, "
+                "pg_get_expr(child.relpartbound, child.oid) "
+                "FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = %s::regclass",
+                (self.table,)
+            )
+            rows: list[tuple[str, str]] = cursor.fetchall()
+        partitions: list[Partition] = []
+        name: str
+        bound: str
+        for name, bound in rows:
+            match: Optional[re.Match] = BOUND_RE.search(bound)
+            if not match:
+                partitions.append(Partition(name, None, None, True))
+                continue
+            partitions.append(
+                Partition(
+                    name,
+                    parse_bound(match.group(1)),
+                    parse_bound(match.group(2)),
+                )
+            )
+        return sorted(
+            partitions,
+            key=lambda partition: (
+                partition.is_default,
+                partition.start or
+                datetime.min.replace(tzinfo=dt_timezone.utc)
+            )
+        )
+
+    def get_default_partition(self) -> Optional[Partition]:
+        partition: Partition
+        for partition in self.get_partitions():
+            if partition.is_default:
+                return partition
+        return None
+
+    def create_partition(self, start: datetime) -> Optional[str]:
+        """Create partition of the month, get its name if it is created.
+
+        Rows which already went to the default partition are moved
+        into the new one.
+        """
+        end: datetime = add_months(start, 1)
+        name: str = self.get_partition_name(start=start)
+        if any(
+            partition.overlaps(start=start, end=end)
+            for partition in self.get_partitions()
+        ):
+            return None
+        default: Optional[Partition] = self.get_default_partition()
+        with atomic(using=self.connection.alias), \
+                self.connection.cursor() as cursor:
+            if not default:
+                cursor.execute(
+                    f"CREATE TABLE {name} PARTITION OF {self.table} "
+                    "FOR VALUES FROM (%s) TO (%s)",
+                    (start, end)
+                )
+                return name
+            # Generated columns are computed again on insert.
+            columns: str = ", ".join(
+                field.column for field in Message._meta.concrete_fields
+            )
+            cursor.execute(
+                f"CREATE TABLE {name} (LIKE {self.table} "
+                "INCLUDING DEFAULTS INCLUDING GENERATED)"
+            )
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {default.name} "
+                "WHERE datetime_created >= %s AND datetime_created < %s "
+                f"RETURNING {columns}) "
+                f"INSERT INTO {name} ({columns}) SELECT {columns} FROM moved",
+                (start, end)
+            )
+            cursor.execute(
+                f"ALTER TABLE {self.table} ATTACH PARTITION {name} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                (start, end)
+            )
+        return name
+
+    def create_ahead(self, now: datetime, months: int) -> list[str]:
+        """Create partitions of the current and next months."""
+        month_start: datetime = get_month_start(value=now)
+        created: list[str] = []
+        month: int
+        for month in range(months + 1):
+            name: Optional[str] = self.create_partition(
+                start=add_months(month_start, month)
+            )
+            if name:
+                created.append(name)
+        return created
+
+    def get_expired(
+        self,
+        now: datetime,
+        retain_months: int
+    ) -> list[Partition]:
+        """Get partitions which ended before the retention period."""
+        cutoff: datetime = add_months(
+            get_month_start(value=now),
+            -retain_months
+        )
+        return [
+            partition for partition in self.get_partitions()
+            if not partition.is_default and partition.end and
+            partition.end <= cutoff
+        ]
+
+    def detach_partition(self, partition: Partition) -> None:
+        """Detach partition and delete telegram deliveries of its rows.
+
+        Counters of owners of the detached messages are recomputed in
+        the same transaction.
+        """
+        with atomic(using=self.connection.alias), \
+                self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {TelegramDelivery._meta.db_table} "
+                f"WHERE message_id IN (SELECT id FROM {partition.name})"
+            )
+            cursor.execute(f"SELECT DISTINCT owner_id FROM {partition.name}")
+            owner_ids: list[int] = [row[0] for row in cursor.fetchall()]
+            cursor.execute(
+                f"ALTER TABLE {self.table} DETACH PARTITION {partition.name}"
+            )
+            messages: MessageQuerySet = Message.objects.using(
+                self.connection.alias
+            )
+            index: int
+            for index in range(0, len(owner_ids), messages.CHUNK_SIZE):
+                messages.update_owners_counters(
+                    owner_ids=owner_ids[index:index + messages.CHUNK_SIZE]
+                )
+
+    def iter_rows(
+        self,
+        name: str,
+        chunk_size: int
+    ) -> Iterator[dict[str, Any]]:
+        """Iterate rows of the detached partition with server side cursor."""
+        columns: list[str] = [
+            field.column for field in Message._meta.concrete_fields
+        ]
+        with atomic(using=self.connection.alias):
+            cursor: Any = self.connection.chunked_cursor()
+            cursor.itersize = chunk_size
+            cursor.execute(
+                f"SELECT {', '.join(columns)} FROM {name} ORDER BY id"
+            )
+            try:
+                row: tuple
+                for row in cursor:
+                    yield dict(zip(columns, row))
+            finally:
+                cursor.close()
+
+    def set_tablespace(self, name: str, tablespace: str) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {name} SET TABLESPACE "
+                f"{self.connection.ops.quote_name(tablespace)}"
+            )
+
+    def drop_partition(self, name: str) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE {name}")
@@ -0,0 +1,13 @@
+# Django
+from django.urls import path
+
+# Project
+from chats.consumers import MessageConsumer
+
+websocket_urlpatterns: list = [
+    path(
+        route="ws/v1/chats/messages",
+        view=MessageConsumer.as_asgi(),
+        name="messages_websocket"
+    ),
+]
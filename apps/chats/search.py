@@ -0,0 +1,145 @@
+# Python
+from typing import Any
+
+# Django
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import (
+    BooleanField,
+    Expression,
+    Field,
+    FloatField,
+    Func,
+    Value,
+)
+from django.db.models.sql.compiler import SQLCompiler
+
+# Text search configuration of the generated search_vector column,
+# chats/migrations/0011 creates it with the same one.
+SEARCH_CONFIG: str = "russian"
+SEARCH_VECTOR_COLUMN: str = "search_vector"
+FTS_TABLE: str = "chats_message_fts"
+
+
+def get_table(compiler: SQLCompiler) -> str:
+    """Get quoted alias of the base table of the compiled query."""
+    return compiler.quote_name_unless_alias(
+        compiler.query.get_initial_alias()
+    )
+
+
+class SearchVectorColumn(Expression):
+    """Generated tsvector column which isn't a field of the model."""
+
+    output_field: Field = Field()
+
+    def as_sql(
+        self,
+        compiler: SQLCompiler,
+        connection: BaseDatabaseWrapper
+    ) -> tuple[str, list[Any]]:
+        return (
+            f"{get_table(compiler=compiler)}."
+            f"{connection.ops.quote_name(SEARCH_VECTOR_COLUMN)}",
+            []
+        )
+
+
+class PlainToTsQuery(Func):
+    """All words of the text, stemmed like the search vector."""
+
+    function: str = "plainto_tsquery"
+    template: str = f"%(function)s('{SEARCH_CONFIG}', %(expressions)s)"
+    output_field: Field = Field()
+
+
+class TsMatch(Func):
+    """tsvector @@ tsquery."""
+
+    arg_joiner: str = " @@ "
+    template: str = "(%(expressions)s)"
+    output_field: BooleanField = BooleanField()
+
+
+class TsRankCd(Func):
+    """Cover density rank, cast to float8 to round trip through cursors."""
+
+    function: str = "ts_rank_cd"
+    template: str = "%(function)s(%(expressions)s)::double precision"
+    output_field: FloatField = FloatField()
+
+
+class FtsFunc(Func):
+    """Expression over the SQLite FTS5 index of the messages table."""
+
+    def as_sql(
+        self,
+        compiler: SQLCompiler,
+        connection: BaseDatabaseWrapper,
+        **extra_context: Any
+    ) -> tuple[str, list[Any]]:
+        return super().as_sql(
+            compiler,
+            connection,
+            table=get_table(compiler=compiler),
+            **extra_context
+        )
+
+
+class FtsMatch(FtsFunc):
+    """Rows of the table found by FTS5."""
+
+    template: str = (
+        f"%(table)s.id IN (SELECT rowid FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH %(expressions)s)"
+    )
+    output_field: BooleanField = BooleanField()
+
+
+class FtsRank(FtsFunc):
+    """Rank of the row found by FTS5.
+
+    bm25() is lower for better matches, so it is negated to order
+    by rank descending like on PostgreSQL.
+    """
+
+    template: str = (
+        f"(SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH %(expressions)s "
+        f"AND {FTS_TABLE}.rowid = %(table)s.id)"
+    )
+    output_field: FloatField = FloatField()
+
+
+def get_fts_query(text: str) -> str:
+    """Quote words of the text, so FTS5 matches all of them."""
+    return " ".join(
+        '"' + word.replace('"', '""') + '"' for word in text.split()
+    )
+
+
+def get_search_ordering(vendor: str) -> tuple[str]:
+    """Get ordering of found rows which is stable between pages.
+
+    ts_rank_cd depends only on the row and the query. bm25() of FTS5
+    depends on statistics of the whole index and changes with every
+    written message, so cursors over it skip or repeat rows, and the
+    SQLite fallback is ordered by id.
+    """
+    if vendor == "postgresql":
+        return ("-search_rank", "-id")
+    return ("-id",)
+
+
+def get_search_expressions(
+    vendor: str,
+    text: str
+) -> tuple[Expression, Expression]:
+    """Get rank of rows and condition of rows matching the text."""
+    if vendor == "postgresql":
+        query: Expression = PlainToTsQuery(Value(text))
+        return (
+            TsRankCd(SearchVectorColumn(), query),
+            TsMatch(SearchVectorColumn(), query),
+        )
+    fts_query: Value = Value(get_fts_query(text=text))
+    return FtsRank(fts_query), FtsMatch(fts_query)
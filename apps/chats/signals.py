@@ -1,10 +1,63 @@
+# Python
+from typing import (
+    Any,
+    Optional,
+)
+
+# Third party
+from asgiref.sync import async_to_sync
+from channels.layers import (
+    BaseChannelLayer,
+    get_channel_layer,
+)
+
 # Django
 from django.dispatch import receiver
 from django.db.models.signals import post_save
 from django.db.models.base import ModelBase
+from django.db.transaction import on_commit
 
 # Project
-from chats.models import Message
+from abstracts.signals import (
+    post_bulk_create,
+    post_soft_delete,
+    post_recover,
+)
+from chats.models import (
+    Message,
+    MessageQuerySet,
+)
+from chats.serializers import MessageForeignKeySerializer
+
+
+def publish_messages(messages: list[Message]) -> None:
+    """Push created messages to their owners' websocket groups.
+
+    Registered with robust on_commit, so errors of the channel layer
+    are logged and don't fail the request which saved the messages.
+    """
+    channel_layer: Optional[BaseChannelLayer] = get_channel_layer()
+    if not channel_layer:
+        return
+
+    owners_messages: dict[int, list[Message]] = {}
+    message: Message
+    for message in messages:
+        owners_messages.setdefault(message.owner_id, []).append(message)
+
+    owner_id: int
+    owner_messages: list[Message]
+    for owner_id, owner_messages in owners_messages.items():
+        async_to_sync(channel_layer.group_send)(
+            Message.get_group_name(owner_id=owner_id),
+            {
+                "type": "messages.created",
+                "data": MessageForeignKeySerializer(
+                    owner_messages,
+                    many=True
+                ).data,
+            }
+        )
 
 
 @receiver(
@@ -19,4 +72,69 @@ def post_save_message(
 ) -> None:
     """Triggers when the Message is created."""
     if created:
-        instance.send_telegram_message()
+        instance.enqueue_telegram_message()
+        Message.objects.using(
+            kwargs.get("using")
+        ).increment_owners_counters(messages=[instance])
+        # Lambda, not partial: robust on_commit logs func.__qualname__.
+        on_commit(
+            lambda: publish_messages(messages=[instance]),
+            using=kwargs.get("using"),
+            robust=True
+        )
+
+
+@receiver(
+    signal=post_bulk_create,
+    sender=Message
+)
+def post_bulk_create_messages(
+    sender: ModelBase,
+    instances: list[Message],
+    **kwargs: dict
+) -> None:
+    """Triggers when the Messages are created with bulk_upload."""
+    Message.objects.using(
+        kwargs.get("using")
+    ).increment_owners_counters(messages=instances)
+    on_commit(
+        lambda: publish_messages(messages=instances),
+        using=kwargs.get("using"),
+        robust=True
+    )
+
+
+@receiver(
+    signal=post_soft_delete,
+    sender=Message
+)
+def post_soft_delete_messages(
+    sender: ModelBase,
+    pks: list[Any],
+    **kwargs: dict
+) -> None:
+    """Triggers when messages are soft deleted."""
+    messages: MessageQuerySet = Message.objects.using(kwargs.get("using"))
+    messages.shift_owners_counters(
+        owners={
+            owner_id: (-count, last)
+            for owner_id, (count, last) in messages.get_deleted(
+            ).count_owners_messages(pks=pks).items()
+        }
+    )
+
+
+@receiver(
+    signal=post_recover,
+    sender=Message
+)
+def post_recover_messages(
+    sender: ModelBase,
+    pks: list[Any],
+    **kwargs: dict
+) -> None:
+    """Triggers when messages are recovered."""
+    messages: MessageQuerySet = Message.objects.using(kwargs.get("using"))
+    messages.shift_owners_counters(
+        owners=messages.get_not_deleted().count_owners_messages(pks=pks)
+    )
@@ -1,3 +1,1063 @@
-from django.test import TestCase
+# Python
+from typing import (
+    Any,
+    Optional,
+)
+from asyncio import (
+    CancelledError,
+    create_task,
+    wait_for,
+)
+from datetime import (
+    datetime,
+    timedelta,
+)
+from concurrent.futures import Future
+from io import StringIO
+from tempfile import TemporaryDirectory
+from time import monotonic
+import json
+import os
+from unittest.mock import (
+    AsyncMock,
+    patch,
+)
 
-# Create your tests here.
+# Django
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.core.management import call_command
+from django.db import (
+    DatabaseError,
+    OperationalError,
+)
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.utils import timezone
+from django.urls import reverse
+
+# Third party
+from asgiref.sync import sync_to_async
+from channels.testing import WebsocketCommunicator
+from rest_framework_simplejwt.tokens import RefreshToken
+from telegram.error import RetryAfter
+
+# Project
+from abstracts.signals import (
+    post_soft_delete,
+    post_recover,
+)
+from abstracts.testing import QueryCountTestMixin
+from auths.models import CustomUser
+from chats.dispatcher import TelegramDispatcher
+from chats.models import (
+    Message,
+    MessageQuerySet,
+    TelegramDelivery,
+)
+from chats.serializers import (
+    MessageDetailSerializer,
+    MessageForeignKeySerializer,
+)
+from chats.views import MessageViewSet
+from deploy.test.asgi import application
+
+
+class MessageForeignKeySerializerTestCase(TestCase):
+    """Fast values() path of MessageForeignKeySerializer."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        owner: CustomUser = CustomUser.objects.create_user(
+            login="owner",
+            first_name="Owner",
+            password="password",
+            telegram_id=1
+        )
+        messages: list[Message] = Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=owner)
+                for index in range(5)
+            ]
+        )
+        messages[0].delete()
+
+    def test_fast_representation_matches_serializer(self) -> None:
+        queryset = Message.objects.order_by("id")
+        self.assertEqual(
+            MessageForeignKeySerializer.get_fast_representation(
+                rows=queryset.values(
+                    *MessageForeignKeySerializer.get_fast_value_fields()
+                )
+            ),
+            MessageForeignKeySerializer(queryset, many=True).data
+        )
+
+
+class MessageQueryCountTestCase(QueryCountTestMixin, TestCase):
+    """Listing messages must not load owners one by one."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin: CustomUser = CustomUser.objects.create_superuser(
+            login="admin",
+            first_name="Admin",
+            password="password"
+        )
+        cls.create_messages(start=0, count=2)
+
+    @staticmethod
+    def create_messages(start: int, count: int) -> None:
+        Message.objects.bulk_upload(
+            messages=[
+                Message(
+                    text=f"Сообщение {index}",
+                    owner=CustomUser.objects.create_user(
+                        login=f"owner{index}",
+                        first_name="Owner",
+                        password="password",
+                        telegram_id=index + 1
+                    )
+                )
+                for index in range(start, start + count)
+            ]
+        )
+
+    def test_detail_serializer_list(self) -> None:
+        self.assertQueriesDoNotGrow(
+            func=lambda: MessageDetailSerializer(
+                MessageViewSet().get_queryset(),
+                many=True
+            ).data,
+            grow=lambda: self.create_messages(start=2, count=5)
+        )
+
+    def test_message_list_endpoint(self) -> None:
+        def create_admin_messages() -> None:
+            Message.objects.bulk_upload(
+                messages=[
+                    Message(text=f"Сообщение {index}", owner=self.admin)
+                    for index in range(5)
+                ]
+            )
+
+        create_admin_messages()
+        self.assertQueriesDoNotGrow(
+            func=lambda: self.client.get(
+                reverse("message-list"),
+                HTTP_AUTHORIZATION="JWT "
+                f"{RefreshToken.for_user(user=self.admin).access_token}"
+            ),
+            grow=create_admin_messages
+        )
+        response: Any = self.client.get(
+            reverse("message-list"),
+            {"page_size": 3},
+            HTTP_AUTHORIZATION="JWT "
+            f"{RefreshToken.for_user(user=self.admin).access_token}"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]), 3)
+        self.assertEqual(
+            {message["owner"]["id"] for message in response.json()["data"]},
+            {self.admin.pk}
+        )
+        self.assertIsNotNone(response.json()["next"])
+
+    def test_message_detail_endpoint(self) -> None:
+        message: Message = Message.objects.create(
+            text="Сообщение",
+            owner=self.admin
+        )
+        other_message: Message = Message.objects.exclude(
+            owner=self.admin
+        ).first()
+        token: str = str(RefreshToken.for_user(user=self.admin).access_token)
+        self.client.get(
+            reverse("message-detail", args=(message.pk,)),
+            HTTP_AUTHORIZATION=f"JWT {token}"
+        )
+        # The owner is selected with the message, the user is cached.
+        with self.assertNumQueries(1):
+            response: Any = self.client.get(
+                reverse("message-detail", args=(message.pk,)),
+                HTTP_AUTHORIZATION=f"JWT {token}"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["data"]["owner"]["id"],
+            self.admin.pk
+        )
+        pk: Any
+        for pk in (other_message.pk, "abc"):
+            with self.subTest(pk=pk):
+                self.assertEqual(
+                    self.client.get(
+                        reverse("message-detail", args=(pk,)),
+                        HTTP_AUTHORIZATION=f"JWT {token}"
+                    ).status_code,
+                    404
+                )
+
+    def test_admin_message_changelist(self) -> None:
+        self.client.force_login(self.admin)
+        self.assertQueriesDoNotGrow(
+            func=lambda: self.client.get(
+                reverse("admin:chats_message_changelist")
+            ),
+            grow=lambda: self.create_messages(start=2, count=5)
+        )
+
+    def test_admin_delivery_changelist(self) -> None:
+        self.client.force_login(self.admin)
+        self.assertQueriesDoNotGrow(
+            func=lambda: self.client.get(
+                reverse("admin:chats_telegramdelivery_changelist")
+            ),
+            grow=lambda: self.create_messages(start=2, count=5)
+        )
+
+
+class MessagePublishTestCase(TestCase):
+    """Websocket push doesn't fail the saved message."""
+
+    class BrokenChannelLayer:
+        async def group_send(self, *args: tuple, **kwargs: dict) -> None:
+            raise ConnectionError("channel layer is down")
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.owner: CustomUser = CustomUser.objects.create_user(
+            login="owner",
+            first_name="Owner",
+            password="password",
+            telegram_id=1
+        )
+
+    def test_upload_succeeds_when_channel_layer_fails(self) -> None:
+        with patch(
+            "chats.signals.get_channel_layer",
+            return_value=self.BrokenChannelLayer()
+        ), self.assertLogs(level="ERROR"), \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("message-upload_message"),
+                {"text": "Сообщение"},
+                HTTP_AUTHORIZATION="JWT "
+                f"{RefreshToken.for_user(user=self.owner).access_token}"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Message.objects.filter(owner=self.owner).count(), 1)
+
+
+class MessageUploadTestCase(QueryCountTestMixin, TestCase):
+    """Bulk upload of the list of messages."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.owner: CustomUser = CustomUser.objects.create_user(
+            login="owner",
+            first_name="Owner",
+            password="password",
+            telegram_id=1
+        )
+        cls.other: CustomUser = CustomUser.objects.create_user(
+            login="other",
+            first_name="Other",
+            password="password",
+            telegram_id=2
+        )
+
+    def upload(self, data: Any) -> Any:
+        return self.client.post(
+            reverse("message-upload_messages"),
+            data,
+            content_type="application/json",
+            HTTP_AUTHORIZATION="JWT "
+            f"{RefreshToken.for_user(user=self.owner).access_token}"
+        )
+
+    def test_upload_writes_counters_and_deliveries(self) -> None:
+        response: Any = self.upload(
+            data=[
+                {"text": "Первое"},
+                {"text": "Второе", "owner": self.other.pk},
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [message["text"] for message in response.json()["data"]],
+            ["Первое", "Второе"]
+        )
+        self.assertEqual(
+            Message.objects.filter(owner=self.owner).count(),
+            2
+        )
+        self.assertFalse(Message.objects.filter(owner=self.other).exists())
+        self.assertEqual(
+            TelegramDelivery.objects.filter(
+                message__owner=self.owner,
+                status=TelegramDelivery.STATUS_PENDING
+            ).count(),
+            2
+        )
+        self.owner.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(self.owner.messages_count, 2)
+        self.assertIsNotNone(self.owner.last_message_at)
+        self.assertEqual(self.other.messages_count, 0)
+
+    def test_body_must_be_list(self) -> None:
+        response: Any = self.upload(data={"text": "Сообщение"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("detail", response.json())
+        self.assertFalse(Message.objects.exists())
+
+    @override_settings(MESSAGES_UPLOAD_MAX_BATCH_SIZE=2)
+    def test_batch_size_limit(self) -> None:
+        response: Any = self.upload(
+            data=[{"text": f"Сообщение {index}"} for index in range(3)]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("detail", response.json())
+        self.assertFalse(Message.objects.exists())
+
+    def test_errors_are_positional(self) -> None:
+        response: Any = self.upload(
+            data=[{"text": "Сообщение"}, {"text": ""}, {}]
+        )
+        self.assertEqual(response.status_code, 400)
+        errors: list[dict] = response.json()
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(errors[0], {})
+        self.assertIn("text", errors[1])
+        self.assertIn("text", errors[2])
+        self.assertFalse(Message.objects.exists())
+
+    def test_async_upload_matches_sync(self) -> None:
+        url_name: str
+        for url_name in ("message-upload_message", "async_upload_message"):
+            with self.subTest(url_name=url_name):
+                response: Any = self.client.post(
+                    reverse(url_name),
+                    {"text": "Сообщение", "owner": self.other.pk},
+                    content_type="application/json",
+                    HTTP_AUTHORIZATION="JWT "
+                    f"{RefreshToken.for_user(user=self.owner).access_token}"
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()["data"]["text"], "Сообщение")
+                self.assertEqual(
+                    response.json()["data"]["owner"]["id"],
+                    self.owner.pk
+                )
+                response = self.client.post(
+                    reverse(url_name),
+                    {"text": ""},
+                    content_type="application/json",
+                    HTTP_AUTHORIZATION="JWT "
+                    f"{RefreshToken.for_user(user=self.owner).access_token}"
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("text", response.json())
+                self.assertEqual(
+                    self.client.post(reverse(url_name)).status_code,
+                    401
+                )
+        self.assertEqual(
+            Message.objects.filter(owner=self.owner).count(),
+            2
+        )
+
+    def test_queries_do_not_depend_on_batch_size(self) -> None:
+        def upload(count: int) -> None:
+            cache.clear()
+            response: Any = self.upload(
+                data=[
+                    {"text": f"Сообщение {index}"}
+                    for index in range(count)
+                ]
+            )
+            self.assertEqual(response.status_code, 200)
+
+        one_count: int
+        many_count: int
+        one_count, _ = self.get_queries_count(func=lambda: upload(count=1))
+        many_count, _ = self.get_queries_count(
+            func=lambda: upload(count=20)
+        )
+        self.assertEqual(many_count, one_count)
+
+
+class MessageConsumerTestCase(TestCase):
+    """Websocket push of the user's new messages."""
+
+    ORIGIN: tuple[bytes, bytes] = (b"origin", b"http://localhost")
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.owner: CustomUser = CustomUser.objects.create_user(
+            login="owner",
+            first_name="Owner",
+            password="password",
+            telegram_id=1
+        )
+        cls.token: str = str(
+            RefreshToken.for_user(user=cls.owner).access_token
+        )
+
+    def get_communicator(
+        self,
+        query: str = "",
+        origin: tuple[bytes, bytes] = ORIGIN
+    ) -> WebsocketCommunicator:
+        return WebsocketCommunicator(
+            application,
+            f"ws/v1/chats/messages{query}",
+            headers=[origin]
+        )
+
+    def upload(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            response: Any = self.client.post(
+                reverse("message-upload_messages"),
+                [{"text": "Первое"}, {"text": "Второе"}],
+                content_type="application/json",
+                HTTP_AUTHORIZATION=f"JWT {self.token}"
+            )
+        self.assertEqual(response.status_code, 200)
+
+    async def test_unauthorized_connections_are_closed(self) -> None:
+        query: str
+        for query in ("", "?token=", "?token=invalid"):
+            with self.subTest(query=query):
+                communicator: WebsocketCommunicator = \
+                    self.get_communicator(query=query)
+                connected: bool
+                code: Optional[int]
+                connected, code = await communicator.connect()
+                self.assertFalse(connected)
+                self.assertEqual(code, 4401)
+
+    async def test_foreign_origin_is_rejected(self) -> None:
+        communicator: WebsocketCommunicator = self.get_communicator(
+            query=f"?token={self.token}",
+            origin=(b"origin", b"https://example.com")
+        )
+        connected: bool
+        connected, _ = await communicator.connect()
+        self.assertFalse(connected)
+
+    async def test_uploaded_messages_are_pushed(self) -> None:
+        communicator: WebsocketCommunicator = self.get_communicator(
+            query=f"?token={self.token}"
+        )
+        connected: bool
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        try:
+            await sync_to_async(self.upload)()
+            event: dict[str, Any] = await communicator.receive_json_from(
+                timeout=1
+            )
+        finally:
+            await communicator.disconnect()
+        self.assertEqual(event["event"], "messages_created")
+        self.assertEqual(
+            [message["text"] for message in event["data"]],
+            ["Первое", "Второе"]
+        )
+
+
+@patch("chats.dispatcher.asend_telegram_bot_message", new_callable=AsyncMock)
+class TelegramDispatcherTestCase(SimpleTestCase):
+    """Rate limits of TelegramDispatcher don't hold sending slots."""
+
+    def get_dispatcher(self, max_retries: int = 0) -> TelegramDispatcher:
+        return TelegramDispatcher(
+            global_rate=100,
+            chat_rate=1,
+            chat_burst=1,
+            concurrency=1,
+            max_retries=max_retries
+        )
+
+    async def test_limited_chat_does_not_block_others(
+        self,
+        send: AsyncMock
+    ) -> None:
+        dispatcher: TelegramDispatcher = self.get_dispatcher()
+        dispatcher.get_chat_bucket(chat_id=1).block(seconds=10)
+        limited = create_task(dispatcher.asend("Первое", 1, "User"))
+        await wait_for(dispatcher.asend("Второе", 2, "User"), timeout=1)
+        self.assertFalse(limited.done())
+        self.assertEqual(dispatcher.get_stats()["sent"], 1)
+        self.assertEqual(dispatcher.get_stats()["queue_depth"], 1)
+        limited.cancel()
+        with self.assertRaises(CancelledError):
+            await limited
+        self.assertEqual(dispatcher.get_stats()["queue_depth"], 0)
+
+    async def test_retry_after_blocks_whole_bot(
+        self,
+        send: AsyncMock
+    ) -> None:
+        send.side_effect = RetryAfter(retry_after=5)
+        dispatcher: TelegramDispatcher = self.get_dispatcher()
+        with self.assertRaises(RetryAfter):
+            await dispatcher.asend("Сообщение", 1, "User")
+        self.assertGreater(dispatcher.global_bucket.get_delay(monotonic()), 4)
+        self.assertFalse(dispatcher._semaphore.locked())
+        stats: dict = dispatcher.get_stats()
+        self.assertEqual(
+            (stats["queue_depth"], stats["in_flight"], stats["failed"]),
+            (0, 0, 1)
+        )
+
+
+class MessageBulkSoftDeleteTestCase(TestCase):
+    """Chunked soft_delete/recover of AbstractDateTimeQuerySet."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.owner: CustomUser = CustomUser.objects.create_user(
+            login="owner",
+            first_name="Owner",
+            password="password"
+        )
+        Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=cls.owner)
+                for index in range(5)
+            ]
+        )
+
+    def setUp(self) -> None:
+        self.signals: list[dict] = []
+        post_soft_delete.connect(self.receive, sender=Message)
+        post_recover.connect(self.receive, sender=Message)
+
+    def tearDown(self) -> None:
+        post_soft_delete.disconnect(self.receive, sender=Message)
+        post_recover.disconnect(self.receive, sender=Message)
+
+    def receive(self, **kwargs: dict) -> None:
+        self.signals.append(kwargs)
+
+    def test_soft_delete_and_recover_in_chunks(self) -> None:
+        Message.objects.order_by("id").first().delete()
+        self.assertEqual(len(self.signals.pop()["pks"]), 1)
+        # Two chunks of SELECT, UPDATE and SELECT of updated rows, the
+        # last empty SELECT, counts of messages of owners and UPDATE
+        # of their counters.
+        with self.assertNumQueries(9):
+            deleted: int = Message.objects.soft_delete(chunk_size=2)
+        self.assertEqual(deleted, 4)
+        self.assertFalse(Message.objects.get_not_deleted().exists())
+        self.assertEqual(len(self.signals), 1)
+        self.assertEqual(len(self.signals[0]["pks"]), 4)
+
+        recovered: int = Message.objects.filter(
+            owner=self.owner
+        ).recover(chunk_size=10)
+        self.assertEqual(recovered, 5)
+        self.assertFalse(Message.objects.get_deleted().exists())
+        self.assertEqual(len(self.signals), 2)
+
+    def test_signal_skips_rows_changed_concurrently(self) -> None:
+        concurrent: Message = Message.objects.order_by("id").last()
+        update: Any = MessageQuerySet.update
+
+        def update_after_concurrent_delete(
+            queryset: MessageQuerySet,
+            **values: Any
+        ) -> int:
+            QuerySet.update(
+                Message.objects.filter(pk=concurrent.pk),
+                datetime_deleted=timezone.now() - timedelta(seconds=1)
+            )
+            return update(queryset, **values)
+
+        with patch.object(
+            MessageQuerySet,
+            "update",
+            update_after_concurrent_delete
+        ):
+            deleted: int = Message.objects.soft_delete()
+        self.assertEqual(deleted, 4)
+        self.assertNotIn(concurrent.pk, self.signals[0]["pks"])
+        self.owner.refresh_from_db()
+        # The concurrent request shifts the counter by its own row.
+        self.assertEqual(self.owner.messages_count, 1)
+
+    def test_counters_of_owners_in_one_update(self) -> None:
+        other: CustomUser = CustomUser.objects.create_user(
+            login="other",
+            first_name="Other",
+            password="password"
+        )
+        Message.objects.bulk_upload(
+            messages=[Message(text="Чужое", owner=other)]
+        )
+        with self.assertNumQueries(1):
+            Message.objects.shift_owners_counters(
+                owners={
+                    self.owner.pk: (-2, timezone.now()),
+                    other.pk: (3, timezone.now()),
+                }
+            )
+        self.assertEqual(
+            dict(
+                CustomUser.objects.filter(
+                    pk__in=(self.owner.pk, other.pk)
+                ).values_list("pk", "messages_count")
+            ),
+            {self.owner.pk: 3, other.pk: 4}
+        )
+
+    def test_user_cache_is_invalidated(self) -> None:
+        cache_key: str = CustomUser.get_cache_key(user_id=self.owner.pk)
+        cache.set(cache_key, self.owner)
+        CustomUser.objects.filter(pk=self.owner.pk).soft_delete()
+        self.assertIsNone(cache.get(cache_key))
+
+
+class MessageCountersTestCase(TestCase):
+    """Denormalized messages_count and last_message_at of users."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.owner: CustomUser = CustomUser.objects.create_user(
+            login="owner",
+            first_name="Owner",
+            password="password"
+        )
+
+    def get_counters(self) -> tuple[int, datetime]:
+        self.owner.refresh_from_db()
+        return self.owner.messages_count, self.owner.last_message_at
+
+    def test_counters_follow_messages(self) -> None:
+        first: Message = Message.objects.create(
+            text="Первое",
+            owner=self.owner
+        )
+        self.assertEqual(self.get_counters(), (1, first.datetime_created))
+        messages: list[Message] = Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=self.owner)
+                for index in range(3)
+            ]
+        )
+        last: datetime = messages[-1].datetime_created
+        self.assertEqual(self.get_counters(), (4, last))
+
+        Message.objects.get(pk=messages[-1].pk).delete()
+        self.assertEqual(
+            self.get_counters(),
+            (3, messages[-2].datetime_created)
+        )
+        Message.objects.filter(owner=self.owner).soft_delete()
+        self.assertEqual(self.get_counters(), (0, None))
+        Message.objects.filter(owner=self.owner).recover()
+        self.assertEqual(self.get_counters(), (4, last))
+
+    def test_soft_delete_shifts_counters(self) -> None:
+        messages: list[Message] = Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=self.owner)
+                for index in range(3)
+            ]
+        )
+        last: datetime = messages[-1].datetime_created
+        # Counters are shifted by changed rows, not recomputed.
+        CustomUser.objects.filter(pk=self.owner.pk).update(
+            messages_count=10
+        )
+        Message.objects.filter(pk=messages[0].pk).soft_delete()
+        self.assertEqual(self.get_counters(), (9, last))
+        Message.objects.filter(pk=messages[0].pk).soft_delete()
+        self.assertEqual(self.get_counters(), (9, last))
+        Message.objects.filter(pk=messages[0].pk).recover()
+        self.assertEqual(self.get_counters(), (10, last))
+
+    def test_reconcile_fixes_drift(self) -> None:
+        Message.objects.create(text="Сообщение", owner=self.owner)
+        CustomUser.objects.filter(pk=self.owner.pk).update(
+            messages_count=10,
+            last_message_at=None
+        )
+        output: StringIO = StringIO()
+        call_command("reconcile_message_counters", "--dry-run", stdout=output)
+        self.assertIn("расхождений: 1", output.getvalue())
+        self.assertEqual(self.get_counters()[0], 10)
+
+        call_command("reconcile_message_counters", stdout=output)
+        self.assertEqual(self.get_counters()[0], 1)
+        output = StringIO()
+        call_command("reconcile_message_counters", stdout=output)
+        self.assertIn("расхождений: 0", output.getvalue())
+
+
+class PurgeSoftDeletedTestCase(TestCase):
+    """Command purge_soft_deleted removes only expired rows."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        expired: datetime = timezone.now() - timedelta(days=365)
+        cls.owner: CustomUser = CustomUser.objects.create_user(
+            login="owner",
+            first_name="Owner",
+            password="password"
+        )
+        cls.deleted_owner: CustomUser = CustomUser.objects.create_user(
+            login="deleted",
+            first_name="Deleted",
+            password="password"
+        )
+        CustomUser.objects.filter(pk=cls.deleted_owner.pk).update(
+            datetime_deleted=expired
+        )
+        Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=owner)
+                for index in range(3)
+                for owner in (cls.owner, cls.deleted_owner)
+            ]
+        )
+        messages: list[int] = list(
+            Message.objects.filter(owner=cls.owner).order_by("id")
+            .values_list("id", flat=True)
+        )
+        Message.objects.filter(pk__in=messages[:2]).update(
+            datetime_deleted=expired
+        )
+        Message.objects.filter(pk=messages[2]).update(
+            datetime_deleted=timezone.now()
+        )
+
+    def purge(self, *args: str) -> str:
+        output: StringIO = StringIO()
+        call_command(
+            "purge_soft_deleted",
+            "--batch-size=1",
+            "--sleep=0",
+            *args,
+            stdout=output
+        )
+        return output.getvalue()
+
+    def test_dry_run_only_counts(self) -> None:
+        output: str = self.purge("--dry-run")
+        self.assertIn("chats.Message: 2", output)
+        self.assertIn("auths.CustomUser: 1", output)
+        self.assertEqual(Message._base_manager.count(), 6)
+
+    def test_purge_expired_rows(self) -> None:
+        cache_key: str = CustomUser.get_cache_key(
+            user_id=self.deleted_owner.pk
+        )
+        cache.set(cache_key, self.deleted_owner)
+        output: str = self.purge()
+        self.assertIn("строк/сек", output)
+        self.assertEqual(
+            list(Message._base_manager.values_list("owner", flat=True)),
+            [self.owner.pk]
+        )
+        self.assertFalse(
+            CustomUser._base_manager.filter(
+                pk=self.deleted_owner.pk
+            ).exists()
+        )
+        self.assertIsNone(cache.get(cache_key))
+
+    def test_retried_batch_is_archived_once(self) -> None:
+        delete: Any = QuerySet.delete
+        locked: list[bool] = []
+
+        def delete_after_lock(queryset: QuerySet) -> tuple[int, dict]:
+            if not locked:
+                locked.append(True)
+                raise OperationalError("database is locked")
+            return delete(queryset)
+
+        with TemporaryDirectory() as archive_dir, \
+                patch.object(QuerySet, "delete", delete_after_lock):
+            call_command(
+                "purge_soft_deleted",
+                "--batch-size=10",
+                "--sleep=0",
+                f"--archive-dir={archive_dir}",
+                stdout=StringIO(),
+                stderr=StringIO()
+            )
+            with open(
+                os.path.join(archive_dir, "chats_message.ndjson"),
+                encoding="utf-8"
+            ) as archive:
+                ids: list[int] = [json.loads(line)["id"] for line in archive]
+        self.assertEqual(locked, [True])
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(len(set(ids)), 5)
+        self.assertEqual(Message._base_manager.count(), 1)
+
+
+class MessageSearchTestCase(TestCase):
+    """Full-text search of the owner's messages."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.owner: CustomUser = CustomUser.objects.create_user(
+            login="owner",
+            first_name="Owner",
+            password="password"
+        )
+        other: CustomUser = CustomUser.objects.create_user(
+            login="other",
+            first_name="Other",
+            password="password"
+        )
+        cls.messages: list[Message] = Message.objects.bulk_upload(
+            messages=[
+                Message(text="deploy failed on staging", owner=cls.owner),
+                Message(text="deploy deploy deploy", owner=cls.owner),
+                Message(text="lunch at noon", owner=cls.owner),
+                Message(text="deploy finished", owner=other),
+            ]
+        )
+        Message.objects.bulk_upload(
+            messages=[
+                Message(text="deploy notes", owner=cls.owner),
+            ]
+        )[0].delete()
+
+    def search(self, **params: str) -> dict:
+        response = self.client.get(
+            reverse("message-search"),
+            params,
+            HTTP_AUTHORIZATION="JWT "
+            f"{RefreshToken.for_user(user=self.owner).access_token}"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_search_ranks_owner_messages(self) -> None:
+        data: dict = self.search(q="deploy")
+        self.assertEqual(
+            [message["id"] for message in data["data"]],
+            [self.messages[1].pk, self.messages[0].pk]
+        )
+        self.assertIsNone(data["next"])
+        self.assertEqual(
+            [
+                message["id"]
+                for message in self.search(q="DEPLOY staging")["data"]
+            ],
+            [self.messages[0].pk]
+        )
+
+    def test_search_pages_by_cursor(self) -> None:
+        first: dict = self.search(q="deploy", page_size="1")
+        self.assertEqual(first["data"][0]["id"], self.messages[1].pk)
+        cursor: str = first["next"].split("cursor=")[1].split("&")[0]
+        # New matches change bm25 of SQLite, but not the next page.
+        Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"deploy {index}", owner=self.owner)
+                for index in range(5)
+            ]
+        )
+        second: dict = self.search(q="deploy", page_size="1", cursor=cursor)
+        self.assertEqual(second["data"][0]["id"], self.messages[0].pk)
+        self.assertIsNone(second["next"])
+
+    def test_search_requires_text(self) -> None:
+        response = self.client.get(
+            reverse("message-search"),
+            {"q": " "},
+            HTTP_AUTHORIZATION="JWT "
+            f"{RefreshToken.for_user(user=self.owner).access_token}"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_admin_searches_by_index(self) -> None:
+        self.client.force_login(
+            CustomUser.objects.create_superuser(
+                login="admin",
+                first_name="Admin",
+                password="password"
+            )
+        )
+        response = self.client.get(
+            reverse("admin:chats_message_changelist"),
+            {"q": "staging"}
+        )
+        self.assertEqual(
+            [message.pk for message in response.context["cl"].result_list],
+            [self.messages[0].pk]
+        )
+
+    def test_index_follows_text_changes(self) -> None:
+        message: Message = self.messages[2]
+        message.text = "deploy after lunch"
+        message.save()
+        self.assertIn(
+            message.pk,
+            [message["id"] for message in self.search(q="deploy")["data"]]
+        )
+
+
+class MessageAdminTestCase(TestCase):
+    """Changelist of messages."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin: CustomUser = CustomUser.objects.create_superuser(
+            login="admin",
+            first_name="Admin",
+            password="password"
+        )
+        cls.messages: list[Message] = Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=cls.admin)
+                for index in range(2)
+            ]
+        )
+        Message.objects.filter(pk=cls.messages[0].pk).update(
+            datetime_created=timezone.now() - timedelta(days=40)
+        )
+
+    def test_created_period_filter(self) -> None:
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse("admin:chats_message_changelist"),
+            {"created": "month"}
+        )
+        self.assertEqual(
+            [message.pk for message in response.context["cl"].result_list],
+            [self.messages[1].pk]
+        )
+
+
+class TelegramDeliveryTestCase(TestCase):
+    """Telegram outbox and the command which drains it."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.owner: CustomUser = CustomUser.objects.create_user(
+            login="owner",
+            first_name="Owner",
+            password="password",
+            telegram_id=1
+        )
+
+    def get_done_future(self, exc: Optional[Exception] = None) -> Future:
+        future: Future = Future()
+        if exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(None)
+        return future
+
+    def test_enqueue_in_message_transaction(self) -> None:
+        Message.objects.create(text="Сообщение", owner=self.owner)
+        self.assertEqual(TelegramDelivery.objects.count(), 1)
+        with patch.object(
+            TelegramDelivery.objects,
+            "create",
+            side_effect=DatabaseError("outbox is down")
+        ), self.assertRaises(DatabaseError):
+            Message.objects.create(text="Потерянное", owner=self.owner)
+        self.assertFalse(Message.objects.filter(text="Потерянное").exists())
+
+    def test_claim_pending_leases_rows(self) -> None:
+        Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=self.owner)
+                for index in range(3)
+            ]
+        )
+        lease: timedelta = timedelta(minutes=5)
+        first: list[int] = TelegramDelivery.objects.claim_pending(
+            batch_size=2,
+            lease=lease
+        )
+        self.assertEqual(len(first), 2)
+        self.assertTrue(
+            all(
+                delivery.datetime_available > timezone.now()
+                for delivery in TelegramDelivery.objects.filter(id__in=first)
+            )
+        )
+        second: list[int] = TelegramDelivery.objects.claim_pending(
+            batch_size=2,
+            lease=lease
+        )
+        self.assertEqual(len(second), 1)
+        self.assertNotIn(second[0], first)
+        self.assertEqual(
+            TelegramDelivery.objects.claim_pending(batch_size=2, lease=lease),
+            []
+        )
+
+    def test_mark_failed_backs_off(self) -> None:
+        Message.objects.create(text="Сообщение", owner=self.owner)
+        delivery: TelegramDelivery = TelegramDelivery.objects.get()
+        delays: list[float] = []
+        for _ in range(2):
+            started: datetime = timezone.now()
+            delivery.mark_failed(error="Ошибка", max_attempts=3)
+            delays.append(
+                (delivery.datetime_available - started).total_seconds()
+            )
+        self.assertEqual([round(delay) for delay in delays], [5, 10])
+        self.assertEqual(delivery.status, TelegramDelivery.STATUS_PENDING)
+        delivery.mark_failed(error="Последняя", max_attempts=3)
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, TelegramDelivery.STATUS_FAILED)
+        self.assertEqual(delivery.attempts, 3)
+        self.assertEqual(delivery.last_error, "Последняя")
+
+    @patch("chats.management.commands.deliver_telegram_messages.bot_registry")
+    @patch("chats.models.telegram_dispatcher")
+    def test_command_drains_batch(
+        self,
+        dispatcher: Any,
+        registry: Any
+    ) -> None:
+        messages: list[Message] = Message.objects.bulk_upload(
+            messages=[
+                Message(text=f"Сообщение {index}", owner=self.owner)
+                for index in range(3)
+            ]
+        )
+        dispatcher.submit.side_effect = [
+            self.get_done_future(),
+            self.get_done_future(exc=ConnectionError("network is down")),
+            self.get_done_future(),
+        ]
+        call_command(
+            "deliver_telegram_messages",
+            "--once",
+            "--batch-size=10",
+            stdout=StringIO()
+        )
+        deliveries: dict[int, TelegramDelivery] = {
+            delivery.message_id: delivery
+            for delivery in TelegramDelivery.objects.all()
+        }
+        self.assertEqual(
+            [deliveries[message.pk].status for message in messages],
+            [
+                TelegramDelivery.STATUS_SENT,
+                TelegramDelivery.STATUS_PENDING,
+                TelegramDelivery.STATUS_SENT,
+            ]
+        )
+        failed: TelegramDelivery = deliveries[messages[1].pk]
+        self.assertEqual(failed.attempts, 1)
+        self.assertEqual(failed.last_error, "network is down")
+        registry.close.assert_called_once()
@@ -1,16 +1,130 @@
 # Python
-from typing import Any
-
-# Django
-from asgiref.sync import async_to_sync
+from typing import (
+    Any,
+    Optional,
+    Coroutine,
+)
+from asyncio import (
+    AbstractEventLoop,
+    get_running_loop,
+    new_event_loop,
+    run_coroutine_threadsafe,
+    wrap_future,
+    Lock,
+)
+from concurrent.futures import Future
+from threading import (
+    Thread,
+    Lock as ThreadLock,
+)
+from weakref import WeakKeyDictionary
 
 # Third party
 import telegram
+from telegram.request import HTTPXRequest
 from django.conf import settings
 
 
-@async_to_sync
-async def send_telegram_bot_message(
+class TelegramBotRegistry:
+    """Process-wide registry of initialized telegram bots.
+
+    Keeps one bot per token per event loop, so every bot reuses
+    its keep-alive connections instead of opening new ones.
+    Synchronous code sends through the registry's own background loop.
+    """
+
+    def __init__(self) -> None:
+        self._bots: WeakKeyDictionary[
+            AbstractEventLoop, dict[str, telegram.Bot]
+        ] = WeakKeyDictionary()
+        self._locks: WeakKeyDictionary[
+            AbstractEventLoop, Lock
+        ] = WeakKeyDictionary()
+        self._loop: Optional[AbstractEventLoop] = None
+        self._loop_lock: ThreadLock = ThreadLock()
+
+    def create_bot(self, token: str) -> telegram.Bot:
+        """Create bot with a bounded connection pool."""
+        return telegram.Bot(
+            token=token,
+            base_url=settings.TELEGRAM_BOT_CONF["BASE_URL"],
+            request=HTTPXRequest(
+                connection_pool_size=settings.TELEGRAM_BOT_CONF["POOL_SIZE"]
+            )
+        )
+
+    async def get_bot(self, token: Optional[str] = None) -> telegram.Bot:
+        """Get initialized bot of the running event loop."""
+        token = token or settings.BOT_TOKEN
+        loop: AbstractEventLoop = get_running_loop()
+        bots: dict[str, telegram.Bot] = self._bots.setdefault(loop, {})
+        bot: Optional[telegram.Bot] = bots.get(token)
+        if bot:
+            return bot
+
+        async with self._locks.setdefault(loop, Lock()):
+            if token not in bots:
+                bot = self.create_bot(token=token)
+                await bot.initialize()
+                bots[token] = bot
+        return bots[token]
+
+    async def shutdown_loop_bots(self) -> None:
+        """Shutdown bots of the running event loop."""
+        bots: dict[str, telegram.Bot] = self._bots.pop(
+            get_running_loop(),
+            {}
+        )
+        bot: telegram.Bot
+        for bot in bots.values():
+            await bot.shutdown()
+
+    async def shutdown(self) -> None:
+        """Shutdown all bots including the background loop ones."""
+        await self.shutdown_loop_bots()
+        with self._loop_lock:
+            loop: Optional[AbstractEventLoop] = self._loop
+            self._loop = None
+        if loop:
+            await wrap_future(
+                run_coroutine_threadsafe(self.shutdown_loop_bots(), loop)
+            )
+            loop.call_soon_threadsafe(loop.stop)
+
+    def close(self) -> None:
+        """Shutdown background loop bots from synchronous code."""
+        with self._loop_lock:
+            loop: Optional[AbstractEventLoop] = self._loop
+            self._loop = None
+        if loop:
+            run_coroutine_threadsafe(self.shutdown_loop_bots(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+    def get_loop(self) -> AbstractEventLoop:
+        """Get background event loop for synchronous callers."""
+        with self._loop_lock:
+            if not self._loop:
+                self._loop = new_event_loop()
+                Thread(
+                    target=self._loop.run_forever,
+                    name="telegram-bot-loop",
+                    daemon=True
+                ).start()
+            return self._loop
+
+    def submit(self, coroutine: Coroutine) -> Future:
+        """Schedule coroutine in the background loop."""
+        return run_coroutine_threadsafe(coroutine, self.get_loop())
+
+    def run(self, coroutine: Coroutine) -> Any:
+        """Run coroutine in the background loop and wait for result."""
+        return self.submit(coroutine).result()
+
+
+bot_registry: TelegramBotRegistry = TelegramBotRegistry()
+
+
+async def asend_telegram_bot_message(
     msg_content: str,
     chat_id: int,
     user_first_name: str,
@@ -18,6 +132,23 @@ async def send_telegram_bot_message(
     **kwargs: dict[Any, Any]
 ) -> None:
     """Send message to user via telegram bot."""
-    bot: telegram.Bot = telegram.Bot(token=settings.BOT_TOKEN)
+    bot: telegram.Bot = await bot_registry.get_bot()
     msg: str = f"{user_first_name}, я получил от тебя сообщение:\n{msg_content}"  # noqa
     await bot.send_message(chat_id=chat_id, text=msg)
+
+
+def send_telegram_bot_message(
+    msg_content: str,
+    chat_id: int,
+    user_first_name: str,
+    *args: tuple[Any],
+    **kwargs: dict[Any, Any]
+) -> None:
+    """Send message to user via telegram bot from synchronous code."""
+    bot_registry.run(
+        asend_telegram_bot_message(
+            msg_content=msg_content,
+            chat_id=chat_id,
+            user_first_name=user_first_name
+        )
+    )
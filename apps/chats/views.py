@@ -1,7 +1,11 @@
 # Python
-from typing import Any
+from typing import (
+    Any,
+    Optional,
+)
 
 # Django
+from django.conf import settings
 from django.db.models import QuerySet
 
 # Rest Framework
@@ -12,15 +16,24 @@ from rest_framework.permissions import (
     IsAuthenticated,
 )
 from rest_framework.decorators import action
-from rest_framework.status import HTTP_400_BAD_REQUEST
+from rest_framework.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+)
 
 # Project
 from abstracts.handlers import DRFResponseHandler
 from abstracts.mixins import ModelInstanceMixin
+from abstracts.paginators import (
+    KeysetCursorPagination,
+    SearchRankCursorPagination,
+)
+from abstracts.utils import cast_to_int
 from chats.models import Message
 from chats.serializers import (
     MessageCreateSerializer,
     MessageDetailSerializer,
+    MessageForeignKeySerializer,
 )
 from auths.permission import (
     IsConnectedTelegram,
@@ -32,16 +45,59 @@ class MessageViewSet(ModelInstanceMixin, DRFResponseHandler, ViewSet):
     """CustomUserViewSet."""
 
     queryset: Any = Message.objects
-    permission_classes: tuple[Any] = (IsAuthenticated,)
+    permission_classes: tuple[Any] = (IsAuthenticated, IsNonDeletedUser,)
     serializer_class: MessageDetailSerializer = MessageDetailSerializer
+    select_related_fields: tuple[str] = ("owner",)
 
     def get_queryset(
         self,
         is_deleted: bool = False
     ) -> QuerySet[Message]:
-        """Get deleted/non-deleted queryset with CustomUser instances."""
-        return self.queryset.get_deleted() if is_deleted \
-            else self.queryset.get_not_deleted()
+        """Get deleted/non-deleted queryset with Message instances."""
+        queryset: QuerySet[Message] = self.queryset.get_deleted() \
+            if is_deleted else self.queryset.get_not_deleted()
+        return queryset.select_related(*self.select_related_fields)
+
+    def list(
+        self,
+        request: DRF_Request,
+        *args: tuple[Any],
+        **kwargs: dict[Any, Any]
+    ) -> DRF_Response:
+        """Handle GET-request to obtain user messages with their owner."""
+        return self.get_drf_response(
+            request=request,
+            data=self.get_queryset().filter(owner=request.user),
+            serializer_class=self.serializer_class,
+            many=True,
+            paginator=KeysetCursorPagination()
+        )
+
+    def retrieve(
+        self,
+        request: DRF_Request,
+        pk: Optional[str] = None,
+        *args: tuple[Any],
+        **kwargs: dict[Any, Any]
+    ) -> DRF_Response:
+        """Handle GET-request to obtain user message with its owner."""
+        message: Optional[Message] = self.get_queryset_instance_by_id(
+            class_name=Message,
+            queryset=self.get_queryset().filter(owner=request.user),
+            pk=cast_to_int(value=pk)
+        )
+        if not message:
+            return DRF_Response(
+                data={
+                    "detail": f"Сообщение с id {pk} не найдено"
+                },
+                status=HTTP_404_NOT_FOUND
+            )
+        return self.get_drf_response(
+            request=request,
+            data=message,
+            serializer_class=self.serializer_class
+        )
 
     @action(
         methods=["POST"],
@@ -77,3 +133,90 @@ class MessageViewSet(ModelInstanceMixin, DRFResponseHandler, ViewSet):
             data=serializer.errors,
             status=HTTP_400_BAD_REQUEST
         )
+
+    @action(
+        methods=["POST"],
+        url_path="upload_messages",
+        url_name="upload_messages",
+        detail=False,
+        permission_classes=(
+            IsAuthenticated,
+            IsNonDeletedUser,
+            IsConnectedTelegram,
+        )
+    )
+    def upload_messages(
+        self,
+        request: DRF_Request,
+        *args: tuple[Any],
+        **kwargs: dict[Any, Any]
+    ) -> DRF_Response:
+        """Handle POST-request to upload the list of messages."""
+        max_batch_size: int = settings.MESSAGES_UPLOAD_MAX_BATCH_SIZE
+        if not isinstance(request.data, list) or \
+                len(request.data) > max_batch_size:
+            return DRF_Response(
+                data={
+                    "detail": "Ожидается список не более чем "
+                    f"из {max_batch_size} сообщений"
+                },
+                status=HTTP_400_BAD_REQUEST
+            )
+        serializer: MessageCreateSerializer = MessageCreateSerializer(
+            data=request.data,
+            many=True,
+            context={"request": request}
+        )
+        valid: bool = serializer.is_valid()
+        if valid:
+            new_messages: list[Message] = Message.objects.bulk_upload(
+                messages=[
+                    Message(**validated_data)
+                    for validated_data in serializer.validated_data
+                ]
+            )
+            return self.get_drf_response(
+                request=request,
+                data=new_messages,
+                serializer_class=MessageForeignKeySerializer,
+                many=True
+            )
+        return DRF_Response(
+            data=serializer.errors,
+            status=HTTP_400_BAD_REQUEST
+        )
+
+    @action(
+        methods=["GET"],
+        url_path="search",
+        url_name="search",
+        detail=False,
+        permission_classes=(IsAuthenticated, IsNonDeletedUser,)
+    )
+    def search_messages(
+        self,
+        request: DRF_Request,
+        *args: tuple[Any],
+        **kwargs: dict[Any, Any]
+    ) -> DRF_Response:
+        """Handle GET-request to search user messages by words."""
+        max_length: int = settings.MESSAGES_SEARCH_MAX_QUERY_LENGTH
+        text: str = request.query_params.get("q", "").strip()
+        if not text or len(text) > max_length:
+            return DRF_Response(
+                data={
+                    "detail": "Ожидается строка поиска q не длиннее "
+                    f"{max_length} символов"
+                },
+                status=HTTP_400_BAD_REQUEST
+            )
+        messages: QuerySet = request.user.messages.get_not_deleted()
+        return self.get_drf_response(
+            request=request,
+            data=messages.search(text=text),
+            serializer_class=MessageForeignKeySerializer,
+            many=True,
+            paginator=SearchRankCursorPagination(
+                ordering=messages.get_search_ordering()
+            )
+        )
@@ -0,0 +1,126 @@
+"""Compare sync DRF views and async views served by the ASGI handler.
+
+Usage: python -m benchmarks.async_views --requests 2000 --concurrency 100
+"""
+# Python
+from typing import Any
+from argparse import ArgumentParser
+from time import perf_counter
+import asyncio
+
+# Third party
+import httpx
+
+# Project
+from benchmarks.utils import (
+    setup_django,
+    setup_test_database,
+    create_user,
+    latency_summary,
+    Timer,
+    print_report,
+)
+
+ENDPOINTS: dict[str, tuple[str, str]] = {
+    "get_token": (
+        "/api/v1/auths/users/get_token",
+        "/api/v1/async/auths/users/get_token",
+    ),
+    "get_user_messages": (
+        "/api/v1/auths/users/messages",
+        "/api/v1/async/auths/users/messages",
+    ),
+}
+
+
+async def measure(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict[str, str],
+    requests: int,
+    concurrency: int
+) -> dict[str, Any]:
+    latencies: list[float] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker() -> None:
+        while not queue.empty():
+            queue.get_nowait()
+            started: float = perf_counter()
+            response: httpx.Response = await client.get(url, headers=headers)
+            latencies.append(perf_counter() - started)
+            assert response.status_code == 200, response.text
+
+    with Timer() as timer:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {
+        "url": url,
+        "requests": requests,
+        "concurrency": concurrency,
+        "rps": round(requests / timer.elapsed, 1),
+        **latency_summary(latencies=latencies),
+    }
+
+
+def seed(messages: int) -> dict[str, str]:
+    """Create user with messages and get its auth headers."""
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from chats.models import Message
+
+    user: Any = create_user(login="bench", telegram_id=1)
+    Message.objects.bulk_upload(
+        messages=[
+            Message(text=f"message {index}", owner=user)
+            for index in range(messages)
+        ]
+    )
+    return {
+        "Authorization": "JWT "
+        f"{RefreshToken.for_user(user=user).access_token}"
+    }
+
+
+async def main(
+    headers: dict[str, str],
+    requests: int,
+    concurrency: int
+) -> None:
+    from django.core.asgi import get_asgi_application
+
+    results: list[dict[str, Any]] = []
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=get_asgi_application()),
+        base_url="http://localhost"
+    ) as client:
+        name: str
+        urls: tuple[str, str]
+        for name, urls in ENDPOINTS.items():
+            for kind, url in zip(("sync", "async"), urls):
+                result: dict[str, Any] = await measure(
+                    client=client,
+                    url=url,
+                    headers=headers,
+                    requests=requests,
+                    concurrency=concurrency
+                )
+                results.append({"endpoint": name, "view": kind, **result})
+    print_report(name="async_views", results=results)
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=100)
+    args = parser.parse_args()
+    setup_django()
+    setup_test_database()
+    asyncio.run(
+        main(
+            headers=seed(messages=args.messages),
+            requests=args.requests,
+            concurrency=args.concurrency
+        )
+    )
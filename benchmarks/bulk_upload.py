@@ -0,0 +1,77 @@
+"""Compare single and bulk message upload throughput.
+
+Usage: python -m benchmarks.bulk_upload --messages 1000
+"""
+# Python
+from typing import Any
+from argparse import ArgumentParser
+
+# Project
+from benchmarks.utils import (
+    setup_django,
+    setup_test_database,
+    create_user,
+    get_api_client,
+    Timer,
+    print_report,
+)
+
+SINGLE_URL: str = "/api/v1/chats/messages/upload_message"
+BULK_URL: str = "/api/v1/chats/messages/upload_messages"
+
+
+def measure(client: Any, messages: int, batch_size: int) -> dict[str, Any]:
+    with Timer() as timer:
+        for start in range(0, messages, batch_size):
+            size: int = min(batch_size, messages - start)
+            if batch_size == 1:
+                response = client.post(
+                    SINGLE_URL,
+                    data={"text": f"message {start}"},
+                    format="json"
+                )
+            else:
+                response = client.post(
+                    BULK_URL,
+                    data=[
+                        {"text": f"message {start + index}"}
+                        for index in range(size)
+                    ],
+                    format="json"
+                )
+            assert response.status_code == 200, response.content
+    return {
+        "batch_size": batch_size,
+        "messages": messages,
+        "requests": -(-messages // batch_size),
+        "seconds": round(timer.elapsed, 3),
+        "messages_per_second": round(messages / timer.elapsed, 1),
+    }
+
+
+def main(messages: int, batch_sizes: list[int]) -> None:
+    setup_test_database()
+    client: Any = get_api_client(
+        user=create_user(login="bench", telegram_id=1)
+    )
+    print_report(
+        name="bulk_upload",
+        results=[
+            measure(client=client, messages=messages, batch_size=batch_size)
+            for batch_size in batch_sizes
+        ]
+    )
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100, 1000]
+    )
+    args = parser.parse_args()
+    setup_django()
+    main(messages=args.messages, batch_sizes=args.batch_sizes)
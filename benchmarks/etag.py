@@ -0,0 +1,84 @@
+"""Compare conditional GET answered with 304 and the full response.
+
+Usage: python -m benchmarks.etag --messages 10000 --page-size 1000
+"""
+# Python
+from typing import Any
+from argparse import ArgumentParser
+
+# Project
+from benchmarks.utils import (
+    setup_django,
+    setup_test_database,
+    create_user,
+    get_api_client,
+    Timer,
+    print_report,
+)
+
+
+def measure(
+    client: Any,
+    url: str,
+    requests: int,
+    headers: dict[str, str],
+    expected_status: int
+) -> dict[str, Any]:
+    size: int = 0
+    with Timer() as timer:
+        for _ in range(requests):
+            response = client.get(url, **headers)
+            assert response.status_code == expected_status
+            size = len(response.content)
+    return {
+        "status": expected_status,
+        "requests": requests,
+        "ms_per_request": round(timer.elapsed / requests * 1000, 3),
+        "response_bytes": size,
+    }
+
+
+def main(messages: int, page_size: int, requests: int) -> None:
+    from chats.models import Message
+
+    setup_test_database()
+    user: Any = create_user(login="bench", telegram_id=1)
+    Message.objects.bulk_upload(
+        messages=[
+            Message(text=f"message {index}", owner=user)
+            for index in range(messages)
+        ],
+        batch_size=1000
+    )
+    client: Any = get_api_client(user=user)
+    url: str = f"/api/v1/auths/users/messages?page_size={page_size}"
+    etag: str = client.get(url)["ETag"]
+    print_report(
+        name="etag",
+        results={
+            "messages": messages,
+            "page_size": page_size,
+            "full": measure(client, url, requests, {}, 200),
+            "not_modified": measure(
+                client,
+                url,
+                requests,
+                {"HTTP_IF_NONE_MATCH": etag},
+                304
+            ),
+        }
+    )
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+    setup_django()
+    main(
+        messages=args.messages,
+        page_size=args.page_size,
+        requests=args.requests
+    )
@@ -0,0 +1,410 @@
+"""Load test of the messaging API running as a separate server process.
+
+Starts the project with settings.env.bench against SQLite or a local
+PostgreSQL (BENCH_DATABASE=postgresql, BENCH_DB_NAME and DB_* variables)
+and a stub Telegram server, seeds users and messages and drives the main
+endpoints at the given concurrency.
+
+Usage: python -m benchmarks.loadtest --users 100 --messages 10000 \
+    --requests 2000 --concurrency 32 --server wsgi --output result.json
+"""
+# Python
+from typing import (
+    Any,
+    Callable,
+)
+from argparse import ArgumentParser
+from tempfile import mkdtemp
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+
+# Third party
+from aiohttp import (
+    ClientError,
+    ClientSession,
+    TCPConnector,
+)
+
+# Project
+from benchmarks.utils import (
+    BASE_DIR,
+    setup_django,
+    FakeTelegramServer,
+    Timer,
+    latency_summary,
+    print_report,
+)
+
+PASSWORD: str = "bench-password"
+ENDPOINTS: tuple[str] = (
+    "register_user",
+    "login_user",
+    "upload_message",
+    "get_user_messages",
+    "get_token",
+)
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get_git_revision() -> dict[str, Any]:
+    """Get commit of the measured tree to compare results across commits."""
+    def run_git(*args: str) -> str:
+        return subprocess.run(
+            ("git", *args),
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True
+        ).stdout.strip()
+
+    return {
+        "commit": run_git("rev-parse", "HEAD"),
+        "dirty": bool(run_git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def prepare_database(users: int, messages: int) -> list[str]:
+    """Migrate clean database, seed it and get access tokens of users."""
+    from django.core.management import call_command
+    from django.contrib.auth.hashers import make_password
+    from django.db import connections
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from auths.models import CustomUser
+    from chats.models import Message
+
+    call_command("migrate", verbosity=0)
+    call_command("flush", interactive=False, verbosity=0)
+    if connections["default"].vendor == "sqlite":
+        # Server and delivery worker write concurrently.
+        with connections["default"].cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode=WAL")
+
+    password: str = make_password(PASSWORD)
+    CustomUser.objects.bulk_create(
+        [
+            CustomUser(
+                login=f"user{index}",
+                first_name=f"user{index}",
+                password=password,
+                telegram_id=index + 1
+            )
+            for index in range(users)
+        ],
+        batch_size=1000
+    )
+    seeded_users: list[CustomUser] = list(CustomUser.objects.order_by("id"))
+    Message.objects.bulk_create(
+        (
+            Message(
+                text=f"Сообщение {index}",
+                owner=seeded_users[index % users]
+            )
+            for index in range(messages)
+        ),
+        batch_size=1000
+    )
+    tokens: list[str] = [
+        str(RefreshToken.for_user(user=user).access_token)
+        for user in seeded_users
+    ]
+    connections.close_all()
+    return tokens
+
+
+def get_server_command(server: str, port: int) -> list[str]:
+    if server == "asgi":
+        return [
+            sys.executable, "-m", "daphne",
+            "-b", "127.0.0.1",
+            "-p", str(port),
+            "deploy.test.asgi:application",
+        ]
+    return [
+        sys.executable, "manage/local.py", "runserver",
+        "--noreload",
+        f"127.0.0.1:{port}",
+    ]
+
+
+async def wait_for_server(base_url: str, timeout: float = 30) -> None:
+    deadline: float = asyncio.get_running_loop().time() + timeout
+    async with ClientSession() as session:
+        while True:
+            try:
+                async with session.get(
+                    f"{base_url}/api/v1/auths/users/get_token"
+                ):
+                    return
+            except ClientError:
+                if asyncio.get_running_loop().time() > deadline:
+                    raise RuntimeError("Server did not start in time")
+                await asyncio.sleep(0.2)
+
+
+def get_request_factory(
+    endpoint: str,
+    base_url: str,
+    tokens: list[str]
+) -> Callable[[int], tuple[str, str, dict[str, Any]]]:
+    """Get function building method, url and kwargs of the n-th request."""
+    users_url: str = f"{base_url}/api/v1/auths/users"
+    messages_url: str = f"{base_url}/api/v1/chats/messages"
+
+    def get_headers(index: int) -> dict[str, str]:
+        return {"Authorization": f"JWT {tokens[index % len(tokens)]}"}
+
+    factories: dict[str, Callable] = {
+        "register_user": lambda index: (
+            "POST",
+            f"{users_url}/register_user",
+            {
+                "json": {
+                    "login": f"new{os.getpid()}_{index}",
+                    "first_name": "new",
+                    "password": PASSWORD,
+                }
+            },
+        ),
+        "login_user": lambda index: (
+            "POST",
+            f"{users_url}/login_user",
+            {
+                "json": {
+                    "login": f"user{index % len(tokens)}",
+                    "password": PASSWORD,
+                }
+            },
+        ),
+        "upload_message": lambda index: (
+            "POST",
+            f"{messages_url}/upload_message",
+            {
+                "json": {"text": f"Нагрузочное сообщение {index}"},
+                "headers": get_headers(index),
+            },
+        ),
+        "get_user_messages": lambda index: (
+            "GET",
+            f"{users_url}/messages",
+            {"headers": get_headers(index)},
+        ),
+        "get_token": lambda index: (
+            "GET",
+            f"{users_url}/get_token",
+            {"headers": get_headers(index)},
+        ),
+    }
+    return factories[endpoint]
+
+
+async def drive(
+    session: ClientSession,
+    build_request: Callable[[int], tuple[str, str, dict[str, Any]]],
+    requests: int,
+    concurrency: int,
+    start: int = 0
+) -> dict[str, Any]:
+    """Send requests by concurrent workers and summarize latencies."""
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    next_index: list[int] = [start]
+
+    async def worker() -> None:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        while next_index[0] < start + requests:
+            index: int = next_index[0]
+            next_index[0] += 1
+            method, url, kwargs = build_request(index)
+            started: float = loop.time()
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    await response.read()
+                    status: str = str(response.status)
+            except ClientError as exc:
+                status = type(exc).__name__
+            latencies.append(loop.time() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    with Timer() as timer:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {
+        "requests": requests,
+        "errors": sum(
+            count for status, count in statuses.items()
+            if not status.startswith("2")
+        ),
+        "statuses": statuses,
+        "rps": round(requests / timer.elapsed, 1),
+        **latency_summary(latencies),
+    }
+
+
+async def run(
+    args: Any,
+    tokens: list[str],
+    env: dict[str, str],
+    log_path: str
+) -> list[dict[str, Any]]:
+    telegram: FakeTelegramServer = FakeTelegramServer()
+    await telegram.start()
+    env["TELEGRAM_BASE_URL"] = telegram.base_url
+
+    port: int = args.port or get_free_port()
+    base_url: str = f"http://127.0.0.1:{port}"
+    processes: list[asyncio.subprocess.Process] = []
+    results: list[dict[str, Any]] = []
+    with open(log_path, "wb") as log:
+        try:
+            processes.append(
+                await asyncio.create_subprocess_exec(
+                    *get_server_command(server=args.server, port=port),
+                    cwd=BASE_DIR,
+                    env=env,
+                    stdout=log,
+                    stderr=log
+                )
+            )
+            if args.deliver:
+                processes.append(
+                    await asyncio.create_subprocess_exec(
+                        sys.executable, "manage/local.py",
+                        "deliver_telegram_messages",
+                        cwd=BASE_DIR,
+                        env=env,
+                        stdout=log,
+                        stderr=log
+                    )
+                )
+            await wait_for_server(base_url=base_url)
+
+            async with ClientSession(
+                connector=TCPConnector(limit=args.concurrency)
+            ) as session:
+                endpoint: str
+                for endpoint in args.endpoints:
+                    build_request: Callable = get_request_factory(
+                        endpoint=endpoint,
+                        base_url=base_url,
+                        tokens=tokens
+                    )
+                    await drive(
+                        session=session,
+                        build_request=build_request,
+                        requests=min(args.warmup, args.requests),
+                        concurrency=args.concurrency,
+                        start=args.requests
+                    )
+                    results.append(
+                        {
+                            "endpoint": endpoint,
+                            **await drive(
+                                session=session,
+                                build_request=build_request,
+                                requests=args.requests,
+                                concurrency=args.concurrency
+                            ),
+                        }
+                    )
+        finally:
+            # Processes which exited before the end have crashed.
+            crashed: list[int] = [
+                process.returncode for process in processes
+                if process.returncode is not None
+            ]
+            process: asyncio.subprocess.Process
+            for process in processes:
+                if process.returncode is None:
+                    process.terminate()
+                    await process.wait()
+            await telegram.stop()
+    results.append(
+        {
+            "endpoint": "telegram_stub",
+            "requests": telegram.requests_count,
+            "crashed_processes": crashed,
+        }
+    )
+    return results
+
+
+def main(args: Any) -> None:
+    workdir: str = mkdtemp(prefix="messaging_loadtest_")
+    os.environ["DJANGO_SETTINGS_MODULE"] = "settings.env.bench"
+    os.environ["BENCH_DATABASE"] = args.database
+    os.environ.setdefault(
+        "BENCH_SQLITE_NAME",
+        os.path.join(workdir, "bench.sqlite3")
+    )
+    os.environ.setdefault("METRICS_ENABLED", "False")
+    setup_django(settings_module="settings.env.bench")
+
+    tokens: list[str] = prepare_database(
+        users=args.users,
+        messages=args.messages
+    )
+    log_path: str = os.path.join(workdir, "server.log")
+    results: list[dict[str, Any]] = asyncio.run(
+        run(args=args, tokens=tokens, env=dict(os.environ), log_path=log_path)
+    )
+    report: dict[str, Any] = {
+        "revision": get_git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": args.database,
+            "server": args.server,
+        },
+        "parameters": {
+            "users": args.users,
+            "messages": args.messages,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "deliver": args.deliver,
+        },
+        "server_log": log_path,
+        "endpoints": results,
+    }
+    print_report(name="loadtest", results=report)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument(
+        "--database",
+        choices=("sqlite", "postgresql"),
+        default="sqlite"
+    )
+    parser.add_argument("--server", choices=("wsgi", "asgi"), default="wsgi")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--endpoints",
+        nargs="+",
+        choices=ENDPOINTS,
+        default=list(ENDPOINTS)
+    )
+    parser.add_argument(
+        "--deliver",
+        action="store_true",
+        help="Run telegram delivery worker against the stub server, "
+        "SQLite lock contention may stop it, so prefer PostgreSQL"
+    )
+    parser.add_argument("--output", default=None)
+    main(args=parser.parse_args())
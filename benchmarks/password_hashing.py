@@ -0,0 +1,68 @@
+"""Measure login password checks per second on one core for each policy.
+
+Usage: python -m benchmarks.password_hashing --seconds 3
+"""
+# Python
+from argparse import ArgumentParser
+from time import perf_counter
+
+# Project
+from benchmarks.utils import (
+    setup_django,
+    print_report,
+)
+
+POLICIES: tuple[tuple[str, dict[str, int]]] = (
+    ("pbkdf2", {"PBKDF2_ITERATIONS": 600000}),
+    ("pbkdf2", {"PBKDF2_ITERATIONS": 260000}),
+    ("scrypt", {"SCRYPT_WORK_FACTOR": 2 ** 14}),
+    ("scrypt", {"SCRYPT_WORK_FACTOR": 2 ** 15}),
+    ("argon2", {"ARGON2_TIME_COST": 2, "ARGON2_MEMORY_COST": 19456}),
+    ("argon2", {"ARGON2_TIME_COST": 3, "ARGON2_MEMORY_COST": 12288}),
+    ("argon2", {"ARGON2_TIME_COST": 2, "ARGON2_MEMORY_COST": 102400}),
+)
+
+
+def measure(policy: str, conf: dict[str, int], seconds: float) -> dict:
+    from django.conf import settings
+    from django.contrib.auth.hashers import (
+        check_password,
+        make_password,
+    )
+    from django.test import override_settings
+
+    with override_settings(
+        PASSWORD_HASHERS=[settings.PASSWORD_HASHERS_BY_POLICY[policy]],
+        PASSWORD_HASHING_CONF={**settings.PASSWORD_HASHING_CONF, **conf}
+    ):
+        encoded: str = make_password("password")
+        checks: int = 0
+        started: float = perf_counter()
+        while not checks or perf_counter() - started < seconds:
+            assert check_password("password", encoded)
+            checks += 1
+        elapsed: float = perf_counter() - started
+    return {
+        "policy": policy,
+        **conf,
+        "check_ms": round(elapsed / checks * 1000, 2),
+        "logins_per_second_per_core": round(checks / elapsed, 1),
+    }
+
+
+def main(seconds: float) -> None:
+    print_report(
+        name="password_hashing",
+        results=[
+            measure(policy=policy, conf=conf, seconds=seconds)
+            for policy, conf in POLICIES
+        ]
+    )
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+    setup_django()
+    main(seconds=args.seconds)
@@ -0,0 +1,116 @@
+"""Compare JSON renderers and compression of message list payloads.
+
+Usage: python -m benchmarks.renderers --messages 1000 10000
+"""
+# Python
+from typing import (
+    Any,
+    Callable,
+)
+from argparse import ArgumentParser
+import gzip
+
+# Third party
+import brotli
+
+# Project
+from benchmarks.utils import (
+    setup_django,
+    setup_test_database,
+    create_user,
+    Timer,
+    print_report,
+)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> tuple[Any, float]:
+    """Get result of func and its mean time in milliseconds."""
+    with Timer() as timer:
+        for _ in range(repeat):
+            result: Any = func()
+    return result, round(timer.elapsed / repeat * 1000, 3)
+
+
+def main(messages: list[int], repeat: int) -> None:
+    from django.conf import settings
+    from rest_framework.renderers import JSONRenderer
+
+    from abstracts.renderers import ORJSONRenderer
+    from chats.models import Message
+    from chats.serializers import MessageForeignKeySerializer
+
+    setup_test_database()
+    owner: Any = create_user(login="bench")
+    Message.objects.bulk_create(
+        [
+            Message(
+                text=f"Сообщение {index} с текстом средней длины",
+                owner=owner
+            )
+            for index in range(max(messages))
+        ],
+        batch_size=1000
+    )
+    conf: dict[str, Any] = settings.RESPONSE_COMPRESSION_CONF
+    results: list[dict[str, Any]] = []
+    count: int
+    for count in messages:
+        data: dict[str, Any] = {
+            "data": MessageForeignKeySerializer.get_fast_representation(
+                rows=Message.objects.order_by("-id")[:count].values(
+                    *MessageForeignKeySerializer.get_fast_value_fields()
+                )
+            ),
+            "next": None,
+        }
+        content: bytes
+        drf_ms: float
+        orjson_ms: float
+        content, drf_ms = measure(
+            func=lambda: JSONRenderer().render(data),
+            repeat=repeat
+        )
+        _, orjson_ms = measure(
+            func=lambda: ORJSONRenderer().render(data),
+            repeat=repeat
+        )
+        gzipped, gzip_ms = measure(
+            func=lambda: gzip.compress(content, compresslevel=6),
+            repeat=repeat
+        )
+        brotlied, brotli_ms = measure(
+            func=lambda: brotli.compress(
+                content,
+                quality=conf["BROTLI_QUALITY"]
+            ),
+            repeat=repeat
+        )
+        results.append(
+            {
+                "messages": count,
+                "drf_json_ms": drf_ms,
+                "orjson_ms": orjson_ms,
+                "encode_speedup": round(drf_ms / orjson_ms, 2),
+                "identical": content == ORJSONRenderer().render(data),
+                "bytes": len(content),
+                "gzip_bytes": len(gzipped),
+                "gzip_ms": gzip_ms,
+                "brotli_bytes": len(brotlied),
+                "brotli_ms": brotli_ms,
+            }
+        )
+    print_report(name="renderers", results=results)
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument(
+        "--messages",
+        type=int,
+        nargs="+",
+        default=[1000, 10000]
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    setup_django()
+    main(messages=args.messages, repeat=args.repeat)
@@ -0,0 +1,128 @@
+"""Latency of the full-text message search endpoint.
+
+Messages of random words are spread over --owners users and the first
+and the next page of results of one owner are requested. Runs against
+the default database of --settings, use settings.env.bench with
+BENCH_DATABASE=postgresql to measure the GIN index.
+
+Usage: python -m benchmarks.search --rows 1000000 10000000
+"""
+# Python
+from typing import Any
+from argparse import ArgumentParser
+from time import perf_counter
+import random
+
+# Project
+from benchmarks.utils import (
+    setup_django,
+    setup_test_database,
+    create_user,
+    get_api_client,
+    latency_summary,
+    print_report,
+)
+
+COMMON_WORDS: tuple[str] = tuple(
+    f"{prefix}{suffix}"
+    for prefix in ("deploy", "build", "release", "review", "сборка", "релиз")
+    for suffix in ("", "ed", "s", "er", "ing", "ы", "а")
+)
+RARE_WORDS: tuple[str] = tuple(f"word{index}" for index in range(5000))
+QUERIES: tuple[str] = ("deploy", "release build", "word42", "word42 word43")
+BATCH_SIZE: int = 10000
+
+
+def seed(owners: list[Any], start: int, end: int) -> None:
+    """Create messages [start, end) bypassing signals of bulk_upload."""
+    from chats.models import Message
+
+    generator: random.Random = random.Random(start)
+    index: int
+    for index in range(start, end, BATCH_SIZE):
+        Message.objects.bulk_create(
+            [
+                Message(
+                    text=" ".join(
+                        generator.choices(COMMON_WORDS, k=3) +
+                        generator.choices(RARE_WORDS, k=9)
+                    ),
+                    owner=owners[number % len(owners)]
+                )
+                for number in range(index, min(index + BATCH_SIZE, end))
+            ],
+            batch_size=BATCH_SIZE
+        )
+
+
+def measure(client: Any, query: str, repeat: int) -> dict[str, Any]:
+    latencies: list[float] = []
+    next_latencies: list[float] = []
+    found: int = 0
+    for _ in range(repeat):
+        started: float = perf_counter()
+        data: dict = client.get(
+            "/api/v1/chats/messages/search",
+            {"q": query}
+        ).json()
+        latencies.append(perf_counter() - started)
+        found = len(data["data"])
+        if data["next"]:
+            started = perf_counter()
+            client.get(data["next"])
+            next_latencies.append(perf_counter() - started)
+    return {
+        "query": query,
+        "page_rows": found,
+        "first_page": latency_summary(latencies),
+        "next_page": latency_summary(next_latencies)
+        if next_latencies else None,
+    }
+
+
+def main(rows: list[int], owners_count: int, repeat: int) -> None:
+    from django.db import connection
+
+    setup_test_database()
+    owners: list[Any] = [
+        create_user(login=f"owner{index}")
+        for index in range(owners_count)
+    ]
+    client: Any = get_api_client(user=owners[0])
+    results: list[dict[str, Any]] = []
+    seeded: int = 0
+    count: int
+    for count in sorted(rows):
+        started: float = perf_counter()
+        seed(owners=owners, start=seeded, end=count)
+        seeded = count
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        query: str
+        for query in QUERIES:
+            results.append(
+                {
+                    "database": connection.vendor,
+                    "rows": count,
+                    "owner_rows": count // owners_count,
+                    "seed_seconds": round(perf_counter() - started, 1),
+                    **measure(client=client, query=query, repeat=repeat),
+                }
+            )
+    print_report(name="search", results=results)
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[1000000, 10000000]
+    )
+    parser.add_argument("--owners", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--settings", default="settings.env.local")
+    args = parser.parse_args()
+    setup_django(settings_module=args.settings)
+    main(rows=args.rows, owners_count=args.owners, repeat=args.repeat)
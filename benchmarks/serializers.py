@@ -0,0 +1,93 @@
+"""Compare DRF serializers with their fast values() path.
+
+Usage: python -m benchmarks.serializers --rows 100 1000 10000
+"""
+# Python
+from typing import Any
+from argparse import ArgumentParser
+
+# Project
+from benchmarks.utils import (
+    setup_django,
+    setup_test_database,
+    create_user,
+    Timer,
+    print_report,
+)
+
+
+def measure(serializer_class: Any, queryset: Any, repeat: int) -> dict:
+    with Timer() as drf_timer:
+        for _ in range(repeat):
+            serializer_class(list(queryset.all()), many=True).data
+    with Timer() as fast_timer:
+        for _ in range(repeat):
+            serializer_class.get_fast_representation(
+                rows=queryset.values(
+                    *serializer_class.get_fast_value_fields()
+                )
+            )
+    drf_ms: float = drf_timer.elapsed / repeat * 1000
+    fast_ms: float = fast_timer.elapsed / repeat * 1000
+    return {
+        "serializer": serializer_class.__name__,
+        "rows": queryset.count(),
+        "drf_ms": round(drf_ms, 3),
+        "fast_ms": round(fast_ms, 3),
+        "speedup": round(drf_ms / fast_ms, 2),
+    }
+
+
+def main(rows: list[int], repeat: int) -> None:
+    from auths.models import CustomUser
+    from auths.serializers import CustomUserListSerializer
+    from chats.models import Message
+    from chats.serializers import MessageForeignKeySerializer
+
+    setup_test_database()
+    owner: Any = create_user(login="bench", telegram_id=1)
+    Message.objects.bulk_upload(
+        messages=[
+            Message(text=f"message {index}", owner=owner)
+            for index in range(max(rows))
+        ],
+        batch_size=1000
+    )
+    CustomUser.objects.bulk_create(
+        [
+            CustomUser(login=f"user{index}", first_name="bench")
+            for index in range(max(rows))
+        ],
+        batch_size=1000
+    )
+    results: list[dict[str, Any]] = []
+    for count in rows:
+        results.append(
+            measure(
+                serializer_class=MessageForeignKeySerializer,
+                queryset=Message.objects.all()[:count],
+                repeat=repeat
+            )
+        )
+        results.append(
+            measure(
+                serializer_class=CustomUserListSerializer,
+                queryset=CustomUser.objects.all()[:count],
+                repeat=repeat
+            )
+        )
+    print_report(name="serializers", results=results)
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    setup_django()
+    main(rows=args.rows, repeat=args.repeat)
@@ -0,0 +1,105 @@
+"""Count database writes of register_user and login_user per profile.
+
+Usage: python -m benchmarks.session_writes --requests 200
+"""
+# Python
+from typing import Any
+from argparse import ArgumentParser
+
+# Project
+from benchmarks.utils import (
+    setup_django,
+    setup_test_database,
+    Timer,
+    print_report,
+)
+
+WRITE_STATEMENTS: tuple[str] = ("INSERT", "UPDATE", "DELETE")
+
+
+def get_profiles() -> dict[str, dict[str, Any]]:
+    from django.conf import settings
+
+    return {
+        "sessions": {
+            "MIDDLEWARE": settings.MIDDLEWARE,
+            "JWT_STATELESS_LOGIN": False,
+        },
+        "stateless_login": {
+            "MIDDLEWARE": settings.MIDDLEWARE,
+            "JWT_STATELESS_LOGIN": True,
+        },
+        "stateless_api": {
+            "MIDDLEWARE": [
+                settings.ADMIN_ONLY_MIDDLEWARE.get(middleware, middleware)
+                for middleware in settings.MIDDLEWARE
+            ],
+            "JWT_STATELESS_LOGIN": True,
+        },
+    }
+
+
+def measure(name: str, profile: dict[str, Any], requests: int) -> dict:
+    from django.conf import settings
+    from django.contrib.sessions.models import Session
+    from django.db import connection
+    from django.test import (
+        Client,
+        override_settings,
+    )
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    results: dict[str, Any] = {"profile": name}
+    with override_settings(
+        PASSWORD_HASHING_CONF={
+            **settings.PASSWORD_HASHING_CONF,
+            "PBKDF2_ITERATIONS": 1000,
+        },
+        **profile
+    ):
+        endpoint: str
+        for endpoint in ("user_registration", "login_user"):
+            sessions_before: int = Session.objects.count()
+            with CaptureQueriesContext(connection) as context, \
+                    Timer() as timer:
+                for index in range(requests):
+                    Client().post(
+                        reverse(f"customuser-{endpoint}"),
+                        data={
+                            "login": f"{name}{index}",
+                            "first_name": "bench",
+                            "password": "password",
+                        },
+                        content_type="application/json"
+                    )
+            writes: int = sum(
+                query["sql"].lstrip().upper().startswith(WRITE_STATEMENTS)
+                for query in context
+            )
+            results[endpoint] = {
+                "queries_per_request": round(len(context) / requests, 2),
+                "writes_per_request": round(writes / requests, 2),
+                "sessions_created": Session.objects.count() - sessions_before,
+                "ms_per_request": round(timer.elapsed / requests * 1000, 3),
+            }
+    return results
+
+
+def main(requests: int) -> None:
+    setup_test_database()
+    print_report(
+        name="session_writes",
+        results=[
+            measure(name=name, profile=profile, requests=requests)
+            for name, profile in get_profiles().items()
+        ]
+    )
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    setup_django()
+    main(requests=args.requests)
@@ -0,0 +1,101 @@
+"""Compare pooled telegram bot client with a bot created per message.
+
+Usage: python -m benchmarks.telegram_client --messages 500 --concurrency 20
+"""
+# Python
+from typing import Any
+from argparse import ArgumentParser
+import asyncio
+
+# Project
+from benchmarks.utils import (
+    setup_django,
+    FakeTelegramServer,
+    Timer,
+    print_report,
+)
+
+TOKEN: str = "1:bench"
+
+
+async def send_per_call(server: FakeTelegramServer, chat_id: int) -> None:
+    """Old behaviour: new bot and new http client for every message."""
+    import telegram
+
+    bot: telegram.Bot = telegram.Bot(token=TOKEN, base_url=server.base_url)
+    await bot.send_message(chat_id=chat_id, text="bench")
+
+
+async def send_pooled(chat_id: int) -> None:
+    """New behaviour: bot from the process-wide registry."""
+    from chats.utils import bot_registry
+
+    bot = await bot_registry.get_bot(token=TOKEN)
+    await bot.send_message(chat_id=chat_id, text="bench")
+
+
+async def measure(
+    name: str,
+    server: FakeTelegramServer,
+    messages: int,
+    concurrency: int
+) -> dict[str, Any]:
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+    server.requests_count = server.connections_count = 0
+
+    async def send(chat_id: int) -> None:
+        async with semaphore:
+            if name == "per_call":
+                await send_per_call(server=server, chat_id=chat_id)
+            else:
+                await send_pooled(chat_id=chat_id)
+
+    with Timer() as timer:
+        await asyncio.gather(*(send(chat_id) for chat_id in range(messages)))
+    return {
+        "client": name,
+        "messages": messages,
+        "seconds": round(timer.elapsed, 3),
+        "sends_per_second": round(messages / timer.elapsed, 1),
+        "http_requests": server.requests_count,
+        "tcp_connections": server.connections_count,
+    }
+
+
+async def main(messages: int, concurrency: int, delay: float) -> None:
+    from django.conf import settings
+    from chats.utils import bot_registry
+
+    server: FakeTelegramServer = FakeTelegramServer(delay=delay)
+    await server.start()
+    settings.TELEGRAM_BOT_CONF["BASE_URL"] = server.base_url
+    try:
+        results: list[dict[str, Any]] = [
+            await measure("per_call", server, messages, concurrency),
+            await measure("pooled", server, messages, concurrency),
+        ]
+    finally:
+        await bot_registry.shutdown()
+        await server.stop()
+    print_report(name="telegram_client", results=results)
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=0.0,
+        help="Simulated Telegram response time in seconds."
+    )
+    args = parser.parse_args()
+    setup_django()
+    asyncio.run(
+        main(
+            messages=args.messages,
+            concurrency=args.concurrency,
+            delay=args.delay
+        )
+    )
@@ -0,0 +1,151 @@
+# Python
+from typing import (
+    Any,
+    Optional,
+)
+import json
+import os
+import sys
+from time import perf_counter
+from statistics import quantiles
+
+# Third party
+from aiohttp import web
+
+BASE_DIR: str = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)
+
+
+def setup_django(settings_module: str = "settings.env.local") -> None:
+    """Configure django the same way manage/local.py does."""
+    sys.path.insert(0, BASE_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+
+    import django
+    django.setup()
+
+
+def setup_test_database() -> None:
+    """Create throwaway database like the django test runner does."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment(debug=False)
+    connection.creation.create_test_db(verbosity=0)
+
+
+def create_user(login: str, telegram_id: Optional[int] = None) -> Any:
+    """Create user which is able to upload messages."""
+    from auths.models import CustomUser
+
+    return CustomUser.objects.create_user(
+        login=login,
+        first_name=login,
+        password=login,
+        telegram_id=telegram_id
+    )
+
+
+def get_api_client(user: Any) -> Any:
+    """Get API client authorized with user's JWT."""
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    client: APIClient = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION="JWT "
+        f"{RefreshToken.for_user(user=user).access_token}"
+    )
+    return client
+
+
+class FakeTelegramServer:
+    """Local HTTP server which answers like Telegram Bot API."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay: float = delay
+        self.requests_count: int = 0
+        self.connections_count: int = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.port: int = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/bot"
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests_count += 1
+        if self.delay:
+            import asyncio
+            await asyncio.sleep(self.delay)
+        method: str = request.match_info["method"]
+        result: Any = True
+        if method == "getMe":
+            result = {
+                "id": 1,
+                "is_bot": True,
+                "first_name": "bench",
+                "username": "bench_bot",
+            }
+        elif method == "sendMessage":
+            result = {
+                "message_id": self.requests_count,
+                "date": 0,
+                "chat": {"id": 1, "type": "private"},
+                "text": "",
+            }
+        return web.json_response({"ok": True, "result": result})
+
+    async def start(self) -> None:
+        app: web.Application = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        app.on_response_prepare.append(self._count_connection)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site: web.TCPSite = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def _count_connection(
+        self,
+        request: web.Request,
+        response: web.StreamResponse
+    ) -> None:
+        transport: Any = request.transport
+        if transport and not getattr(transport, "_bench_seen", False):
+            transport._bench_seen = True
+            self.connections_count += 1
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+
+class Timer:
+    """Context manager which measures elapsed wall time."""
+
+    def __enter__(self) -> "Timer":
+        self.started: float = perf_counter()
+        return self
+
+    def __exit__(self, *args: tuple[Any]) -> None:
+        self.elapsed: float = perf_counter() - self.started
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float]:
+    """Get p50/p95/p99 latency in milliseconds."""
+    if len(latencies) < 2:
+        value: float = latencies[0] * 1000 if latencies else 0.0
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts: list[float] = quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+    }
+
+
+def print_report(name: str, results: Any) -> None:
+    """Print benchmark results as JSON."""
+    print(json.dumps({"benchmark": name, "results": results}, indent=2))
@@ -0,0 +1,120 @@
+"""Measure websocket push of new messages and the polling it replaces.
+
+Usage: python -m benchmarks.websocket_push --connections 2000 --messages 200
+"""
+# Python
+from typing import Any
+from argparse import ArgumentParser
+from time import perf_counter
+import asyncio
+import random
+
+# Third party
+from asgiref.sync import sync_to_async
+
+# Project
+from benchmarks.utils import (
+    setup_django,
+    setup_test_database,
+    latency_summary,
+    Timer,
+    print_report,
+)
+
+
+def seed(users: int) -> list[tuple[Any, str]]:
+    """Create users and their access tokens."""
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from auths.models import CustomUser
+
+    created: list[CustomUser] = CustomUser.objects.bulk_create(
+        [
+            CustomUser(login=f"user{index}", first_name="bench")
+            for index in range(users)
+        ]
+    )
+    return [
+        (user, str(RefreshToken.for_user(user=user).access_token))
+        for user in created
+    ]
+
+
+async def main(
+    users: list[tuple[Any, str]],
+    connections: int,
+    messages: int,
+    poll_interval: float
+) -> None:
+    from channels.routing import URLRouter
+    from channels.testing import WebsocketCommunicator
+    from chats.models import Message
+    from chats.routing import websocket_urlpatterns
+
+    application: URLRouter = URLRouter(websocket_urlpatterns)
+    communicators: list[tuple[Any, WebsocketCommunicator]] = []
+    with Timer() as connect_timer:
+        for index in range(connections):
+            user, token = users[index % len(users)]
+            communicator: WebsocketCommunicator = WebsocketCommunicator(
+                application,
+                f"/ws/v1/chats/messages?token={token}"
+            )
+            connected, _ = await communicator.connect()
+            assert connected
+            communicators.append((user, communicator))
+
+    latencies: list[float] = []
+    create_message = sync_to_async(Message.objects.create)
+    with Timer() as push_timer:
+        for index in range(messages):
+            owner, receiver = random.choice(communicators)
+            started: float = perf_counter()
+            await create_message(text=f"message {index}", owner=owner)
+            await receiver.receive_json_from(timeout=5)
+            latencies.append(perf_counter() - started)
+
+    for _, communicator in communicators:
+        await communicator.disconnect()
+
+    print_report(
+        name="websocket_push",
+        results={
+            "connections": connections,
+            "connect_seconds": round(connect_timer.elapsed, 3),
+            "messages": messages,
+            "push_messages_per_second": round(
+                messages / push_timer.elapsed,
+                1
+            ),
+            **latency_summary(latencies=latencies),
+            "poll_interval_seconds": poll_interval,
+            "replaced_poll_queries_per_second": round(
+                connections / poll_interval,
+                1
+            ),
+        }
+    )
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=5.0,
+        help="How often clients polled messages before the push."
+    )
+    args = parser.parse_args()
+    setup_django()
+    setup_test_database()
+    asyncio.run(
+        main(
+            users=seed(users=args.users),
+            connections=args.connections,
+            messages=args.messages,
+            poll_interval=args.poll_interval
+        )
+    )
@@ -9,4 +9,30 @@ os.environ.setdefault(
     'settings.env.local'
 )
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Third party
+from channels.routing import (  # noqa
+    ProtocolTypeRouter,
+    URLRouter,
+)
+from channels.security.websocket import AllowedHostsOriginValidator  # noqa
+
+# Project
+from abstracts.asgi import LifespanApplication  # noqa
+from chats.routing import websocket_urlpatterns  # noqa
+from chats.utils import bot_registry  # noqa
+
+application = LifespanApplication(
+    application=ProtocolTypeRouter(
+        {
+            "http": django_application,
+            # Websockets are not covered by CORS, so connections
+            # from pages of other hosts are rejected by Origin.
+            "websocket": AllowedHostsOriginValidator(
+                URLRouter(websocket_urlpatterns)
+            ),
+        }
+    ),
+    on_shutdown=(bot_registry.shutdown,)
+)
@@ -33,7 +33,6 @@ DJANGO_AND_THIRD_PARTY_APPS = [
     'corsheaders',
     'rest_framework',
     'rest_framework_simplejwt',
-    'debug_toolbar',
     'django_extensions',
 ]
 PROJECT_APPS = [
@@ -47,6 +46,8 @@ INSTALLED_APPS = DJANGO_AND_THIRD_PARTY_APPS + PROJECT_APPS
 # Middleware | Template | Validators
 #
 MIDDLEWARE = [
+    "abstracts.middleware.MetricsMiddleware",
+    "abstracts.middleware.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -55,9 +56,23 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
+ADMIN_ONLY_MIDDLEWARE = {
+    'django.contrib.sessions.middleware.SessionMiddleware':
+        'abstracts.middleware.AdminSessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware':
+        'abstracts.middleware.AdminCsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware':
+        'abstracts.middleware.AdminAuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware':
+        'abstracts.middleware.AdminMessageMiddleware',
+}
+if STATELESS_API:  # noqa
+    JWT_STATELESS_LOGIN = True
+    MIDDLEWARE = [
+        ADMIN_ONLY_MIDDLEWARE.get(middleware, middleware)
+        for middleware in MIDDLEWARE
+    ]
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
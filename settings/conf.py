@@ -13,8 +13,33 @@ JWT_HEADER_KEY = config("JWT_HEADER_KEY", cast=str)
 JWT_CONF = {
     "TOKEN_LIFETIME_DAYS": 30
 }
+# API clients use only the returned JWT, so login doesn't need
+# to write the session and last_login.
+JWT_STATELESS_LOGIN = config("JWT_STATELESS_LOGIN", default=False, cast=bool)
+# Keep sessions, CSRF and messages only for the admin site.
+# Turns JWT_STATELESS_LOGIN on.
+STATELESS_API = config("STATELESS_API", default=False, cast=bool)
 BOT_TOKEN = config("BOT_TOKEN", cast=str)
 ADMIN_CHAT_ID = config("ADMIN_CHAT_ID", cast=int)
+TELEGRAM_BOT_CONF = {
+    "BASE_URL": config(
+        "TELEGRAM_BASE_URL",
+        default="https://api.telegram.org/bot",
+        cast=str
+    ),
+    "POOL_SIZE": config("TELEGRAM_POOL_SIZE", default=8, cast=int),
+    "CONCURRENCY": config("TELEGRAM_CONCURRENCY", default=8, cast=int),
+    "GLOBAL_RATE": 30,
+    "CHAT_RATE": 1,
+    "CHAT_BURST": 1,
+    "MAX_RETRIES": 3,
+}
+TELEGRAM_DELIVERY_CONF = {
+    "BATCH_SIZE": config("TELEGRAM_DELIVERY_BATCH_SIZE", default=100, cast=int),
+    "POLL_INTERVAL_SECONDS": 1,
+    "LEASE_SECONDS": 300,
+    "MAX_ATTEMPTS": 8,
+}
 
 # ----------------------------------------------
 # Custom settings
@@ -24,6 +49,97 @@ ADMIN_SITE_URL = config(
     default="admin/",
     cast=str
 )
+# Estimated counts and primary key ordering on admin changelists.
+ADMIN_PERFORMANCE_CONF = {
+    "ENABLED": config("ADMIN_PERFORMANCE_MODE", default=False, cast=bool),
+    # Smaller estimated counts are made exact.
+    "EXACT_COUNT_LIMIT": 10000,
+}
+MESSAGES_UPLOAD_MAX_BATCH_SIZE = 1000
+MESSAGES_EXPORT_CHUNK_SIZE = 2000
+MESSAGES_SYNC_SAFETY_LAG_SECONDS = 2
+MESSAGES_SEARCH_MAX_QUERY_LENGTH = 200
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
+# Days to keep soft deleted rows before purge_soft_deleted removes them.
+# Models are purged in this order, children of purged rows go first.
+SOFT_DELETE_RETENTION_CONF = {
+    "MODELS": {
+        "chats.Message": config(
+            "MESSAGES_RETENTION_DAYS",
+            default=30,
+            cast=int
+        ),
+        "auths.CustomUser": config(
+            "USERS_RETENTION_DAYS",
+            default=90,
+            cast=int
+        ),
+    },
+    "BATCH_SIZE": config("PURGE_BATCH_SIZE", default=1000, cast=int),
+    "SLEEP_SECONDS": config("PURGE_SLEEP_SECONDS", default=0.1, cast=float),
+    "LOCK_TIMEOUT_MS": 2000,
+    "MAX_RETRIES": 5,
+}
+# Monthly partitions of chats_message on PostgreSQL,
+# see manage_message_partitions command.
+MESSAGE_PARTITIONS_CONF = {
+    "AHEAD_MONTHS": config("MESSAGE_PARTITIONS_AHEAD", default=3, cast=int),
+    "RETAIN_MONTHS": config("MESSAGE_PARTITIONS_RETAIN", default=0, cast=int),
+    "ARCHIVE_DIR": config("MESSAGE_PARTITIONS_ARCHIVE_DIR", default=""),
+    "ARCHIVE_TABLESPACE": config(
+        "MESSAGE_PARTITIONS_ARCHIVE_TABLESPACE",
+        default=""
+    ),
+}
+
+# ----------------------------------------------
+# Password hashing
+#
+# Policy is the hasher of new passwords, the others only verify old
+# hashes, which are rehashed on the next successful login.
+PASSWORD_HASHING_POLICY = config(
+    "PASSWORD_HASHING_POLICY",
+    default="pbkdf2",
+    cast=str
+)
+PASSWORD_HASHING_CONF = {
+    "PBKDF2_ITERATIONS": config(
+        "PASSWORD_PBKDF2_ITERATIONS",
+        default=600000,
+        cast=int
+    ),
+    "SCRYPT_WORK_FACTOR": config(
+        "PASSWORD_SCRYPT_WORK_FACTOR",
+        default=2 ** 14,
+        cast=int
+    ),
+    "SCRYPT_BLOCK_SIZE": 8,
+    "SCRYPT_PARALLELISM": 1,
+    "SCRYPT_MAXMEM": 256 * 1024 * 1024,
+    "ARGON2_TIME_COST": config(
+        "PASSWORD_ARGON2_TIME_COST",
+        default=2,
+        cast=int
+    ),
+    # KiB, 19 MiB with one lane keeps a login on one core.
+    "ARGON2_MEMORY_COST": config(
+        "PASSWORD_ARGON2_MEMORY_COST",
+        default=19456,
+        cast=int
+    ),
+    "ARGON2_PARALLELISM": 1,
+}
+PASSWORD_HASHERS_BY_POLICY = {
+    "pbkdf2": "auths.hashers.TunedPBKDF2PasswordHasher",
+    "scrypt": "auths.hashers.TunedScryptPasswordHasher",
+    "argon2": "auths.hashers.TunedArgon2PasswordHasher",
+}
+PASSWORD_HASHERS = [
+    PASSWORD_HASHERS_BY_POLICY[PASSWORD_HASHING_POLICY],
+] + [
+    hasher for policy, hasher in PASSWORD_HASHERS_BY_POLICY.items()
+    if policy != PASSWORD_HASHING_POLICY
+]
 
 # ----------------------------------------------
 # DRF settings
@@ -31,10 +147,32 @@ ADMIN_SITE_URL = config(
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': ('rest_framework.permissions.AllowAny',),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'auths.authentication.CachedJWTAuthentication',
         # "apps.auths.authentication.JWTAuthentication",
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'abstracts.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+}
+# Compress responses of at least MIN_SIZE bytes with brotli or gzip.
+RESPONSE_COMPRESSION_CONF = {
+    "ENABLED": config(
+        "RESPONSE_COMPRESSION_ENABLED",
+        default=True,
+        cast=bool
+    ),
+    "MIN_SIZE": config(
+        "RESPONSE_COMPRESSION_MIN_SIZE",
+        default=1024,
+        cast=int
+    ),
+    "BROTLI_QUALITY": 4,
 }
+# Seconds to keep authenticated users in the cache. Several processes
+# need a shared cache backend to see each other's invalidations, prod
+# settings use Redis.
+AUTH_USER_CACHE_TTL = config("AUTH_USER_CACHE_TTL", default=30, cast=int)
 
 # ----------------------------------------------
 # Django Debug Toolbar Configuration
@@ -0,0 +1,52 @@
+# Third party
+from decouple import config
+
+# Project
+from settings.base import *  # noqa
+
+# ----------------------------------------------
+# Settings of benchmarks/loadtest.py, close to production
+# but without external services.
+#
+DEBUG = False
+WSGI_APPLICATION = 'deploy.test.wsgi.application'
+ASGI_APPLICATION = 'deploy.test.asgi.application'
+
+# ----------------------------------------------
+#
+BENCH_DATABASE = config("BENCH_DATABASE", default="sqlite", cast=str)
+if BENCH_DATABASE == "postgresql":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config("BENCH_DB_NAME", default="messaging_bench", cast=str),
+            'USER': config("DB_USER", cast=str),
+            'PASSWORD': config("DB_POSTGRESQL_PASSWORD", cast=str),
+            'HOST': config("DB_HOST", default="127.0.0.1", cast=str),
+            'PORT': config("DB_PORT", default=5432, cast=int),
+            'CONN_MAX_AGE': 60,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config("BENCH_SQLITE_NAME", default="bench.sqlite3"),
+            'OPTIONS': {
+                'timeout': 20,
+            },
+        }
+    }
+ALLOWED_HOSTS = [
+    "127.0.0.1",
+    "localhost",
+]
+
+# ----------------------------------------------
+# Channels configuration
+#
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer'
+    },
+}
@@ -23,6 +23,17 @@ INTERNAL_IPS = [
     "127.0.0.1",
 ]
 
+# ----------------------------------------------
+# Debug toolbar is sync only, so it stays out of the production
+# middleware chain which has to serve async views.
+#
+INSTALLED_APPS += [  # noqa
+    'debug_toolbar',
+]
+MIDDLEWARE += [  # noqa
+    'debug_toolbar.middleware.DebugToolbarMiddleware',
+]
+
 # ----------------------------------------------
 # Channels configuration
 #
@@ -29,3 +29,28 @@ ALLOWED_HOSTS = [
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
+
+# ----------------------------------------------
+# Cache is shared by all processes, so invalidations of cached
+# authenticated users are seen by every worker.
+#
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config("CACHE_URL", default="redis://127.0.0.1:6379/1"),
+    },
+}
+
+# ----------------------------------------------
+# Channels configuration
+#
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'CONFIG': {
+            'hosts': [
+                config("CHANNEL_LAYER_URL", default="redis://127.0.0.1:6379"),
+            ],
+        },
+    },
+}
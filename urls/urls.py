@@ -19,6 +19,9 @@ from rest_framework.routers import DefaultRouter
 # Project
 from apps.auths.views import CustomUserViewSet
 from apps.chats.views import MessageViewSet
+from apps.auths import async_views as auths_async_views
+from apps.chats import async_views as chats_async_views
+from apps.abstracts.views import get_metrics
 
 
 router: DefaultRouter = DefaultRouter(trailing_slash=False)
@@ -48,6 +51,26 @@ urlpatterns = [
     prefix=settings.MEDIA_URL,
     document_root=settings.MEDIA_ROOT
 ) + [
+    path(
+        route="api/v1/async/auths/users/messages",
+        view=auths_async_views.get_user_messages,
+        name="async_user_messages"
+    ),
+    path(
+        route="api/v1/async/auths/users/get_token",
+        view=auths_async_views.get_token,
+        name="async_user_token"
+    ),
+    path(
+        route="api/v1/async/chats/messages/upload_message",
+        view=chats_async_views.upload_message,
+        name="async_upload_message"
+    ),
+    path(
+        route="api/v1/metrics",
+        view=get_metrics,
+        name="metrics"
+    ),
     path(
         route="api/v1/",
         view=include(router.urls)